@@ -1 +1,28 @@
-from .dmai_helpers import start, run, init, gameover
+import importlib
+
+# public names and the modules which define them, a module is imported on
+# first use so `import dmai` does not load the game, NLU and planning stacks
+_EXPORTS = {
+    "start": "dmai.dmai_helpers",
+    "run": "dmai.dmai_helpers",
+    "init": "dmai.dmai_helpers",
+    "gameover": "dmai.dmai_helpers",
+    "prewarm": "dmai.dmai_helpers",
+    "GameTemplate": "dmai.game.game_template",
+    "SessionManager": "dmai.session_manager",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    """Function to import a public name on first use"""
+    if name not in _EXPORTS:
+        raise AttributeError("module {m} has no attribute {n}".format(m=__name__, n=name))
+    value = getattr(importlib.import_module(_EXPORTS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()).union(__all__))
@@ -7,10 +7,16 @@ from dmai.nlu.nlu import NLU
 from dmai.game.npcs.npc_collection import NPCCollection
 from dmai.utils.output_builder import OutputBuilder
 from dmai.utils.text import Text
+from dmai.utils.tracer import Tracer
+from dmai.utils.metrics import Metrics
 from dmai.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+TURNS = Metrics.counter("dmai_turns_total", "Player inputs processed by the DM")
+TURN_SECONDS = Metrics.histogram("dmai_turn_seconds", "Seconds spent processing a player input in the DM")
+TRIGGERS = Metrics.counter("dmai_triggers_executed_total", "Triggers executed after a successful input")
+
 
 class DM:
 
@@ -178,6 +184,12 @@ class DM:
     ) -> bool:
         """Receive a player input.
         Returns whether the utterance was successful."""
+        TURNS.inc()
+        with TURN_SECONDS.time():
+            return self._input(player_utter, utter_type, intent, kwargs)
+
+    def _input(self, player_utter: str, utter_type: str, intent: str, kwargs: dict) -> bool:
+        """Process a player input"""
         succeed = False
         self._player_utter = player_utter
         if utter_type:
@@ -190,17 +202,20 @@ class DM:
         elif intent:
             # look up intent in map
             try:
-                succeed = self.player_intent_map[intent]["func"](**kwargs)
+                with Tracer.span("dm.intent", intent=intent):
+                    succeed = self.player_intent_map[intent]["func"](**kwargs)
             except KeyError:
-                logger.error("(SESSION {s}) Intent not in map: {i}".format(s=self.state.session.session_id, i=intent))
+                logger.error("(SESSION %s) Intent not in map: %s", self.state.session.session_id, intent)
                 raise
 
         # execute any triggers
         if succeed:
-            self.execute_triggers()
+            with Tracer.span("dm.triggers"):
+                self.execute_triggers()
 
         # prepare next AI moves
-        self.state.get_player().prepare_next_move()
+        with Tracer.span("agent.prepare_next_move", agent="player"):
+            self.state.get_player().prepare_next_move()
 
         # prepare next monster moves
         for monster in self.npcs.get_all_monsters():
@@ -208,10 +223,12 @@ class DM:
                 if self.state.get_current_room_id() == self.state.get_current_room_id(
                     monster.unique_id
                 ):
-                    monster.prepare_next_move()
+                    with Tracer.span("agent.prepare_next_move", agent=monster.unique_id):
+                        monster.prepare_next_move()
 
         # last thing to do: maintain state
-        self.state.maintenance()
+        with Tracer.span("state.maintenance"):
+            self.state.maintenance()
 
         return succeed
 
@@ -226,19 +243,22 @@ class DM:
     def register_trigger(self, trigger: object) -> None:
         """Register a trigger object"""
         if trigger not in self.triggers:
-            logger.debug("(SESSION {s}) Registering trigger: {n}".format(s=self.state.session.session_id, n=str(trigger)))
+            logger.debug("(SESSION %s) Registering trigger: %s", self.state.session.session_id, trigger)
             self.triggers.append(trigger)
 
     def deregister_trigger(self, trigger: object) -> None:
         """Deregister a trigger object"""
         if trigger in self.triggers:
-            logger.debug("(SESSION {s}) Deregistering trigger: {n}".format(s=self.state.session.session_id, n=str(trigger)))
+            logger.debug("(SESSION %s) Deregistering trigger: %s", self.state.session.session_id, trigger)
             self.triggers.remove(trigger)
 
     def execute_triggers(self) -> None:
         """Method to execute triggers"""
+        executed = 0
         for obj in self.triggers:
             obj.trigger()
+            executed += 1
+        TRIGGERS.inc(executed)
 
     def get_intro_text(self) -> str:
         return self.adventure.intro_text
@@ -257,7 +277,7 @@ class DM:
                 entity["entity"] == "location"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
             ):
-                return ("location", entity["value"])
+                return ("location", self.npcs.resolve("location", entity["value"]))
             
             (target_type, target) = self._get_target(nlu_entities)
             if target and (target_type == "npc" or target_type == "monster"):
@@ -296,7 +316,7 @@ class DM:
                 entity["entity"] == "monster"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
             ):
-                monster = entity["value"]
+                monster = self.npcs.resolve("monster", entity["value"])
             if (
                 entity["entity"] == "id"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
@@ -306,7 +326,7 @@ class DM:
                 entity["entity"] == "npc"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
             ):
-                npc = entity["value"]
+                npc = self.npcs.resolve("npc", entity["value"])
             if (
                 entity["entity"] == "door"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
@@ -316,12 +336,12 @@ class DM:
                 entity["entity"] == "location"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
             ):
-                location = entity["value"]
+                location = self.npcs.resolve("location", entity["value"])
             if (
                 entity["entity"] == "puzzle"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
             ):
-                puzzle = entity["value"]
+                puzzle = self.npcs.resolve("puzzle", entity["value"])
             if (
                 entity["entity"] == "scenery"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
@@ -376,7 +396,7 @@ class DM:
                 entity["entity"] == "monster"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
             ):
-                monster = entity["value"]
+                monster = self.npcs.resolve("monster", entity["value"])
             if (
                 entity["entity"] == "id"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
@@ -386,7 +406,7 @@ class DM:
                 entity["entity"] == "npc"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
             ):
-                npc = entity["value"]
+                npc = self.npcs.resolve("npc", entity["value"])
 
         # monsters are indexed by a unique id, determine it if possible
         if monster:
@@ -484,7 +504,7 @@ class DM:
                 entity["entity"] == "location"
                 and entity["confidence"] >= self.ENTITY_CONFIDENCE
             ):
-                location = entity["value"]
+                location = self.npcs.resolve("location", entity["value"])
             
         # return the door and location
         if door:
@@ -532,7 +552,7 @@ class DM:
         """Can't determine the player intent.
         Appends the hint to output with the self.output_builder.
         """
-        logger.debug("(SESSION {s}) DM.no_intent".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.no_intent", self.state.session.session_id)
         self.output_builder.append(NLG.no_intent())
         self.state.nag_player()
         return True
@@ -541,7 +561,7 @@ class DM:
         """Use the player AI to get the next possible move.
         Appends the hint to output with the self.output_builder.
         """
-        logger.debug("(SESSION {s}) DM.hint".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.hint", self.state.session.session_id)
         if self._get_noun(nlu_entities)[1] or self._get_verb(nlu_entities)[1]:
             self.output_builder.append("I can only tell you what I think you should do next.")
         self.state.nag_player(hint=True)
@@ -552,7 +572,7 @@ class DM:
     ) -> bool:
         """Attempt to move an entity to a destination determined by NLU or specified.
         Returns whether the move was successful."""
-        logger.debug("(SESSION {s}) DM.move".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.move", self.state.session.session_id)
         if not entity:
             entity = "player"
         if not destination and nlu_entities:
@@ -567,7 +587,7 @@ class DM:
             ]
             self.output_builder.append(NLG.no_destination(possible_destinations))
         else:
-            logger.debug("(SESSION {s}) Moving {e} to {d}".format(s=self.state.session.session_id, e=entity, d=destination))
+            logger.debug("(SESSION %s) Moving %s to %s", self.state.session.session_id, entity, destination)
             moved = self.actions.move(entity, destination)
         return moved
 
@@ -576,7 +596,7 @@ class DM:
     ) -> bool:
         """Attempt an attack by attacker against target determined by NLU or specified.
         Returns whether the attack was successful."""
-        logger.debug("(SESSION {s}) DM.attack".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.attack", self.state.session.session_id)
         target_type = None
         equipment_type = None
         item_type = None
@@ -630,7 +650,7 @@ class DM:
                     )
         else:
             if target_type == "door":
-                logger.debug("(SESSION {s}) {a} is attacking door {t}".format(s=self.state.session.session_id, a=attacker, t=target))
+                logger.debug("(SESSION %s) %s is attacking door %s", self.state.session.session_id, attacker, target)
                 # check if door only has key solution
                 door = "{r1}---{r2}".format(r1=self.state.get_current_room_id(), r2=target)
                 puzzle = self.state.get_current_room().puzzles.get_puzzle(door)
@@ -648,7 +668,7 @@ class DM:
                 if equipment or item or scenery:
                     if target_type == "monster":
                         self.output_builder.append(NLG.attack_with_non_weapon(self.state.get_entity_name(target), equipment=equipment, item=item, scenery=scenery))
-                logger.debug("(SESSION {s}) {a} is attacking {t}".format(s=self.state.session.session_id, a=attacker, t=target))
+                logger.debug("(SESSION %s) %s is attacking %s", self.state.session.session_id, attacker, target)
                 attacked = self.actions.attack(attacker, target, target_type=target_type)
         return attacked
 
@@ -661,7 +681,7 @@ class DM:
     ) -> bool:
         """Attempt to use an equipment.
         Returns whether the use was successful."""
-        logger.debug("(SESSION {s}) DM.use".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.use", self.state.session.session_id)
         if not entity:
             entity = "player"
         if not equipment and nlu_entities:
@@ -673,10 +693,10 @@ class DM:
             used = False
             self.output_builder.append(NLG.no_equipment(stop=stop))
         elif equipment:
-            logger.debug("(SESSION {s}) {e} is{stop} using: {q}".format(s=self.state.session.session_id, e=entity, q=equipment, stop="stop" if stop else " "))
+            logger.debug("(SESSION %s) %s is%s using: %s", self.state.session.session_id, entity, "stop" if stop else " ", equipment)
             used = self.actions.use(equipment=equipment, entity=entity, stop=stop)
         elif item:
-            logger.debug("(SESSION {s}) {e} is{stop} using: {q}".format(s=self.state.session.session_id, e=entity, q=item, stop="stop" if stop else " "))
+            logger.debug("(SESSION %s) %s is%s using: %s", self.state.session.session_id, entity, "stop" if stop else " ", item)
             used = self.actions.use(item=item, entity=entity, stop=stop)
         return used
 
@@ -685,7 +705,7 @@ class DM:
     ) -> bool:
         """Attempt to stop using an equipment.
         Returns whether the stoppage was successful."""
-        logger.debug("(SESSION {s}) DM.stop_using".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.stop_using", self.state.session.session_id)
         return self.use(
             equipment=equipment, entity=entity, nlu_entities=nlu_entities, stop=True
         )
@@ -693,7 +713,7 @@ class DM:
     def equip(self, weapon: str = None, entity: str = None, nlu_entities: dict = None):
         """Attempt to equip a weapon.
         Returns whether equipping was successful."""
-        logger.debug("(SESSION {s}) DM.equip".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.equip", self.state.session.session_id)
         if not entity:
             entity = "player"
         if not weapon and nlu_entities:
@@ -704,7 +724,7 @@ class DM:
             self.output_builder.append(NLG.no_weapon(unequip=False))
             self.state.set_expected_entities(["weapon"])
         else:
-            logger.debug("(SESSION {s}) {e} is equipping {q}".format(s=self.state.session.session_id, e=entity, q=weapon))
+            logger.debug("(SESSION %s) %s is equipping %s", self.state.session.session_id, entity, weapon)
             equipped = self.actions.equip(weapon, entity)
         return equipped
 
@@ -713,24 +733,24 @@ class DM:
     ) -> bool:
         """Attempt to unequip a weapon.
         Returns whether unequipping was successful."""
-        logger.debug("(SESSION {s}) DM.unequip".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.unequip", self.state.session.session_id)
         if not entity:
             entity = "player"
         if not weapon and nlu_entities:
             weapon = self._get_weapon(nlu_entities)[1]
 
         if not weapon:
-            logger.debug("(SESSION {s}) {e} is unequipping all".format(s=self.state.session.session_id, e=entity))
+            logger.debug("(SESSION %s) %s is unequipping all", self.state.session.session_id, entity)
             unequipped = self.actions.unequip(entity=entity)
         else:
-            logger.debug("(SESSION {s}) {e} is unequipping {q}".format(s=self.state.session.session_id, e=entity, q=weapon))
+            logger.debug("(SESSION %s) %s is unequipping %s", self.state.session.session_id, entity, weapon)
             unequipped = self.actions.unequip(weapon=weapon, entity=entity)
         return unequipped
 
     def converse(self, target: str = None, nlu_entities: dict = None) -> bool:
         """Attempt to converse with a target determined by NLU or specified.
         Returns whether the action was successful."""
-        logger.debug("(SESSION {s}) DM.converse".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.converse", self.state.session.session_id)
         target_type = None
         if not target and nlu_entities:
             (target_type, target) = self._get_target(nlu_entities)
@@ -747,7 +767,7 @@ class DM:
             conversation = False
             self.output_builder.append(NLG.no_target("talk to"))
         else:
-            logger.debug("(SESSION {s}) Player is conversing with {t}".format(s=self.state.session.session_id, t=target))
+            logger.debug("(SESSION %s) Player is conversing with %s", self.state.session.session_id, target)
             conversation = self.actions.converse(target)
         return conversation
 
@@ -755,17 +775,18 @@ class DM:
         """Player has uttered an affirmation.
         Appends the text to output with the self.output_builder.
         """
-        logger.debug("(SESSION {s}) DM.affirm".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.affirm", self.state.session.session_id)
         if not self.state.suggested_next_move["state"] and self.state.received_quest and not self.state.questing and self.state.current_conversation:
-            logger.debug("(SESSION {s}) Accepted quest".format(s=self.state.session.session_id))
+            logger.debug("(SESSION %s) Accepted quest", self.state.session.session_id)
             npc = self.npcs.get_entity(self.state.current_conversation)
             self.output_builder.append(npc.dialogue["accepts_quest"])
             self.state.quest()
         elif self.state.suggested_next_move["state"]:
-            logger.debug("(SESSION {s}) Accepted suggested next move: {n}".format(s=self.state.session.session_id, n=self.state.suggested_next_move["utter"]))
+            logger.debug("(SESSION %s) Accepted suggested next move: %s", self.state.session.session_id, self.state.suggested_next_move["utter"])
             utter = self.state.suggested_next_move["utter"]
             (intent, params) = self.nlu.process_player_utterance(utter)
-            return self.input(utter, intent=intent, kwargs=params)
+            # part of the player's turn, which input already counts and times
+            return self._input(utter, None, intent, params)
         elif "roll" in self.state.expected_intent:
             return self.roll()
         return True
@@ -774,7 +795,7 @@ class DM:
         """Player has uttered a denial.
         Appends the text to output with the self.output_builder.
         """
-        logger.debug("(SESSION {s}) DM.deny".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.deny", self.state.session.session_id)
         if self.state.roleplaying and self.state.received_quest and not self.state.questing and self.state.current_conversation:
             # this is a game end condition
             npc = self.npcs.get_entity(self.state.current_conversation)
@@ -786,7 +807,7 @@ class DM:
     def explore(self, target: str = None, target_type: str = None, nlu_entities: dict = None) -> bool:
         """Attempt to explore/investigate.
         Returns whether the action was successful."""
-        logger.debug("(SESSION {s}) DM.explore".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.explore", self.state.session.session_id)
         if not target and nlu_entities:
             (target_type, target) = self._get_noun(nlu_entities)
         # TODO if not target, get any noun (not just those in NLU entitities) as targets
@@ -801,14 +822,14 @@ class DM:
                     target = targets[0]
                 
         if not target or (target_type == "location" and self.state.get_current_room_id() == target):
-            logger.debug("(SESSION {s}) Player is exploring".format(s=self.state.session.session_id))
+            logger.debug("(SESSION %s) Player is exploring", self.state.session.session_id)
             room = self.state.get_current_room()
             self.output_builder.append(room.get_description())
             # trigger the explore triggers in the room
             room.explore_trigger()
             explore = True
         else:
-            logger.debug("(SESSION {s}) Player is investigating {t}".format(s=self.state.session.session_id, t=target))
+            logger.debug("(SESSION %s) Player is investigating %s", self.state.session.session_id, target)
             explore = self.actions.investigate(target, target_type=target_type)
         if explore:
             self.state.explore()
@@ -819,7 +840,7 @@ class DM:
     ) -> bool:
         """Attempt to roll die.
         Returns whether the action was successful."""
-        logger.debug("(SESSION {s}) DM.roll".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.roll", self.state.session.session_id)
 
         # If there's a stored intent, ignore the player specified die and use correct one
         if self.state.stored_intent:
@@ -851,7 +872,7 @@ class DM:
     def pick_up(self, entity: str = "player", item: str = None, nlu_entities: dict = {}) -> bool:
         """Attempt to pick up an item.
         Returns whether the action was successful."""
-        logger.debug("(SESSION {s}) DM.pick_up".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.pick_up", self.state.session.session_id)
         if not entity:
             entity = "player"
         if not item and nlu_entities:
@@ -862,18 +883,18 @@ class DM:
             (item_type, item) = self._get_target(nlu_entities)
             if item and item_type == "puzzle":
                 # trigger explore
-                logger.debug("(SESSION {s}) {e} is picking up {i}".format(s=self.state.session.session_id, e=entity, i=item))
+                logger.debug("(SESSION %s) %s is picking up %s", self.state.session.session_id, entity, item)
                 picked_up = self.actions.investigate(item, target_type=item_type)
                 return picked_up
             elif item and item_type == "scenery":
-                logger.debug("(SESSION {s}) {e} is picking up {i}".format(s=self.state.session.session_id, e=entity, i=item))
+                logger.debug("(SESSION %s) %s is picking up %s", self.state.session.session_id, entity, item)
                 self.output_builder.append("This is really part of the scenery, so isn't very interesting.")
                 return False
         if not item:
             picked_up = False
             self.output_builder.append(NLG.no_item())
         else:
-            logger.debug("(SESSION {s}) {e} is picking up {i}".format(s=self.state.session.session_id, e=entity, i=item))
+            logger.debug("(SESSION %s) %s is picking up %s", self.state.session.session_id, entity, item)
             picked_up = self.actions.pick_up(item, entity)
         return picked_up
 
@@ -881,7 +902,7 @@ class DM:
         """Player wants a health update.
         Appends the text to output with the self.output_builder.
         """
-        logger.debug("(SESSION {s}) DM.health".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.health", self.state.session.session_id)
         player = self.state.get_player()
         hp = self.state.get_current_hp()
         self.output_builder.append(NLG.health_update(hp, hp_max=player.hp_max))
@@ -891,7 +912,7 @@ class DM:
         """Player wants a inventory update.
         Appends the text to output with the self.output_builder.
         """
-        logger.debug("(SESSION {s}) DM.inventory".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.inventory", self.state.session.session_id)
         if nlu_entities:
             (query_type, query) = self._get_query(nlu_entities)
         else:
@@ -920,7 +941,7 @@ class DM:
         """Player wants to attempt to force a target.
         Appends the text to output with the self.output_builder.
         """
-        logger.debug("(SESSION {s}) DM.force".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.force", self.state.session.session_id)
         if not entity:
             entity = "player"
         if not target and nlu_entities:
@@ -964,7 +985,7 @@ class DM:
                         # only one solution, read the attack door fail
                         self.output_builder.append(self.state.get_current_room().text["no_solution"]["text"])
                         return
-            logger.debug("(SESSION {s}) {e} is forcing door {t}".format(s=self.state.session.session_id, e=entity, t=target))
+            logger.debug("(SESSION %s) %s is forcing door %s", self.state.session.session_id, entity, target)
             forced = self.actions.ability_check("str", entity, target, target_type)
         return forced
 
@@ -972,9 +993,9 @@ class DM:
         """Player wants to attempt to perform a ability check.
         Appends the text to output with the self.output_builder.
         """
-        logger.debug("(SESSION {s}) DM.ability_check".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.ability_check", self.state.session.session_id)
         if self.state.stored_ability_check or "ability_check" in self.state.stored_intent:
-            logger.debug("(SESSION {s}) Player is performing ability check".format(s=self.state.session.session_id))
+            logger.debug("(SESSION %s) Player is performing ability check", self.state.session.session_id)
             return self.roll(**kwargs)
         else:
             self.output_builder.append("You can do an ability check when I ask you to.")
@@ -984,9 +1005,9 @@ class DM:
         """Player wants to attempt to perform a skill check.
         Appends the text to output with the self.output_builder.
         """
-        logger.debug("(SESSION {s}) DM.skill_check".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.skill_check", self.state.session.session_id)
         if self.state.stored_skill_check or "skill_check" in self.state.stored_intent:
-            logger.debug("(SESSION {s}) Player is performing skill check".format(s=self.state.session.session_id))
+            logger.debug("(SESSION %s) Player is performing skill check", self.state.session.session_id)
             return self.roll(**kwargs)
         else:
             self.output_builder.append("You can do a skill check when I ask you to.")
@@ -996,11 +1017,11 @@ class DM:
         """Player wants to attempt to drink some ale.
         Appends the text to output with the self.output_builder.
         """
-        logger.debug("(SESSION {s}) DM.ale".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.ale", self.state.session.session_id)
         if nlu_entities:
             drink = self._get_drink(nlu_entities)[1]
         if self.state.get_current_room().ale:
-            logger.debug("(SESSION {s}) Player is getting an ale".format(s=self.state.session.session_id))
+            logger.debug("(SESSION %s) Player is getting an ale", self.state.session.session_id)
             if drink and drink != "ale":
                 self.output_builder.append("They only serve ale here!")
             if self.state.ales > 2:
@@ -1017,7 +1038,7 @@ class DM:
     def roleplay(self, verb: str = None, target: str = None, nlu_entities: dict = None) -> bool:
         """Attempt to roleplay.
         Returns whether the action was successful."""
-        logger.debug("(SESSION {s}) DM.roleplay".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.roleplay", self.state.session.session_id)
         target_type = None
         if nlu_entities:
             (verb_type, verb) = self._get_verb(nlu_entities)
@@ -1028,17 +1049,17 @@ class DM:
             self.output_builder.append(NLG.no_roleplay(target))
             self.state.nag_player()
         else:
-            logger.debug("(SESSION {s}) Player is roleplaying \"{v}\" with {t}".format(s=self.state.session.session_id, v=verb, t=str(target)))
+            logger.debug('(SESSION %s) Player is roleplaying "%s" with %s', self.state.session.session_id, verb, str(target))
             roleplay = self.actions.roleplay(verb, target, self._player_utter, target_type)
         return roleplay
     
     def negotiate(self, npc: str = None, **kwargs) -> bool:
         """Attempt to negotiate.
         Returns whether the action was successful."""
-        logger.debug("(SESSION {s}) DM.negotiate".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.negotiate", self.state.session.session_id)
         (npc_type, npc) = self._get_npc()
         if npc and self.state.get_entity(npc).gives_quest:
-            logger.debug("(SESSION {s}) Player is negotiating with {n}".format(s=self.state.session.session_id, n=npc))
+            logger.debug("(SESSION %s) Player is negotiating with %s", self.state.session.session_id, npc)
             if self.state.get_entity(npc).dialogue:
                 self.state.roleplay(npc)
                 self.state.set_conversation_target(npc)
@@ -1053,10 +1074,10 @@ class DM:
     def rescue(self, npc: str = None, **kwargs) -> bool:
         """Attempt to rescue.
         Returns whether the action was successful."""
-        logger.debug("(SESSION {s}) DM.rescue".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.rescue", self.state.session.session_id)
         (npc_type, npc) = self._get_npc()
         if "rescue" in self.state.get_entity(npc).dialogue:
-            logger.debug("(SESSION {s}) Player is rescuing {n}".format(s=self.state.session.session_id, n=npc))
+            logger.debug("(SESSION %s) Player is rescuing %s", self.state.session.session_id, npc)
             self.output_builder.append(self.state.get_entity(npc).dialogue["rescue"])
         else:
             self.output_builder.append("There's nobody to rescue here")
@@ -1065,20 +1086,20 @@ class DM:
     
     def bot_challenge(self, **kwargs) -> bool:
         """Describe self to player."""
-        logger.debug("(SESSION {s}) DM.bot_challenge".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.bot_challenge", self.state.session.session_id)
         self.output_builder.append("I'm an AI made by Katie Baker, I'm designed to play RPGs with you!")
         return True
 
     def stealth(self, **kwargs) -> bool:
         """Describe self to player."""
-        logger.debug("(SESSION {s}) DM.stealth".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.stealth", self.state.session.session_id)
         self.output_builder.append("Unfortunately, being stealthy doesn't do anything in this game... except to make you look cool and mysterious.")
         self.state.nag_player()
         return True
 
     def pick_lock(self, **kwargs) -> bool:
         """Describe self to player."""
-        logger.debug("(SESSION {s}) DM.pick_lock".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) DM.pick_lock", self.state.session.session_id)
         item_collection = self.state.get_player().character.items
         if not item_collection.has_item("thieves_tools")[0]:
             self.output_builder.append("Unfortunately, you don't have the required tools in order to pick locks.")
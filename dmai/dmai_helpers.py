@@ -4,6 +4,8 @@ import random
 import string
 
 from dmai.game.game import Game
+from dmai.game.game_template import GameTemplate
+from dmai.prewarmer import Prewarmer
 from dmai.ui.ui import UserInterface
 from dmai.nlg.nlg import NLG
 from dmai.utils.config import Config
@@ -12,14 +14,20 @@ from dmai.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
-def init(root_path: str, rasa_host: str = "localhost", rasa_port: int = 5005, saved_state: dict = None, session_id: str = None) -> None:
+def init(root_path: str, rasa_host: str = "localhost", rasa_port: int = 5005, saved_state: dict = None, session_id: str = None, template: GameTemplate = None) -> None:
     if not session_id:
         session_id = create_session_id()
-        logger.debug("(SESSION {s}) Initialising game".format(s=session_id))
+        logger.debug("(SESSION %s) Initialising game", session_id)
     Config.set_root(root_path)
-    Config.hosts.set_rasa_host(rasa_host)
-    Config.hosts.set_rasa_port(rasa_port)
-    game = start(char_class="fighter", session_id=session_id, saved_state=saved_state)
+    if template and not saved_state:
+        # new sessions are cloned from the template
+        game = template.new_game(session_id, rasa_host=rasa_host, rasa_port=rasa_port)
+    else:
+        game = start(char_class="fighter",
+                     session_id=session_id,
+                     saved_state=saved_state,
+                     rasa_host=rasa_host,
+                     rasa_port=rasa_port)
     ui = UserInterface(game)
     if not saved_state:
         ui.game.output_builder.clear()
@@ -56,20 +64,32 @@ def start(char_class: str = None,
           skip_intro: bool = False,
           adventure: str = "the_tomb_of_baradin_stormfury",
           session_id: str = "",
-          saved_state: dict = None) -> Game:
+          saved_state: dict = None,
+          rasa_host: str = None,
+          rasa_port: int = None) -> Game:
     """Initialise the game"""
     game = Game(char_class=char_class,
                 char_name=char_name,
                 skip_intro=skip_intro,
                 adventure=adventure,
                 session_id=session_id,
-                saved_state=saved_state)
+                saved_state=saved_state,
+                rasa_host=rasa_host,
+                rasa_port=rasa_port)
     game.load()
     
     # return the game instance
     return game
 
 
+def prewarm(root_path: str = None, adventures: list = None) -> dict:
+    """Build every cache before serving sessions.
+    Returns a dict with the status and seconds taken by each stage."""
+    if root_path:
+        Config.set_root(root_path)
+    return Prewarmer(adventures).run()
+
+
 def run(game: Game) -> None:
     """Run the game via CLI"""
     game.output_builder.append(
@@ -80,7 +100,7 @@ def run(game: Game) -> None:
 
 def gameover(output_builder: OutputBuilder, session: str = "") -> None:
     """Gracefully exit the game"""
-    logger.debug("(SESSION {s}) Gameover".format(s=session))
+    logger.debug("(SESSION %s) Gameover", session)
     if Config.cleanup:
         shutil.rmtree(Config.directory.planning)
         os.remove("dmai.log")
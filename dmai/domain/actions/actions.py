@@ -18,11 +18,6 @@ logger = get_logger(__name__)
 
 
 class Actions:
-
-    # class variables
-    action_data = dict()
-    state = None
-
     def __init__(self, adventure: Adventure, npcs, state: State, output_builder: OutputBuilder) -> None:
         """Actions class"""
         self.adventure = adventure
@@ -30,15 +25,14 @@ class Actions:
         self.state = state
         self.output_builder = output_builder
         self.actions = dict()
-        self._load_action_data()
+        self.action_data = self._load_action_data()
 
     def __repr__(self) -> str:
         return "Actions:\n{a}".format(a=self.actions)
 
-    @classmethod
-    def _load_action_data(cls) -> None:
-        """Set the cls.action_data class variable data"""
-        cls.action_data = Loader.load_domain("actions")
+    def _load_action_data(self) -> dict:
+        """Return the action data"""
+        return Loader.load_domain("actions")
 
     def _can_move(self, entity: str, destination: str) -> tuple:
         """Check if an entity can be moved to a specified destination.
@@ -60,10 +54,10 @@ class Actions:
                         return (False, "no visibility")
                 
                 # can't move if in a room with monsters that must be killed
-                for monster in self.state.get_dm().npcs.get_all_monsters():
-                    if monster.must_kill and self.state.is_alive(monster.unique_id):
-                        if self.state.get_current_room_id() == self.state.get_current_room_id(monster.unique_id):
-                            return (False, "must kill")
+                for monster_id in self.state.get_room_monster_ids(self.state.get_current_room_id()):
+                    monster = self.state.get_dm().npcs.get_monster(monster_id)
+                    if monster.must_kill and self.state.is_alive(monster_id):
+                        return (False, "must kill")
                 
                 # can't move without quest
                 if not self.state.questing:
@@ -339,7 +333,7 @@ class Actions:
     def roll(self, roll_type: str, nlu_entities: dict = {}, die: str = "d20") -> bool:
         """Attempt to roll a specified type.
         Returns a bool to indicate whether the action was successful"""
-        logger.debug("(SESSION {s}) Actions.roll: {r}".format(s=self.state.session.session_id, r=roll_type))
+        logger.debug("(SESSION %s) Actions.roll: %s", self.state.session.session_id, roll_type)
         roll = Roll(roll_type, die, nlu_entities, self.state, self.output_builder)
         return roll.execute()
 
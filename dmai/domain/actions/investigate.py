@@ -1,6 +1,3 @@
-import inflect
-engine = inflect.engine()
-
 from dmai.utils.output_builder import OutputBuilder
 from dmai.utils.exceptions import UnrecognisedEntityError, UnrecognisedRoomError
 from dmai.utils.text import Text
@@ -71,7 +68,7 @@ class Investigate(Action):
         if self.target_type == "scenery":
             # check the description of the room to see if it's here first
             room_desc = self.state.get_current_room().get_all_text_array()
-            plural_target = engine.plural(self.target)
+            plural_target = Text.plural(self.target)
             if self.target in room_desc or plural_target in room_desc:
                 self.output_builder.append(
                     "You examine the {t}, but you see nothing special.".format(
@@ -1,8 +1,6 @@
-import inflect
-engine = inflect.engine()
-
 from dmai.utils.output_builder import OutputBuilder
 from dmai.utils.exceptions import UnrecognisedEntityError
+from dmai.utils.text import Text
 from dmai.game.state import State
 from dmai.nlg.nlg import NLG
 from dmai.domain.actions.action import Action
@@ -80,7 +78,7 @@ class Roleplay(Action):
             elif self.target_type:
                 # check description of room to see if target's here
                 room_desc = self.state.get_current_room().get_all_text_array()
-                plural_target = engine.plural(self.target)
+                plural_target = Text.plural(self.target)
                 if self.target in room_desc or plural_target in room_desc:
                     self.output_builder.append(NLG.roleplay(verb=self.verb, target=self.target, player_utter=self.player_utter))
                 else:
@@ -191,7 +191,7 @@ class Roll(Action):
     def _ability_roll(self) -> bool:
         """Execute an ability roll.
         Returns a bool to indicate whether the ability check was successful"""
-        logger.debug("(SESSION {s}) Roll _ability_roll State.__dict__".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) Roll _ability_roll State.__dict__", self.state.session.session_id)
 
         player = self.state.get_entity()
         roll = player.ability_roll(self.state.stored_ability_check["solution"])
@@ -213,7 +213,7 @@ class Roll(Action):
     def _skill_roll(self) -> bool:
         """Execute an skill roll.
         Returns a bool to indicate whether the skill check was successful"""
-        logger.debug("(SESSION {s}) Roll _skill_roll State.__dict__".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) Roll _skill_roll State.__dict__", self.state.session.session_id)
 
         player = self.state.get_entity()
         roll = player.skill_roll(self.state.stored_skill_check["solution"])
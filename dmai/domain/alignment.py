@@ -21,10 +21,10 @@ class Alignment:
                 self.__setattr__(key, self.alignment_data[self.alignment][key])
 
         except KeyError as e:
-            logger.error("(SESSION {s}) Alignment does not exist: {c}".format(s=self.state.session.session_id, c=e))
+            logger.error("(SESSION %s) Alignment does not exist: %s", self.state.session.session_id, e)
             raise
         except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create alignment, incorrect attribute: {e}".format(s=self.state.session.session_id, e=e))
+            logger.error("(SESSION %s) Cannot create alignment, incorrect attribute: %s", self.state.session.session_id, e)
             raise
 
     def __repr__(self) -> str:
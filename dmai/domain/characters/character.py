@@ -64,7 +64,7 @@ class Character(ABC):
             self.features = Features(char_class=self.char_class, race=self.race)
 
         except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create character, incorrect attribute: {e}".format(s=self.state.session.session_id, e=e))
+            logger.error("(SESSION %s) Cannot create character, incorrect attribute: %s", self.state.session.session_id, e)
             raise
 
     def __repr__(self) -> str:
@@ -27,10 +27,10 @@ class CharacterClass:
                                  self.char_class_data[self.char_class][key])
 
         except KeyError as e:
-            logger.error("(SESSION {s}) Class does not exist: {c}".format(c=e, s=self.state.session.session_id))
+            logger.error("(SESSION %s) Class does not exist: %s", self.state.session.session_id, e)
             raise
         except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create class, incorrect attribute: {e}".format(e=e, s=self.state.session.session_id))
+            logger.error("(SESSION %s) Cannot create class, incorrect attribute: %s", self.state.session.session_id, e)
             raise
 
     def __repr__(self) -> str:
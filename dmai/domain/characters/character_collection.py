@@ -1,5 +1,8 @@
+import threading
+
 from dmai.utils.output_builder import OutputBuilder
 from dmai.game.state import State
+from dmai.utils.frozen import FrozenDict, thaw
 from dmai.utils.loader import Loader
 from dmai.domain.characters.character import Character
 from dmai.domain.characters.fighter import Fighter
@@ -16,7 +19,8 @@ class CharacterCollectionMeta(type):
 
     def __new__(cls, name, bases, dict):
         instance = super().__new__(cls, name, bases, dict)
-        instance.character_data = {}
+        instance.character_data = FrozenDict()
+        instance.lock = threading.Lock()
         return instance
 
     def __call__(cls, *args, **kwargs) -> None:
@@ -41,7 +45,11 @@ class CharacterCollection(metaclass=CharacterCollectionMeta):
 
     @classmethod
     def load(cls) -> None:
-        cls.character_data = Loader.load_domain("characters")
+        """Method to load the character data once, it is shared read-only by
+        every session"""
+        with cls.lock:
+            if not cls.character_data:
+                cls.character_data = Loader.load_domain("characters")
 
     @classmethod
     def get_all_names(cls) -> list:
@@ -54,7 +62,7 @@ class CharacterCollection(metaclass=CharacterCollectionMeta):
         try:
             character_obj = cls._character_factory(character, state, output_builder)
         except ValueError as e:
-            logger.error("(SESSION {s}) {e}".format(s=state.session.session_id, e=e))
+            logger.error("(SESSION %s) %s", state.session.session_id, e)
         return character_obj
 
     @classmethod
@@ -73,4 +81,4 @@ class CharacterCollection(metaclass=CharacterCollectionMeta):
             msg = "Cannot create character class {c} - it does not exist!".format(
                 c=character)
             raise ValueError(msg)
-        return character_obj(cls.character_data[character], state, output_builder)
+        return character_obj(thaw(cls.character_data[character]), state, output_builder)
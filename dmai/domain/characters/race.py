@@ -26,10 +26,10 @@ class Race:
                 self.subrace = None
 
         except KeyError as e:
-            logger.error("(SESSION {s}) Race does not exist: {r}".format(s=self.state.session.session_id, r=e))
+            logger.error("(SESSION %s) Race does not exist: %s", self.state.session.session_id, e)
             raise
         except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create race, incorrect attribute: {e}".format(s=self.state.session.session_id, e=e))
+            logger.error("(SESSION %s) Cannot create race, incorrect attribute: %s", self.state.session.session_id, e)
             raise
 
     def __repr__(self) -> str:
@@ -17,7 +17,7 @@ class Equipment(ABC):
                 self.__setattr__(key, equipment_data[key])
 
         except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create equipment, incorrect attribute: {e}".format(e=e, s=self.state.session.session_id))
+            logger.error("(SESSION %s) Cannot create equipment, incorrect attribute: %s", self.state.session.session_id, e)
             raise
 
     def __repr__(self) -> str:
@@ -1,3 +1,4 @@
+from dmai.utils.frozen import FrozenDict
 from dmai.utils.loader import Loader
 from dmai.utils.logger import get_logger
 
@@ -32,8 +33,11 @@ class Features:
     @classmethod
     def _load_feature_data(cls) -> None:
         """Set the cls.feature_data class variable data"""
-        cls.feature_data = Loader.load_domain("features")
-        cls.feature_data.update(Loader.load_domain("monster_features"))
+        # merge into a new dict, the loaded data is shared read-only
+        cls.feature_data = FrozenDict({
+            **Loader.load_domain("features"),
+            **Loader.load_domain("monster_features")
+        })
 
     def get_all(self) -> list:
         """Method to return all the features"""
@@ -16,7 +16,7 @@ class Item(ABC):
                 self.__setattr__(key, item_data[key])
 
         except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create item, incorrect attribute: {e}".format(s=self.state.session.session_id, e=e))
+            logger.error("(SESSION %s) Cannot create item, incorrect attribute: %s", self.state.session.session_id, e)
             raise
 
     def __repr__(self) -> str:
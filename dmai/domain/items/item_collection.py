@@ -1,3 +1,5 @@
+from collections import ChainMap
+
 from dmai.utils.output_builder import OutputBuilder
 from dmai.game.state import State
 from dmai.utils.loader import Loader
@@ -33,8 +35,11 @@ class ItemCollection:
         return "Item collection"
 
     def _load_item_data(self) -> None:
-        """Set the self.item_data class variable data"""
-        self.item_data = Loader.load_domain("magic_items")
+        """Set the self.item_data variable data.
+        The shared magic item data is read-only, so the keys and items added
+        during the game are kept in this collection's own dict in front of
+        it."""
+        self.item_data = ChainMap({}, Loader.load_domain("magic_items"))
         self.item_data["silver_key"] = {
             "id": "silver_key",
             "name": "Silver Key",
@@ -86,6 +91,7 @@ class ItemCollection:
         elif item_data:
             # new item to add to the inventory
             self.item_data[item_id] = item_data
+            self.state.registry.add(item_id, "item", item_data, item_data["name"])
             self.state.item_quantity[item_id] = quantity
             return True
         return False
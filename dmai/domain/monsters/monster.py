@@ -55,7 +55,7 @@ class Monster(NPC, MonsterAgent):
             self.spells = Spells(self.spells)
 
         except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create monster, incorrect attribute: {e}".format(s=self.state.session.session_id, e=e))
+            logger.error("(SESSION %s) Cannot create monster, incorrect attribute: %s", self.state.session.session_id, e)
             raise
 
         # Initialise additional variables
@@ -175,7 +175,7 @@ class Monster(NPC, MonsterAgent):
     def set_treasure(self, treasure: list) -> None:
         """Method to set treasure."""
         if self.unique_id not in self.state.monster_treasure_map:
-            self.state.monster_treasure_map[self.unique_id] = treasure
+            self.state.monster_treasure_map[self.unique_id] = list(treasure)
 
     def set_must_kill(self, must_kill: bool) -> None:
         """Method to set must_kill."""
@@ -184,7 +184,7 @@ class Monster(NPC, MonsterAgent):
     def set_attack_player_after_n_moves(self, attack_player_after_n_moves: int) -> None:
         """Method to set attack_player_after_n_moves."""
         self.attack_player_after_n_moves = attack_player_after_n_moves
-        if attack_player_after_n_moves == 0:
+        if attack_player_after_n_moves == 0 and self.unique_id not in self.state.monsters_will_attack:
             self.state.monsters_will_attack.append(self.unique_id)
 
     def get_all_attack_ids(self) -> list:
@@ -200,7 +200,7 @@ class Monster(NPC, MonsterAgent):
     def attack_of_opportunity(self) -> None:
         """Method to perform an attack of opportunity"""
         if not self.state.stationary and self.state.in_combat and self.state.is_alive(self.unique_id):
-            logger.debug("(SESSION {s}) Triggering attack of opportunity in monster: {m}".format(s=self.state.session.session_id, m=self.unique_id))
+            logger.debug("(SESSION %s) Triggering attack of opportunity in monster: %s", self.state.session.session_id, self.unique_id)
             self.output_builder.append(NLG.attack_of_opportunity(attacker=self.name))
 
     def move(self, destination: str, conditions: dict) -> None:
@@ -210,7 +210,7 @@ class Monster(NPC, MonsterAgent):
                 if conditions["monsters"] == "dead":
                     location = self.state.get_current_room_id(self.unique_id)
                     if not self.state.get_dm().npcs.get_monster_id(monster_type="giant_rat", status="alive", location=location):
-                        logger.debug("(SESSION {s}) Triggering movement of monster: {m}".format(s=self.state.session.session_id, m=self.unique_id))
+                        logger.debug("(SESSION %s) Triggering movement of monster: %s", self.state.session.session_id, self.unique_id)
                         self.state.set_current_room(self.unique_id, destination)
 
     def attack(self) -> None:
@@ -221,7 +221,7 @@ class Monster(NPC, MonsterAgent):
                     location = self.state.get_current_room(self.unique_id)
                     if location == self.state.get_current_room():
                         if not self.state.in_combat:
-                            logger.debug("(SESSION {s}) Triggering combat with player: {m}".format(s=self.state.session.session_id, m=self.unique_id))
+                            logger.debug("(SESSION %s) Triggering combat with player: %s", self.state.session.session_id, self.unique_id)
                             if "monster_attack" in location.text:
                                 self.output_builder.append(location.text["monster_attack"]["text"])
                             self.state.combat(self.unique_id, "player")
@@ -1,5 +1,8 @@
+import threading
+
 from dmai.utils.output_builder import OutputBuilder
 from dmai.game.npcs.npc import NPC
+from dmai.utils.frozen import FrozenDict, thaw
 from dmai.utils.loader import Loader
 from dmai.domain.monsters.monster import Monster
 from dmai.domain.monsters.cat import Cat
@@ -18,7 +21,8 @@ class MonsterCollectionMeta(type):
 
     def __new__(cls, name, bases, dict):
         instance = super().__new__(cls, name, bases, dict)
-        instance.monster_data = {}
+        instance.monster_data = FrozenDict()
+        instance.lock = threading.Lock()
         instance.monster_map = {
             "cat": Cat,
             "giant_rat": GiantRat,
@@ -49,7 +53,11 @@ class MonsterCollection(metaclass=MonsterCollectionMeta):
 
     @classmethod
     def load(cls) -> None:
-        cls.monster_data = Loader.load_domain("monsters")
+        """Method to load the monster data once, it is shared read-only by
+        every session"""
+        with cls.lock:
+            if not cls.monster_data:
+                cls.monster_data = Loader.load_domain("monsters")
 
     @classmethod
     def get_monster(cls, monster_cls: str, state: State, output_builder: OutputBuilder, unique_id: str = None, unique_name: str = None) -> Monster:
@@ -57,7 +65,7 @@ class MonsterCollection(metaclass=MonsterCollectionMeta):
         try:
             return cls._monster_factory(monster_cls=monster_cls, state=state, output_builder=output_builder, unique_id=unique_id, unique_name=unique_name)
         except ValueError as e:
-            logger.error("(SESSION {s}) {e}".format(s=state.session.session_id, e=e))
+            logger.error("(SESSION %s) %s", state.session.session_id, e)
 
     @classmethod
     def get_monster_npc(cls, npc_data: dict, state: State, output_builder: OutputBuilder) -> NPC:
@@ -70,7 +78,7 @@ class MonsterCollection(metaclass=MonsterCollectionMeta):
             monster.set_attack_player_after_n_moves(npc_data["attack_player_after_n_moves"])
             return monster
         except ValueError as e:
-            logger.error("(SESSION {s}) {e}".format(s=state.session.session_id, e=e))
+            logger.error("(SESSION %s) %s", state.session.session_id, e)
 
     @classmethod
     def _monster_factory(cls,
@@ -88,7 +96,9 @@ class MonsterCollection(metaclass=MonsterCollectionMeta):
                 monster_cls = npc_data["monster"].lower()
 
             monster = cls.monster_map[monster_cls]
-            return monster(cls.monster_data[monster_cls], state, output_builder, npc_data, unique_id, unique_name)
+            # each monster gets its own copy of the shared data to modify
+            monster_data = thaw(cls.monster_data[monster_cls])
+            return monster(monster_data, state, output_builder, npc_data, unique_id, unique_name)
         except (ValueError, KeyError) as e:
             msg = "Cannot create monster {m} - it does not exist!".format(
                 m=monster_cls)
@@ -1,9 +1,12 @@
-from typing import Generator
+from collections.abc import Mapping as MappingABC
+from copy import copy
+from typing import Generator, Mapping
 
 from dmai.game.state import State
-from dmai.utils.loader import Loader
 from dmai.utils.text import Text
 from dmai.game.world.room import Room
+from dmai.game.world.puzzles.puzzle import Puzzle
+from dmai.game.world.world import World
 from dmai.utils.output_builder import OutputBuilder
 from dmai.utils.exceptions import UnrecognisedRoomError
 from dmai.utils.logger import get_logger
@@ -11,43 +14,60 @@ from dmai.utils.logger import get_logger
 logger = get_logger(__name__)
 
 
-class Adventure:
+class RoomMap(MappingABC):
+    def __init__(self, adventure: "Adventure") -> None:
+        """Class which maps room ids to the session's rooms, a room is built
+        on first access so load time scales with the rooms actually used"""
+        self.adventure = adventure
+        self.built = {}
+
+    def __repr__(self) -> str:
+        return "{c} with {b} of {n} rooms built".format(c=self.__class__.__name__, b=len(self.built), n=len(self))
+
+    def __getitem__(self, room_id: str) -> Room:
+        room = self.built.get(room_id)
+        if room is None:
+            adventure = self.adventure
+            definition = adventure.world.rooms[room_id]
+            logger.debug("(SESSION %s) Building room: %s", adventure.state.session.session_id, room_id)
+            room = Room(definition, adventure.state, adventure.output_builder)
+            self.built[room_id] = room
+        return room
 
-    # class variables
-    adventure_data = dict()
+    def __iter__(self):
+        return iter(self.adventure.world.rooms)
 
+    def __len__(self) -> int:
+        return len(self.adventure.world.rooms)
+
+
+class Adventure:
     def __init__(self, adventure: str, state: State, output_builder: OutputBuilder) -> None:
         """Main class for the adventure"""
         self.adventure = adventure
         self.state = state
         self.output_builder = output_builder
-        self._load_adventure_data(self.adventure)
-
-        try:
-            for key in self.adventure_data:
-                self.__setattr__(key, self.adventure_data[key])
-        except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create adventure, incorrect attribute: {e}".format(s=self.state.session.session_id, e=e))
-            raise
-
+        self.world = World.get_world(self.adventure)
         self._build_world()
 
     def __repr__(self) -> str:
         return "Adventure: {a}".format(a=self.title)
 
-    @classmethod
-    def _load_adventure_data(cls, adventure) -> None:
-        """Set the cls.adventure_data class variable data"""
-        cls.adventure_data = Loader.load_adventure(adventure)
+    def __getattr__(self, name: str) -> object:
+        """Method to read static adventure data from the shared world"""
+        if "world" not in self.__dict__ or name not in self.adventure_data:
+            raise AttributeError("{c} has no attribute {n}".format(c=self.__class__.__name__, n=name))
+        return self.adventure_data[name]
 
-    def _build_world(self) -> None:
-        """Method to build the world"""
-        self.rooms = dict()
+    @property
+    def adventure_data(self) -> Mapping:
+        """The adventure data in the shared world"""
+        return self.world.adventure_data
 
-        for room_name in self.adventure_data["rooms"]:
-            room_data = self.adventure_data["rooms"][room_name]
-            room = Room(room_data, self.state, self.output_builder)
-            self.rooms[room_name] = room
+    def _build_world(self) -> None:
+        """Method to build this session's view of the shared world, rooms
+        are built when first accessed"""
+        self.rooms = RoomMap(self)
 
     @property
     def intro_text(self) -> str:
@@ -58,10 +78,24 @@ class Adventure:
 
     def get_init_room(self) -> str:
         """Method to get the starting room"""
-        for room_id in self.rooms:
-            if self.rooms[room_id].init:
+        for room_id in self.world.rooms:
+            if self.world.rooms[room_id]["init"]:
                 return room_id
 
+    def fork(self, state: State, output_builder: OutputBuilder) -> "Adventure":
+        """Method to return a view of the adventure for a forked state.
+        Its rooms are built again when used, so they change the branch."""
+        adventure = copy(self)
+        adventure.state = state
+        adventure.output_builder = output_builder
+        adventure._build_world()
+        return adventure
+
+    def trigger(self) -> None:
+        """Method to run the triggers of the room the player is in, which is
+        the only room whose triggers can fire"""
+        self.get_room(self.state.get_current_room_id()).trigger()
+
     def get_room(self, room_id: str) -> Room:
         try:
             return self.rooms[room_id]
@@ -73,3 +107,35 @@ class Adventure:
         """Method to return all room objects in a list.
         Returns a list of rooms"""
         return list(self.rooms.values())
+
+    def get_doors(self) -> list:
+        """Method to return each connection between rooms once.
+        Returns a list of (room, connected room) tuples"""
+        return list(self.world.doors)
+
+    def get_puzzle(self, puzzle_id: str) -> Puzzle:
+        """Method to return a puzzle in any room, or None if not found"""
+        room_id = self.world.puzzle_rooms.get(puzzle_id)
+        if room_id:
+            return self.get_room(room_id).puzzles.get_puzzle(puzzle_id)
+
+    def get_all_puzzles(self) -> list:
+        """Method to return the puzzles of every room in a list"""
+        return [self.get_puzzle(puzzle_id) for puzzle_id in self.world.puzzle_rooms]
+
+    def get_puzzle_room(self, puzzle_id: str) -> str:
+        """Method to return the id of the room a puzzle is in"""
+        return self.world.puzzle_rooms.get(puzzle_id)
+
+    def get_room_puzzle_ids(self, room_id: str) -> list:
+        """Method to return the ids of the puzzles in a room"""
+        return list(self.world.room_puzzles.get(room_id, []))
+
+    def get_solutions(self, solution_type: str, puzzle_id: str) -> list:
+        """Method to return the values of a puzzle's solutions of specified
+        type, e.g. the items which open a door"""
+        return list(self.world.solutions[solution_type].get(puzzle_id, []))
+
+    def get_item_puzzles(self, item: str) -> list:
+        """Method to return the ids of the puzzles an item is a solution of"""
+        return list(self.world.item_puzzles.get(item, []))
@@ -0,0 +1,138 @@
+from copy import deepcopy
+
+from dmai.game.state import State, SNAPSHOT_CODEC
+from dmai.utils.exceptions import SnapshotError
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class DeltaTracker:
+
+    # class variables
+    CHECKPOINT_INTERVAL = 20
+
+    def __init__(self, state: State, checkpoint_interval: int = None) -> None:
+        """Class which tracks the changes to a game state between saves.
+        Each commit produces a record which is either a full checkpoint or a
+        delta against the previous commit. A checkpoint is written for the
+        first commit and whenever the turn count crosses a multiple of the
+        checkpoint interval, so chains stay short without storing a counter."""
+        self.state = state
+        self.checkpoint_interval = checkpoint_interval or self.CHECKPOINT_INTERVAL
+        self.base = None
+
+    def __repr__(self) -> str:
+        return "{c}".format(c=self.__class__.__name__)
+
+    def reset(self) -> None:
+        """Method to make the current state the base of the next delta,
+        called when a state was loaded from storage"""
+        self.base = self.state.save()
+
+    def commit(self) -> dict:
+        """Method to record the changes since the last commit.
+        Returns a checkpoint or delta record, or None if nothing changed."""
+        saved_state = self.state.save()
+        base = self.base
+        self.base = saved_state
+        turn = saved_state["turns"]
+
+        if base is None or turn // self.checkpoint_interval != base["turns"] // self.checkpoint_interval:
+            logger.debug("(SESSION %s) Writing checkpoint at turn %s",
+                self.state.session.session_id, turn)
+            return {"kind": "checkpoint", "turn": turn, "state": saved_state}
+
+        delta = DeltaChain.diff(base, saved_state)
+        if not delta:
+            return None
+        delta.update({"kind": "delta", "turn": turn, "base": base["turns"]})
+        return delta
+
+
+class DeltaChainMeta(type):
+    _instances = {}
+
+    def __call__(cls, *args, **kwargs) -> None:
+        """DeltaChain static singleton metaclass"""
+        if cls not in cls._instances:
+            instance = super().__call__(*args, **kwargs)
+            cls._instances[cls] = instance
+        return cls._instances[cls]
+
+
+class DeltaChain(metaclass=DeltaChainMeta):
+    def __init__(self) -> None:
+        """DeltaChain static class"""
+        pass
+
+    @classmethod
+    def diff(cls, old: dict, new: dict) -> dict:
+        """Method to find the changed fields of a saved state.
+        Dict fields are compared key by key, other fields are replaced.
+        Returns a dict of changes, empty if nothing changed."""
+        delta = {}
+        for (field, value) in new.items():
+            if field not in old:
+                delta.setdefault("set", {})[field] = value
+            elif old[field] == value:
+                continue
+            elif isinstance(value, dict) and isinstance(old[field], dict):
+                changes = {}
+                for (key, item) in value.items():
+                    if key not in old[field] or old[field][key] != item:
+                        changes.setdefault("set", {})[key] = item
+                removed = [key for key in old[field] if key not in value]
+                if removed:
+                    changes["unset"] = removed
+                delta.setdefault("keys", {})[field] = changes
+            else:
+                delta.setdefault("set", {})[field] = value
+        removed = [field for field in old if field not in new]
+        if removed:
+            delta["unset"] = removed
+        return delta
+
+    @classmethod
+    def apply(cls, saved_state: dict, delta: dict) -> None:
+        """Method to apply a delta record to a saved state in place"""
+        if saved_state.get("turns") != delta["base"]:
+            msg = "Delta for turn {t} does not follow turn {b}".format(
+                t=delta["turn"], b=saved_state.get("turns"))
+            raise SnapshotError(msg)
+        saved_state.update(delta.get("set", {}))
+        for field in delta.get("unset", []):
+            saved_state.pop(field, None)
+        for (field, changes) in delta.get("keys", {}).items():
+            saved_state[field].update(changes.get("set", {}))
+            for key in changes.get("unset", []):
+                saved_state[field].pop(key, None)
+
+    @classmethod
+    def reconstruct(cls, records: list) -> dict:
+        """Method to rebuild a saved state from a chain of records, which may
+        be encoded. Records before the last checkpoint are ignored.
+        Returns the saved state dict."""
+        records = [cls.decode(r) if isinstance(r, bytes) else deepcopy(r) for r in records]
+        start = None
+        for (i, record) in enumerate(records):
+            if record["kind"] == "checkpoint":
+                start = i
+        if start is None:
+            raise SnapshotError("Delta chain has no checkpoint")
+
+        saved_state = records[start]["state"]
+        for record in records[start + 1:]:
+            cls.apply(saved_state, record)
+        return saved_state
+
+    @classmethod
+    def encode(cls, record: dict) -> bytes:
+        """Method to encode a record for storage, only checkpoints are
+        compressed as deltas are too small to benefit"""
+        return SNAPSHOT_CODEC.encode(record, record["kind"] == "checkpoint")
+
+    @classmethod
+    def decode(cls, data: bytes) -> dict:
+        """Method to decode a stored record"""
+        return SNAPSHOT_CODEC.decode(data)
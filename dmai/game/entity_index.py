@@ -0,0 +1,198 @@
+from bisect import bisect_left
+from collections import OrderedDict
+
+from dmai.game.state import State, Status
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class EntityIndex:
+
+    # class variables
+    PREFIX_LENGTH = 3
+    # edits allowed per word are len(word) // WORD_LENGTH_PER_EDIT, so
+    # words shorter than this must match exactly
+    WORD_LENGTH_PER_EDIT = 4
+    MAX_EDITS = 2
+    # most recent NLU values kept resolved
+    MAX_RESOLVED = 1024
+
+    def __init__(self, adventure, npcs, state: State) -> None:
+        """Class which resolves NLU entity values to the ids of monsters,
+        NPCs, rooms and puzzles in the world"""
+        self.adventure = adventure
+        self.npcs = npcs
+        self.state = state
+        self.build()
+
+    def __repr__(self) -> str:
+        return "{c}".format(c=self.__class__.__name__)
+
+    def build(self) -> None:
+        """Method to build the alias and trigram indexes"""
+        self.aliases = {"monster": {}, "npc": {}, "location": {}, "puzzle": {}}
+        self.ids = {kind: set() for kind in self.aliases}
+        self.trigrams = {kind: {} for kind in self.aliases}
+        self.trigram_counts = {kind: {} for kind in self.aliases}
+        self.sorted_aliases = {}
+        self.resolved = OrderedDict()
+        self.monster_ids = {}
+
+        for monster in self.npcs.get_all_monsters():
+            self.monster_ids.setdefault(monster.id, []).append(monster.unique_id)
+            self._add_alias("monster", monster.id, monster.id)
+            self._add_alias("monster", monster.name, monster.id)
+        for npc in self.npcs.get_all_npcs():
+            self._add_alias("npc", npc.id, npc.id)
+            self._add_alias("npc", npc.name, npc.id)
+            if hasattr(npc, "long_name"):
+                self._add_alias("npc", npc.long_name, npc.id)
+        for (room_id, room) in self.adventure.world.rooms.items():
+            self._add_alias("location", room_id, room_id)
+            self._add_alias("location", room["name"], room_id)
+            for (puzzle_id, puzzle) in room["puzzles"].items():
+                if puzzle["type"] != "door":
+                    self._add_alias("puzzle", puzzle_id, puzzle_id)
+                    self._add_alias("puzzle", puzzle["name"], puzzle_id)
+
+        for kind in self.aliases:
+            self.sorted_aliases[kind] = sorted(self.aliases[kind])
+            for alias in self.aliases[kind]:
+                trigrams = self._trigrams(alias)
+                self.trigram_counts[kind][alias] = len(trigrams)
+                for trigram in trigrams:
+                    self.trigrams[kind].setdefault(trigram, set()).add(alias)
+
+    def _normalise(self, value: str) -> str:
+        """Method to normalise a name or id for lookups"""
+        value = value.lower().replace("_", " ").replace("-", " ").strip()
+        if value.startswith("the "):
+            value = value[4:]
+        return " ".join(value.split())
+
+    def _trigrams(self, value: str) -> set:
+        """Method to return the set of trigrams in a padded value"""
+        padded = "  {v} ".format(v=value)
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def _add_alias(self, kind: str, alias: str, entity_id: str) -> None:
+        """Method to add an alias for an id, the first id for an alias wins"""
+        alias = self._normalise(alias)
+        self.ids[kind].add(entity_id)
+        if alias and alias not in self.aliases[kind]:
+            self.aliases[kind][alias] = entity_id
+
+    def resolve(self, kind: str, value: str) -> str:
+        """Method to resolve an NLU entity value to an id of specified kind.
+        Exact ids and names are tried first, then unique prefixes of whole
+        words and finally the closest name with a typo in some of its words.
+        Returns the id, or None if nothing is close enough."""
+        key = (kind, value)
+        if key in self.resolved:
+            self.resolved.move_to_end(key)
+            return self.resolved[key]
+        resolved = self._resolve(kind, value)
+        self.resolved[key] = resolved
+        if len(self.resolved) > self.MAX_RESOLVED:
+            self.resolved.popitem(last=False)
+        return resolved
+
+    def _resolve(self, kind: str, value: str) -> str:
+        aliases = self.aliases[kind]
+        if value in self.ids[kind]:
+            return value
+        alias = self._normalise(value)
+        if alias in aliases:
+            return aliases[alias]
+
+        # unique prefix of a name ending with a whole word, e.g. "burial"
+        # but not "inn" for the inn's cellar
+        if len(alias) >= self.PREFIX_LENGTH:
+            sorted_aliases = self.sorted_aliases[kind]
+            matches = set()
+            i = bisect_left(sorted_aliases, alias)
+            while i < len(sorted_aliases) and sorted_aliases[i].startswith(alias):
+                if sorted_aliases[i][len(alias):len(alias) + 1] in ("", " "):
+                    matches.add(aliases[sorted_aliases[i]])
+                i += 1
+            if len(matches) == 1:
+                return matches.pop()
+
+        # typo tolerant match, the candidates share a trigram and every word
+        # must be within a few edits of the name's word
+        trigrams = self._trigrams(alias)
+        shared = {}
+        for trigram in trigrams:
+            for candidate in self.trigrams[kind].get(trigram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        best = None
+        best_key = None
+        for (candidate, count) in shared.items():
+            edits = self._word_edits(alias, candidate)
+            if edits is None:
+                continue
+            key = (edits, -2 * count / (len(trigrams) + self.trigram_counts[kind][candidate]))
+            if best_key is None or key < best_key:
+                best = aliases[candidate]
+                best_key = key
+        if best:
+            logger.debug("(SESSION %s) Resolved %s %s to %s",
+                self.state.session.session_id, kind, value, best)
+        return best
+
+    def _word_edits(self, value: str, alias: str) -> int:
+        """Method to return the number of edits from value to alias, or None
+        if a word needs more edits than its length allows"""
+        words = value.split()
+        alias_words = alias.split()
+        if len(words) != len(alias_words):
+            return None
+        total = 0
+        for (word, alias_word) in zip(words, alias_words):
+            allowed = min(len(word) // self.WORD_LENGTH_PER_EDIT, self.MAX_EDITS)
+            edits = self._edit_distance(word, alias_word, allowed)
+            if edits > allowed:
+                return None
+            total += edits
+        return total
+
+    def _edit_distance(self, a: str, b: str, limit: int) -> int:
+        """Method to return the edit distance between two words, counting
+        a swap of adjacent letters as one edit.
+        Returns limit + 1 once the distance is over limit."""
+        if abs(len(a) - len(b)) > limit:
+            return limit + 1
+        previous = None
+        row = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            (before, previous, row) = (previous, row, [i] + [0] * len(b))
+            for j in range(1, len(b) + 1):
+                row[j] = min(
+                    previous[j] + 1,
+                    row[j - 1] + 1,
+                    previous[j - 1] + (a[i - 1] != b[j - 1])
+                )
+                if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                    row[j] = min(row[j], before[j - 2] + 1)
+            if min(row) > limit:
+                return limit + 1
+        return row[-1]
+
+    def get_monster_id(self,
+                       monster_type: str,
+                       status: str = None,
+                       location: str = None) -> str:
+        """Method to find a monster of specified type and status.
+        Returns a string with the monster id matching requirements."""
+        if location:
+            # the room index in the state only holds the room's occupants
+            candidates = [
+                monster_id for monster_id in self.state.get_room_monster_ids(location)
+                if self.npcs.get_monster(monster_id).id == monster_type
+            ]
+        else:
+            candidates = self.monster_ids.get(monster_type, [])
+        for monster_id in candidates:
+            if not status or Status(status) == self.state.current_status.get(monster_id):
+                return monster_id
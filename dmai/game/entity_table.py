@@ -0,0 +1,249 @@
+from array import array
+from collections.abc import MutableMapping
+
+
+class IntColumn:
+
+    __slots__ = ("data", "present", "count")
+
+    def __init__(self) -> None:
+        """Column of int values stored in an array, with a mask of the rows
+        which hold a value"""
+        self.data = array("q")
+        self.present = bytearray()
+        self.count = 0
+
+    def grow(self) -> None:
+        """Method to add an empty row"""
+        self.data.append(0)
+        self.present.append(0)
+
+    def has(self, row: int) -> bool:
+        return bool(self.present[row])
+
+    def get(self, row: int) -> int:
+        return self.data[row]
+
+    def set(self, row: int, value: int) -> None:
+        if not self.present[row]:
+            self.present[row] = 1
+            self.count += 1
+        self.data[row] = value
+
+    def unset(self, row: int) -> None:
+        if self.present[row]:
+            self.present[row] = 0
+            self.count -= 1
+
+    def reset(self) -> None:
+        """Method to remove every value, keeping the rows"""
+        self.present = bytearray(len(self.present))
+        self.count = 0
+
+    def copy(self) -> "IntColumn":
+        column = IntColumn()
+        column.data = self.data[:]
+        column.present = self.present[:]
+        column.count = self.count
+        return column
+
+    def find(self, value: int) -> list:
+        """Method to return the rows holding specified value"""
+        return [
+            row for (row, (item, present)) in enumerate(zip(self.data, self.present))
+            if present and item == value
+        ]
+
+
+class CodeColumn:
+
+    __slots__ = ("data", "values", "codes", "count")
+
+    # code of a row without a value
+    ABSENT = -1
+
+    def __init__(self, values: list = None) -> None:
+        """Column of values from a small set, such as enum members or room
+        ids, stored as int codes in an array.
+        Each distinct value is kept once in the values list."""
+        self.data = array("i")
+        self.values = []
+        self.codes = {}
+        self.count = 0
+        for value in values or []:
+            self.encode(value)
+
+    def encode(self, value) -> int:
+        """Method to return the code of a value, adding it if new"""
+        if value not in self.codes:
+            self.codes[value] = len(self.values)
+            self.values.append(value)
+        return self.codes[value]
+
+    def grow(self) -> None:
+        """Method to add an empty row"""
+        self.data.append(self.ABSENT)
+
+    def has(self, row: int) -> bool:
+        return self.data[row] != self.ABSENT
+
+    def get(self, row: int):
+        return self.values[self.data[row]]
+
+    def set(self, row: int, value) -> None:
+        if self.data[row] == self.ABSENT:
+            self.count += 1
+        self.data[row] = self.encode(value)
+
+    def unset(self, row: int) -> None:
+        if self.data[row] != self.ABSENT:
+            self.data[row] = self.ABSENT
+            self.count -= 1
+
+    def reset(self) -> None:
+        """Method to remove every value, keeping the rows"""
+        self.data = array("i", [self.ABSENT]) * len(self.data)
+        self.count = 0
+
+    def copy(self) -> "CodeColumn":
+        column = CodeColumn()
+        column.data = self.data[:]
+        column.values = list(self.values)
+        column.codes = dict(self.codes)
+        column.count = self.count
+        return column
+
+    def find(self, value) -> list:
+        """Method to return the rows holding specified value"""
+        code = self.codes.get(value)
+        if code is None:
+            return []
+        return [row for (row, item) in enumerate(self.data) if item == code]
+
+
+class ColumnMapping(MutableMapping):
+
+    __slots__ = ("table", "column")
+
+    def __init__(self, table: "EntityTable", column) -> None:
+        """Class which reads and writes a column of the entity table as a
+        dict keyed by entity id"""
+        self.table = table
+        self.column = column
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+    def __getitem__(self, entity: str):
+        row = self.table.rows.get(entity)
+        if row is None or not self.column.has(row):
+            raise KeyError(entity)
+        return self.column.get(row)
+
+    def __setitem__(self, entity: str, value) -> None:
+        self.column.set(self.table.add(entity), value)
+
+    def __delitem__(self, entity: str) -> None:
+        row = self.table.rows.get(entity)
+        if row is None or not self.column.has(row):
+            raise KeyError(entity)
+        self.column.unset(row)
+
+    def __contains__(self, entity: str) -> bool:
+        row = self.table.rows.get(entity)
+        return row is not None and self.column.has(row)
+
+    def __iter__(self):
+        ids = self.table.ids
+        return (ids[row] for row in range(len(ids)) if self.column.has(row))
+
+    def __len__(self) -> int:
+        return self.column.count
+
+    def clear(self) -> None:
+        self.column.reset()
+
+
+class EntityRow:
+
+    __slots__ = ("table", "row")
+
+    def __init__(self, table: "EntityTable", row: int) -> None:
+        """Class which reads one entity's values from the entity table"""
+        self.table = table
+        self.row = row
+
+    def __repr__(self) -> str:
+        return "{c}: {i}".format(c=self.__class__.__name__, i=self.id)
+
+    @property
+    def id(self) -> str:
+        return self.table.ids[self.row]
+
+    def __getitem__(self, name: str):
+        column = self.table.columns[name]
+        if not column.has(self.row):
+            raise KeyError(name)
+        return column.get(self.row)
+
+
+class EntityTable:
+    def __init__(self) -> None:
+        """Class which stores the runtime data of every entity as columns,
+        one row per entity.
+        Entity ids are mapped to int rows once, and the values of a column
+        are held in a single array instead of a dict per field."""
+        self.ids = []
+        self.rows = {}
+        self.columns = {}
+
+    def __repr__(self) -> str:
+        return "{c} with {n} entities".format(c=self.__class__.__name__, n=len(self.ids))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add_column(self, name: str, column) -> ColumnMapping:
+        """Method to add a column.
+        Returns a dict-like view of the column."""
+        for _ in self.ids:
+            column.grow()
+        self.columns[name] = column
+        return ColumnMapping(self, column)
+
+    def add(self, entity: str) -> int:
+        """Method to return the row of an entity, adding it if new"""
+        row = self.rows.get(entity)
+        if row is None:
+            row = len(self.ids)
+            self.ids.append(entity)
+            self.rows[entity] = row
+            for column in self.columns.values():
+                column.grow()
+        return row
+
+    def copy(self) -> "EntityTable":
+        """Method to copy the table, the arrays are copied in bulk"""
+        table = EntityTable()
+        table.ids = list(self.ids)
+        table.rows = dict(self.rows)
+        table.columns = {name: column.copy() for (name, column) in self.columns.items()}
+        return table
+
+    def get(self, entity: str) -> EntityRow:
+        """Method to return the row of an entity, or None if unknown"""
+        row = self.rows.get(entity)
+        if row is not None:
+            return EntityRow(self, row)
+
+    def select(self, **conditions) -> list:
+        """Method to find the entities whose columns hold the specified
+        values, e.g. select(current_room="crypt", current_status=Status.ALIVE).
+        Returns a list of entity ids in row order."""
+        rows = None
+        for (name, value) in conditions.items():
+            found = self.columns[name].find(value)
+            rows = set(found) if rows is None else rows.intersection(found)
+        if rows is None:
+            return list(self.ids)
+        return [self.ids[row] for row in sorted(rows)]
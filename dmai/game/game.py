@@ -3,10 +3,15 @@ from dmai.domain.characters.character_collection import CharacterCollection
 from dmai.domain.monsters.monster_collection import MonsterCollection
 from dmai.game.player import Player
 from dmai.nlu.rasa_adapter import RasaAdapter
+from dmai.nlu.rasa_interpreter_adapter import RasaInterpreterAdapter
 from dmai.nlg.nlg import NLG
 from dmai.nlu.nlu import NLU
 from dmai.dm import DM
 from dmai.game.state import State
+from dmai.game.delta import DeltaTracker, DeltaChain
+from dmai.utils.config import Config
+from dmai.utils.tracer import Tracer
+from dmai.utils.profiler import Profiler
 from dmai.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,33 +24,52 @@ class Game:
                  skip_intro: bool = False,
                  adventure: str = "the_tomb_of_baradin_stormfury",
                  session_id: str = "",
-                 saved_state: dict = None) -> None:
-        """Main class for the game"""
+                 saved_state: dict = None,
+                 rasa_host: str = None,
+                 rasa_port: int = None) -> None:
+        """Main class for the game.
+        All mutable game data is held per instance, so several games can run
+        in one process."""
         self.char_class = char_class
         self.char_name = char_name
         self.skip_intro = skip_intro
         self.adventure = adventure
         self.session_id = session_id
+        self.rasa_endpoint = RasaAdapter.get_endpoint(rasa_host, rasa_port)
         self.output_builder = OutputBuilder()
         # Initialise state
         self.state = State(self.output_builder, self.session_id)
+        self.tracker = DeltaTracker(self.state)
         if saved_state:
+            # a list of stored records is rebuilt from its last checkpoint
+            if isinstance(saved_state, list):
+                saved_state = DeltaChain.reconstruct(saved_state)
             self.state.load(saved_state)
+            self.tracker.reset()
 
 
+    def set_session(self, session_id: str, rasa_host: str = None, rasa_port: int = None) -> None:
+        """Method to give a game cloned from a template its own session"""
+        self.session_id = session_id
+        self.state.session.set_session_id(session_id)
+        self.rasa_endpoint = RasaAdapter.get_endpoint(rasa_host, rasa_port)
+        self.nlu.endpoint = self.rasa_endpoint
+        self.state.journal.settings["session_id"] = session_id
+
     def load(self) -> None:
-        logger.debug("(SESSION {s}) Initialising adventure: {a}".format(s=self.session_id, a=self.adventure))
+        logger.debug("(SESSION %s) Initialising adventure: %s", self.session_id, self.adventure)
         self.player = None
 
-        # Configure endpoints
-        RasaAdapter.configure_endpoint()
+        # the embedded model is only loaded once
+        if Config.nlu.backend == "embedded":
+            RasaInterpreterAdapter.load()
         
-        # load data in static classes
+        # load shared read-only data in static classes
         CharacterCollection.load()
         MonsterCollection.load()
 
         # Initialise NLU
-        self.nlu = NLU(self.state, self.output_builder)
+        self.nlu = NLU(self.state, self.output_builder, self.rasa_endpoint)
 
         # Initialise DM
         self.dm = DM(self.adventure, self.nlu,self.state, self.output_builder)
@@ -77,8 +101,27 @@ class Game:
             self.intro_text = self.dm.get_intro_text()
             self.state.pause()
 
+        # record the turns from here on
+        self.state.journal.start(self.state.save(), {
+            "adventure": self.adventure,
+            "session_id": self.session_id,
+            "skip_intro": not self.intro
+        })
+
     def input(self, player_utter: str) -> None:
         """Receive a player input"""
+        session_id = self.state.session.session_id
+        # checkpoint between turns, an output depends on the transient output
+        # of the input before it
+        if self.state.journal.full:
+            self.state.journal.checkpoint(self.state.save())
+        with self.state.journal.turn("input", player_utter), \
+                Tracer.span("turn", session_id=session_id, turn=self.state.turns + 1), \
+                Profiler.turn(session_id, self.state.turns + 1):
+            self._input(player_utter)
+
+    def _input(self, player_utter: str) -> None:
+        """Process a player input"""
 
         # increment turns
         self.state.turns += 1
@@ -102,7 +145,7 @@ class Game:
             player_utter = player_utter.lower()
             character = CharacterCollection.get_character(player_utter, self.state, self.output_builder)
             if character:
-                self.state.set_char_class(character)
+                self.state.set_char_class(character.char_class.name)
                 self.player = Player(character, self.state, self.output_builder)
                 self.state.set_player(self.player)
 
@@ -111,10 +154,16 @@ class Game:
             self.state.set_char_name(player_utter)
             succeed = self.dm.input(player_utter, utter_type="name")
 
+        elif player_utter and player_utter[0] in ("/", "\\"):
+            # the player is issuing a command, e.g. /help
+            self.nlu.process_player_command(player_utter)
+
         elif player_utter:
             # attempt to determine the player's intent
             player_utter = player_utter.replace("\"", "'")
-            (intent, params) = self.nlu.process_player_utterance(player_utter)
+            with Tracer.span("nlu.parse"):
+                (intent, params) = self.nlu.process_player_utterance(player_utter)
+            self.state.journal.check("intent", (intent, params))
 
             # relay the player utterance to the dm
             succeed = self.dm.input(player_utter, intent=intent, kwargs=params)
@@ -130,6 +179,11 @@ class Game:
 
     def output(self) -> str:
         """Return an output for the player"""
+        with self.state.journal.turn("output"):
+            return self._output()
+
+    def _output(self) -> str:
+        """Build the output for the player"""
 
         # the game starts
         if self.intro:
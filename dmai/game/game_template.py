@@ -0,0 +1,46 @@
+import gc
+import pickle
+
+from dmai.game.game import Game
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class GameTemplate:
+    def __init__(self,
+                 char_class: str = None,
+                 char_name: str = None,
+                 skip_intro: bool = False,
+                 adventure: str = "the_tomb_of_baradin_stormfury") -> None:
+        """Class which builds a fully loaded game once and serves new
+        sessions by cloning it, instead of rebuilding the world each time.
+        The template is kept frozen as pickled bytes, so a template built
+        before a server forks its workers is shared copy-on-write."""
+        self.adventure = adventure
+        game = Game(char_class=char_class,
+                    char_name=char_name,
+                    skip_intro=skip_intro,
+                    adventure=adventure)
+        game.load()
+        self.template = pickle.dumps(game, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.debug("Built game template for %s (%s bytes)",
+            adventure, len(self.template))
+
+    def __repr__(self) -> str:
+        return "{c} for {a}".format(c=self.__class__.__name__, a=self.adventure)
+
+    def new_game(self, session_id: str = "", rasa_host: str = None, rasa_port: int = None) -> Game:
+        """Method to start a new session from the template.
+        Returns a loaded Game."""
+        # unpickling allocates thousands of containers, which would trigger
+        # collections that cannot free anything
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            game = pickle.loads(self.template)
+        finally:
+            if enabled:
+                gc.enable()
+        game.set_session(session_id, rasa_host, rasa_port)
+        return game
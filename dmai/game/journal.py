@@ -0,0 +1,139 @@
+from contextlib import contextmanager
+from copy import deepcopy
+
+from dmai.utils.config import Config
+from dmai.utils.dice_roller import DiceRoller
+from dmai.utils.exceptions import ReplayError
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Journal:
+    def __init__(self) -> None:
+        """Class which records each game turn as an event.
+        An event holds the player utterance and, in order, every value the
+        turn drew from outside the game: NLU results, dice rolls and plans.
+        When replaying, the recorded values are returned instead of calling
+        Rasa, the planner or the random number generator."""
+        self.initial = None
+        self.settings = {}
+        self.events = []
+        self.recording = False
+        self.replaying = False
+        self.event = None
+        self.position = 0
+        self.next_event = 0
+
+    def __repr__(self) -> str:
+        return "{c}".format(c=self.__class__.__name__)
+
+    def start(self, saved_state: dict, settings: dict) -> None:
+        """Method to start recording from a saved state, the settings are
+        the Game arguments needed to recreate the game"""
+        self.initial = saved_state
+        self.settings = settings
+        self.events = []
+        self.recording = True
+        self.replaying = False
+
+    @property
+    def full(self) -> bool:
+        return self.recording and len(self.events) >= Config.journal.max_events
+
+    def checkpoint(self, saved_state: dict) -> None:
+        """Method to restart recording from a saved state, the events before
+        it are dropped and a replay starts from the checkpoint"""
+        logger.debug("Journal checkpoint after %s events", len(self.events))
+        self.initial = saved_state
+        self.events = []
+
+    def replay(self, events: list) -> None:
+        """Method to replay recorded events instead of recording"""
+        self.events = list(events)
+        self.recording = False
+        self.replaying = True
+        self.next_event = 0
+
+    def stop(self) -> None:
+        """Method to stop recording or replaying"""
+        self.recording = False
+        self.replaying = False
+
+    @contextmanager
+    def turn(self, event_type: str, player_utter: str = None) -> None:
+        """Context manager which records or replays a game turn"""
+        if self.replaying:
+            self.event = self._next_event(event_type, player_utter)
+        elif self.recording:
+            self.event = {"type": event_type, "utter": player_utter, "draws": []}
+            self.events.append(self.event)
+        self.position = 0
+
+        # dice are rolled by a static class, route this thread's rolls here
+        previous = DiceRoller.get_journal()
+        DiceRoller.set_journal(self)
+        try:
+            yield
+        finally:
+            DiceRoller.set_journal(previous)
+            event = self.event
+            self.event = None
+
+        if self.replaying and self.position != len(event["draws"]):
+            msg = "Turn {u} used {p} of {n} recorded draws".format(
+                u=event["utter"], p=self.position, n=len(event["draws"]))
+            raise ReplayError(msg)
+
+    def _next_event(self, event_type: str, player_utter: str) -> dict:
+        """Method to return the next event to replay"""
+        if self.next_event >= len(self.events):
+            raise ReplayError("No recorded event left to replay")
+        event = self.events[self.next_event]
+        self.next_event += 1
+        if event["type"] != event_type or event["utter"] != player_utter:
+            msg = "Expected {t} event {u}, replaying {rt} event {ru}".format(
+                t=event_type, u=player_utter, rt=event["type"], ru=event["utter"])
+            raise ReplayError(msg)
+        return event
+
+    def draw(self, kind: str, func, *args) -> object:
+        """Method to draw a value from outside the game.
+        Calls func when recording and returns the recorded value when
+        replaying. Outside a turn func is always called."""
+        if not self.event:
+            return func(*args)
+        if self.replaying:
+            return deepcopy(self._replay_draw(kind))
+        value = func(*args)
+        self.event["draws"].append((kind, deepcopy(value)))
+        return value
+
+    def check(self, kind: str, value: object) -> None:
+        """Method to record a value derived by the game, such as the resolved
+        intent, and to check it is derived again when replaying"""
+        if not self.event:
+            return
+        if self.replaying:
+            recorded = self._replay_draw(kind)
+            if recorded != value:
+                msg = "Replay diverged at {k}: recorded {r}, replayed {v}".format(
+                    k=kind, r=recorded, v=value)
+                raise ReplayError(msg)
+        else:
+            self.event["draws"].append((kind, deepcopy(value)))
+
+    def _replay_draw(self, kind: str) -> object:
+        """Method to return the next recorded value of a turn"""
+        draws = self.event["draws"]
+        if self.position >= len(draws):
+            msg = "Turn {u} drew more than the {n} recorded values".format(
+                u=self.event["utter"], n=len(draws))
+            raise ReplayError(msg)
+        (recorded_kind, value) = draws[self.position]
+        if recorded_kind != kind:
+            msg = "Replay diverged: expected {r} draw, got {k}".format(
+                r=recorded_kind, k=kind)
+            raise ReplayError(msg)
+        self.position += 1
+        return value
@@ -1,3 +1,5 @@
+from copy import deepcopy
+
 from dmai.game.state import State
 from dmai.utils.logger import get_logger
 
@@ -13,12 +15,12 @@ class NPC():
                 self.__setattr__(key, npc_data[key])
 
         except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create NPC, incorrect attribute: {e}".format(s=self.state.session.session_id, e=e))
+            logger.error("(SESSION %s) Cannot create NPC, incorrect attribute: %s", self.state.session.session_id, e)
             raise
         
-        # set treasure
+        # set treasure, the npc data is shared so the session gets a copy
         if self.id not in self.state.npc_treasure_map:
-            self.state.npc_treasure_map[self.id] = self.treasure
+            self.state.npc_treasure_map[self.id] = deepcopy(self.treasure)
 
     def __repr__(self) -> str:
         return "NPC: {a}".format(a=self.name)
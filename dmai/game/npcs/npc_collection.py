@@ -2,9 +2,10 @@ from dmai.utils.output_builder import OutputBuilder
 from dmai.utils.exceptions import UnrecognisedEntityError
 from dmai.domain.monsters.monster_collection import MonsterCollection
 from dmai.game.adventure import Adventure
+from dmai.game.entity_index import EntityIndex
 from dmai.game.npcs.npc import NPC
 from dmai.domain.monsters.monster import Monster
-from dmai.game.state import State, Status
+from dmai.game.state import State
 from dmai.utils.config import Config
 from dmai.utils.logger import get_logger
 
@@ -24,6 +25,7 @@ class NPCCollection:
             self.monsters = {}
         else:
             self.monsters = self._create_monsters()
+        self.index = EntityIndex(self.adventure, self, self.state)
 
     def __repr__(self) -> str:
         npc_list = self.npcs.keys()
@@ -48,8 +50,8 @@ class NPCCollection:
             self.state.set_init_npc(npc_data)
             npcs[npc_id] = npc
             # update state with npc location
-            for room in self.adventure.rooms:
-                if npc_id in self.adventure.rooms[room].npcs:
+            for (room, room_data) in self.adventure.world.rooms.items():
+                if npc_id in room_data["npcs"]:
                     if npc_id not in self.state.current_room:
                         self.state.set_init_room(npc_id, room)
                     break
@@ -58,9 +60,9 @@ class NPCCollection:
     def _create_monsters(self) -> None:
         """Method to create all the monsters"""
         monsters = {}
-        for room in self.adventure.rooms:
-            for monster_id in self.adventure.rooms[room].monsters:
-                monster_dict = self.adventure.rooms[room].monsters[monster_id]
+        for (room, room_data) in self.adventure.world.rooms.items():
+            for monster_id in room_data["monsters"]:
+                monster_dict = room_data["monsters"][monster_id]
                 for (status, treasure,
                      must_kill, attack_player_after_n_moves) in zip(monster_dict["status"],
                                        monster_dict["treasure"],
@@ -124,22 +126,14 @@ class NPCCollection:
                        location: str = None) -> None:
         """Method to find a monster of specified type and status.
         Returns a string with the monster id matching requirements."""
-        for monster_id in self.monsters:
-            monster = self.monsters[monster_id]
-            if monster.id == monster_type:
-                try:
-                    select = True
-                    if status:
-                        if Status(status) != self.state.get_current_status(
-                                monster_id):
-                            select = False
-                    if location:
-                        if location != self.state.get_current_room_id(monster_id):
-                            select = False
-                    if select:
-                        return monster_id
-                except UnrecognisedEntityError as e:
-                    logger.error("(SESSION {s}) {e}".format(s=self.state.session.session_id, e=e))
+        return self.index.get_monster_id(monster_type, status=status, location=location)
+
+    def resolve(self, kind: str, value: str) -> str:
+        """Method to resolve an NLU entity value to the id of a monster type,
+        NPC, location or puzzle.
+        Returns the id, or the value unchanged if it can't be resolved."""
+        resolved = self.index.resolve(kind, value)
+        return resolved if resolved else value
 
     def get_all_npcs(self) -> list:
         """Method to return all NPC objects in a list.
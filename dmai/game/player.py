@@ -15,7 +15,7 @@ class Player(PlayerAgent):
     def __init__(self, character: Character, state: State, output_builder: OutputBuilder) -> None:
         """Main class for the player"""
         PlayerAgent.__init__(self, state, output_builder, problem=character.id)
-        logger.debug("(SESSION {s}) Initialising character: {c}".format(s=self.state.session.session_id, c=str(character)))
+        logger.debug("(SESSION %s) Initialising character: %s", self.state.session.session_id, str(character))
         self.character = character
         self.state = state
         self.id = "player"
@@ -119,7 +119,8 @@ class Player(PlayerAgent):
             weapon = self.character.weapons.get_weapon(weapon_id)
         else:
             weapon = self.character.weapons.get_equipped("any")
-        dice_spec = self.character.weapons.get_damage_dice(weapon["id"])
+        # copy the shared weapon data before adding this player's modifier
+        dice_spec = dict(self.character.weapons.get_damage_dice(weapon["id"]))
         dice_spec["mod"] = self.character.get_damage_modifier(weapon["id"])
         if Config.god_mode:
             return 50
@@ -0,0 +1,82 @@
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Registry:
+
+    # class variables
+    # kinds in order of precedence, for ids shared by several kinds
+    KINDS = ["entity", "room", "item", "equipment", "weapon", "ability", "skill", "puzzle"]
+
+    def __init__(self) -> None:
+        """Class which maps the id of anything in the game to a tuple with
+        (kind, object, display name).
+        It is filled when the world and the player are loaded and updated
+        when things are added during the game.
+        An object which is expensive to build can be deferred, it is built
+        by its loader on first lookup."""
+        self.entries = {kind: {} for kind in self.KINDS}
+        self.loaders = {}
+
+    def __repr__(self) -> str:
+        return "{c} holding {n} ids".format(
+            c=self.__class__.__name__,
+            n=sum(len(entries) for entries in self.entries.values()))
+
+    def copy(self) -> "Registry":
+        """Method to return a registry with the same entries which can be
+        changed without changing this one"""
+        registry = Registry()
+        registry.entries = {kind: dict(entries) for (kind, entries) in self.entries.items()}
+        registry.loaders = dict(self.loaders)
+        return registry
+
+    def add(self, thing_id: str, kind: str, obj: object, name: str) -> None:
+        """Method to add or replace the entry for an id of specified kind"""
+        self.entries[kind][thing_id] = (kind, obj, name)
+        self.loaders.pop((kind, thing_id), None)
+
+    def add_deferred(self, thing_id: str, kind: str, loader, name: str) -> None:
+        """Method to add the entry for an id whose object is returned by
+        calling loader on first lookup"""
+        self.entries[kind][thing_id] = (kind, None, name)
+        self.loaders[(kind, thing_id)] = loader
+
+    def remove(self, thing_id: str, kind: str) -> None:
+        """Method to remove the entry for an id of specified kind"""
+        self.entries[kind].pop(thing_id, None)
+        self.loaders.pop((kind, thing_id), None)
+
+    def lookup(self, thing_id: str, kind: str = None) -> tuple:
+        """Method to find the entry for an id, of specified kind or of the
+        kind with highest precedence.
+        Returns a tuple with (kind, object, name), or None if not found."""
+        entry = self._find(thing_id, kind)
+        if entry and (entry[0], thing_id) in self.loaders:
+            loader = self.loaders.pop((entry[0], thing_id))
+            entry = (entry[0], loader(), entry[2])
+            self.entries[entry[0]][thing_id] = entry
+        return entry
+
+    def _find(self, thing_id: str, kind: str = None) -> tuple:
+        """Method to find the entry for an id without building a deferred
+        object"""
+        if kind:
+            return self.entries[kind].get(thing_id)
+        for kind in self.KINDS:
+            if thing_id in self.entries[kind]:
+                return self.entries[kind][thing_id]
+
+    def get(self, thing_id: str, kind: str = None) -> object:
+        """Method to return the object for an id, or None if not found"""
+        entry = self.lookup(thing_id, kind)
+        if entry:
+            return entry[1]
+
+    def get_name(self, thing_id: str, kind: str = None) -> str:
+        """Method to return the display name for an id, or None if not
+        found"""
+        entry = self._find(thing_id, kind)
+        if entry:
+            return entry[2]
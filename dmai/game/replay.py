@@ -0,0 +1,65 @@
+from dmai.game.game import Game
+from dmai.game.journal import Journal
+from dmai.game.state import SNAPSHOT_CODEC
+from dmai.utils.exceptions import ReplayError
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Replay:
+
+    # class variables
+    VERSION = 1
+
+    def __init__(self, journal: Journal) -> None:
+        """Class which rebuilds a game by re-applying the events recorded in
+        a journal. Rasa and the planner are never called, so a replay runs
+        at the speed of the game logic."""
+        self.journal = journal
+
+    def __repr__(self) -> str:
+        return "{c}".format(c=self.__class__.__name__)
+
+    def run(self, turns: int = None) -> Game:
+        """Method to replay the recorded events, or only the first turns.
+        Returns the rebuilt game."""
+        game = Game(saved_state=self.journal.initial, **self.journal.settings)
+        game.load()
+        events = self.journal.events[:turns] if turns is not None else self.journal.events
+        logger.debug("(SESSION %s) Replaying %s events",
+            game.session_id, len(events))
+
+        journal = game.state.journal
+        journal.replay(events)
+        for event in events:
+            if event["type"] == "input":
+                game.input(event["utter"])
+            else:
+                game.output()
+        journal.stop()
+        return game
+
+    @classmethod
+    def encode(cls, journal: Journal) -> bytes:
+        """Method to encode a journal for storage"""
+        return SNAPSHOT_CODEC.encode({
+            "version": cls.VERSION,
+            "settings": journal.settings,
+            "initial": journal.initial,
+            "events": journal.events
+        })
+
+    @classmethod
+    def decode(cls, data: bytes) -> Journal:
+        """Method to decode a stored journal"""
+        journal_data = SNAPSHOT_CODEC.decode(data)
+        if journal_data.get("version", 0) > cls.VERSION:
+            msg = "Journal version {v} is newer than supported version {s}".format(
+                v=journal_data.get("version"), s=cls.VERSION)
+            raise ReplayError(msg)
+        journal = Journal()
+        journal.settings = journal_data["settings"]
+        journal.initial = journal_data["initial"]
+        journal.events = journal_data["events"]
+        return journal
@@ -0,0 +1,63 @@
+from bisect import bisect_left
+
+
+class RoomIndex:
+    def __init__(self) -> None:
+        """Class which indexes the monsters and NPCs in each room, with
+        counts by status, so room queries take time proportional to the
+        room's occupants.
+        Entities are kept in the order they were registered, which is the
+        order the NPC collection created them in."""
+        self.rooms = {}
+        self.kinds = {}
+        self.order = {}
+        self.placements = {}
+
+    def __repr__(self) -> str:
+        return "{c}".format(c=self.__class__.__name__)
+
+    def register(self, entity: str, kind: str) -> None:
+        """Method to register an entity as a monster or npc"""
+        if entity not in self.order:
+            self.order[entity] = len(self.order)
+        self.kinds[entity] = kind
+
+    def update(self, entity: str, room: str, status) -> None:
+        """Method to move a registered entity to its current room and
+        status, unregistered entities such as the player are ignored"""
+        if entity not in self.kinds:
+            return
+        placement = (room, status)
+        if self.placements.get(entity) == placement:
+            return
+        kind = self.kinds[entity]
+        if entity in self.placements:
+            (old_room, old_status) = self.placements.pop(entity)
+            occupants = self.rooms[old_room][kind]
+            occupants["ids"].remove(entity)
+            occupants["status"][old_status] -= 1
+        if room is not None:
+            occupants = self.rooms.setdefault(room, {
+                "monster": {"ids": [], "status": {}},
+                "npc": {"ids": [], "status": {}}
+            })[kind]
+            keys = [self.order[e] for e in occupants["ids"]]
+            occupants["ids"].insert(bisect_left(keys, self.order[entity]), entity)
+            occupants["status"][status] = occupants["status"].get(status, 0) + 1
+            self.placements[entity] = placement
+
+    def get_ids(self, room: str, kind: str) -> list:
+        """Method to return the ids of the entities of a kind in a room"""
+        if room not in self.rooms:
+            return []
+        return list(self.rooms[room][kind]["ids"])
+
+    def count(self, room: str, kind: str, status=None) -> int:
+        """Method to count the entities of a kind in a room, optionally only
+        those with specified status"""
+        if room not in self.rooms:
+            return 0
+        occupants = self.rooms[room][kind]
+        if status is None:
+            return len(occupants["ids"])
+        return occupants["status"].get(status, 0)
@@ -0,0 +1,221 @@
+import struct
+import zlib
+from enum import Enum
+
+from dmai.utils.exceptions import SnapshotError
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class SnapshotCodec:
+
+    # class variables
+    MAGIC = b"DMAI"
+    VERSION = 1
+    HEADER = struct.Struct(">4sBB")
+    FLOAT = struct.Struct(">d")
+    COMPRESSED = 0x01
+
+    # value type tags
+    NONE = 0
+    FALSE = 1
+    TRUE = 2
+    INT = 3
+    FLOAT_TAG = 4
+    STR = 5
+    LIST = 6
+    TUPLE = 7
+    DICT = 8
+    SET = 9
+    ENUM = 10
+    BYTES = 11
+
+    def __init__(self, enums: list) -> None:
+        """Class which encodes saved game states into a compact, versioned
+        binary snapshot.
+        Strings are interned in a table and written once, enum members are
+        written as (enum, member) indexes into the enums list. The enums list
+        and the order of their members must only ever be appended to."""
+        self.enums = list(enums)
+        self.enum_ids = {enum: i for (i, enum) in enumerate(self.enums)}
+        self.members = [list(enum) for enum in self.enums]
+        self.member_ids = {
+            member: j
+            for members in self.members
+            for (j, member) in enumerate(members)
+        }
+
+    def __repr__(self) -> str:
+        return "{c}".format(c=self.__class__.__name__)
+
+    def encode(self, saved_state: dict, compress: bool = True) -> bytes:
+        """Method to encode a saved state dict.
+        Returns the snapshot bytes."""
+        strings = {}
+        body = bytearray()
+        self._encode_value(saved_state, body, strings)
+
+        table = bytearray()
+        self._write_varint(len(strings), table)
+        for string in strings:
+            encoded = string.encode("utf-8")
+            self._write_varint(len(encoded), table)
+            table += encoded
+        payload = bytes(table + body)
+
+        flags = 0
+        if compress:
+            payload = zlib.compress(payload)
+            flags |= self.COMPRESSED
+        return self.HEADER.pack(self.MAGIC, self.VERSION, flags) + payload
+
+    def decode(self, snapshot: bytes) -> dict:
+        """Method to decode a snapshot.
+        Returns the saved state dict."""
+        try:
+            (magic, version, flags) = self.HEADER.unpack_from(snapshot)
+        except struct.error:
+            raise SnapshotError("Snapshot is truncated")
+        if magic != self.MAGIC:
+            raise SnapshotError("Not a game state snapshot")
+        if version > self.VERSION:
+            msg = "Snapshot version {v} is newer than supported version {s}".format(
+                v=version, s=self.VERSION)
+            raise SnapshotError(msg)
+
+        payload = snapshot[self.HEADER.size:]
+        try:
+            if flags & self.COMPRESSED:
+                payload = zlib.decompress(payload)
+            (count, pos) = self._read_varint(payload, 0)
+            strings = []
+            for _ in range(count):
+                (length, pos) = self._read_varint(payload, pos)
+                strings.append(payload[pos:pos + length].decode("utf-8"))
+                pos += length
+            (saved_state, pos) = self._decode_value(payload, pos, strings)
+        except (zlib.error, IndexError, UnicodeDecodeError, struct.error) as e:
+            raise SnapshotError("Snapshot is corrupt: {e}".format(e=e))
+        return saved_state
+
+    def _write_varint(self, value: int, out: bytearray) -> None:
+        """Method to write an unsigned int in as few bytes as possible"""
+        while value > 0x7f:
+            out.append((value & 0x7f) | 0x80)
+            value >>= 7
+        out.append(value)
+
+    def _read_varint(self, data: bytes, pos: int) -> tuple:
+        """Method to read an unsigned int.
+        Returns a tuple with (value, position after the int)."""
+        value = 0
+        shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return (value, pos)
+            shift += 7
+
+    def _encode_value(self, value, out: bytearray, strings: dict) -> None:
+        """Method to encode a value with its type tag"""
+        # bool and Enum are checked before int, they can be subclasses of it
+        if value is None:
+            out.append(self.NONE)
+        elif value is True:
+            out.append(self.TRUE)
+        elif value is False:
+            out.append(self.FALSE)
+        elif isinstance(value, str):
+            out.append(self.STR)
+            if value not in strings:
+                strings[value] = len(strings)
+            self._write_varint(strings[value], out)
+        elif isinstance(value, Enum):
+            if type(value) not in self.enum_ids:
+                msg = "Cannot snapshot unregistered enum {e}".format(e=type(value).__name__)
+                raise SnapshotError(msg)
+            out.append(self.ENUM)
+            self._write_varint(self.enum_ids[type(value)], out)
+            self._write_varint(self.member_ids[value], out)
+        elif isinstance(value, int):
+            # zigzag so small negative numbers stay small
+            out.append(self.INT)
+            self._write_varint(value << 1 if value >= 0 else (-value << 1) - 1, out)
+        elif isinstance(value, float):
+            out.append(self.FLOAT_TAG)
+            out += self.FLOAT.pack(value)
+        elif isinstance(value, dict):
+            out.append(self.DICT)
+            self._write_varint(len(value), out)
+            for (key, item) in value.items():
+                self._encode_value(key, out, strings)
+                self._encode_value(item, out, strings)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            if isinstance(value, list):
+                out.append(self.LIST)
+            elif isinstance(value, tuple):
+                out.append(self.TUPLE)
+            else:
+                out.append(self.SET)
+            self._write_varint(len(value), out)
+            for item in value:
+                self._encode_value(item, out, strings)
+        elif isinstance(value, bytes):
+            out.append(self.BYTES)
+            self._write_varint(len(value), out)
+            out += value
+        else:
+            msg = "Cannot snapshot value of type {t}".format(t=type(value).__name__)
+            raise SnapshotError(msg)
+
+    def _decode_value(self, data: bytes, pos: int, strings: list) -> tuple:
+        """Method to decode a tagged value.
+        Returns a tuple with (value, position after the value)."""
+        tag = data[pos]
+        pos += 1
+        if tag == self.STR:
+            (i, pos) = self._read_varint(data, pos)
+            return (strings[i], pos)
+        if tag == self.NONE:
+            return (None, pos)
+        if tag == self.TRUE:
+            return (True, pos)
+        if tag == self.FALSE:
+            return (False, pos)
+        if tag == self.INT:
+            (value, pos) = self._read_varint(data, pos)
+            return (value >> 1 if not value & 1 else -((value + 1) >> 1), pos)
+        if tag == self.DICT:
+            (length, pos) = self._read_varint(data, pos)
+            value = {}
+            for _ in range(length):
+                (key, pos) = self._decode_value(data, pos, strings)
+                (value[key], pos) = self._decode_value(data, pos, strings)
+            return (value, pos)
+        if tag in (self.LIST, self.TUPLE, self.SET):
+            (length, pos) = self._read_varint(data, pos)
+            value = []
+            for _ in range(length):
+                (item, pos) = self._decode_value(data, pos, strings)
+                value.append(item)
+            if tag == self.TUPLE:
+                value = tuple(value)
+            elif tag == self.SET:
+                value = set(value)
+            return (value, pos)
+        if tag == self.ENUM:
+            (enum_id, pos) = self._read_varint(data, pos)
+            (member_id, pos) = self._read_varint(data, pos)
+            try:
+                return (self.members[enum_id][member_id], pos)
+            except IndexError:
+                raise SnapshotError("Snapshot has an unknown enum value")
+        if tag == self.FLOAT_TAG:
+            return (self.FLOAT.unpack_from(data, pos)[0], pos + self.FLOAT.size)
+        if tag == self.BYTES:
+            (length, pos) = self._read_varint(data, pos)
+            return (bytes(data[pos:pos + length]), pos + length)
+        raise SnapshotError("Snapshot has an unknown type tag {t}".format(t=tag))
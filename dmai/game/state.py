@@ -1,22 +1,37 @@
 from collections import Counter
+from copy import deepcopy
 from enum import Enum
+from functools import partial
 import operator
 import time
 
-import dmai
 from dmai.utils.text import Text
 from dmai.domain.skills import Skills
 from dmai.domain.abilities import Abilities
 from dmai.utils.output_builder import OutputBuilder
+from dmai.game.snapshot import SnapshotCodec
+from dmai.game.journal import Journal
+from dmai.game.entity_table import EntityTable, ColumnMapping, IntColumn, CodeColumn
+from dmai.game.registry import Registry
+from dmai.game.room_index import RoomIndex
 from dmai.utils.exceptions import UnrecognisedEntityError, UnrecognisedRoomError, RoomConnectionError
 from dmai.nlg.nlg import NLG
+from dmai.utils.metrics import Metrics
 from dmai.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+SAVE_SECONDS = Metrics.histogram("dmai_state_save_seconds", "Seconds spent saving the game state")
+SNAPSHOT_BYTES = Metrics.histogram(
+    "dmai_snapshot_bytes", "Size of game state snapshots in bytes",
+    buckets=tuple(2 ** n for n in range(10, 21)))
+
 
 class Session(object):
-    session_id = ""
+    def __init__(self, session_id: str = "") -> None:
+        """Per-game session context, each State has its own"""
+        self.session_id = session_id
+
     def set_session_id(self, session_id: str) -> None:
         self.session_id = session_id
 
@@ -47,14 +62,25 @@ class Combat(Enum):
     WAIT = 4
 
 
+# snapshot enum registry, only ever append to this list
+SNAPSHOT_CODEC = SnapshotCodec([GameMode, Status, Attitude, Combat])
+
+
 class State():
 
-    # initialise session
-    session = Session()
+    # class variables
+    TRANSIENT = ["output_builder", "dm", "player", "session", "journal", "room_index", "registry", "entities", "_parent"]
+    # objects a forked state copies together, bound to the fork
+    BOUND = ["dm", "player", "registry"]
 
     def __init__(self, output_builder: OutputBuilder, session_id: str = "") -> None:
         """Main class for the game state"""
-        self.session.set_session_id(session_id)
+        self.session = Session(session_id)
+        self.journal = Journal()
+        self.room_index = RoomIndex()
+        self.registry = Registry()
+        # per-entity values are columns of the entity table, read as dicts
+        self.entities = EntityTable()
         self.output_builder = output_builder
         self.dm = None
         self.player = None
@@ -76,18 +102,18 @@ class State():
         self.torch_lit = False
         self.stationary = False
         self.current_conversation = None
-        self.current_room = {}
-        self.current_status = {}
-        self.current_hp = {}
+        self.current_room = self.entities.add_column("current_room", CodeColumn())
+        self.current_status = self.entities.add_column("current_status", CodeColumn(list(Status)))
+        self.current_hp = self.entities.add_column("current_hp", IntColumn())
         self.current_hp_door = {}
         self.current_game_mode = GameMode.EXPLORE
         self.current_intent = None
         self.stored_intent = {}
-        self.current_target = {}
+        self.current_target = self.entities.add_column("current_target", CodeColumn())
         self.current_goal = [["quest"]]
-        self.current_attitude = {}
+        self.current_attitude = self.entities.add_column("current_attitude", CodeColumn(list(Attitude)))
         self.attacked_by_player = []
-        self.current_combat_status = {}
+        self.current_combat_status = self.entities.add_column("current_combat_status", CodeColumn(list(Combat)))
         self.expected_intent = []
         self.expected_entities = []
         self.initiative_order = []
@@ -122,7 +148,7 @@ class State():
         # equipment quantity
         self.equipment_quantity = {}
         # monster turn counter
-        self.monster_turn_counter = {}
+        self.monster_turn_counter = self.entities.add_column("monster_turn_counter", IntColumn())
         self.monsters_will_attack = []
     
     def set_char_class(self, char_class: str) -> None:
@@ -133,22 +159,127 @@ class State():
 
     def gameover(self) -> None:
         self.game_ended = True
-        dmai.dmai_helpers.gameover(self.output_builder, self.session.session_id)
+        # imported here, the helpers import the game which imports the state
+        from dmai.dmai_helpers import gameover
+        gameover(self.output_builder, self.session.session_id)
         
+    def __getattr__(self, name: str) -> object:
+        """Method to copy a field from the parent state the first time a
+        forked state uses it"""
+        parent = self.__dict__.get("_parent")
+        if parent is None or name.startswith("__"):
+            raise AttributeError("{c} has no attribute {n}".format(c=self.__class__.__name__, n=name))
+        if name in self.BOUND:
+            self._fork_objects(parent)
+            return self.__dict__[name]
+        value = getattr(parent, name)
+        if name == "entities" or isinstance(value, ColumnMapping):
+            # the columns share one table, copy it once for all of them
+            table = parent.entities.copy()
+            self.__dict__["entities"] = table
+            for column in table.columns:
+                self.__dict__[column] = ColumnMapping(table, table.columns[column])
+            return self.__dict__[name]
+        value = deepcopy(value)
+        self.__dict__[name] = value
+        return value
+
+    def fork(self) -> "State":
+        """Method to branch the state for what-if lookahead.
+        The branch copies each field from this state the first time it is
+        used, so forking is cheap and the branch can be changed and thrown
+        away without touching this state. This state should not change
+        while a branch is in use.
+        The branch has its own output builder, and its own dm and player
+        bound to it, so Actions can be applied to the branch with
+        state.get_dm().actions and its triggers only change the branch."""
+        branch = State.__new__(State)
+        branch.__dict__.update({
+            "_parent": self,
+            "session": self.session,
+            "journal": Journal(),
+            "output_builder": OutputBuilder()
+        })
+        return branch
+
+    def _fork_objects(self, parent: "State") -> None:
+        """Method to copy the dm, with its monsters, NPCs and actions, and
+        the player of the parent state the first time a forked state uses
+        them, every reference to the parent state is rebound to this one"""
+        memo = {
+            id(parent): self,
+            id(parent.output_builder): self.output_builder,
+            id(parent.session): self.session,
+            id(parent.journal): self.journal
+        }
+        if parent.dm:
+            # the rooms are built again for the branch when used
+            adventure = parent.dm.adventure.fork(self, self.output_builder)
+            memo[id(parent.dm.adventure)] = adventure
+        (dm, player) = deepcopy((parent.dm, parent.player), memo)
+        self.__dict__.update({"dm": dm, "player": player, "registry": parent.registry.copy()})
+        if dm:
+            self._register_world()
+
+    def _get_fields(self) -> list:
+        """Method to return the names of the state fields, copying any a
+        forked state has not used yet"""
+        if "_parent" in self.__dict__:
+            for name in self._parent._get_fields():
+                getattr(self, name)
+        return list(self.__dict__)
+
     def save(self) -> dict:
-        """Method to save the game state to dict"""
-        logger.debug("(SESSION {s}) State.save".format(s=self.session.session_id))
-        save_dict = self.__dict__
-        del save_dict["output_builder"]
-        del save_dict["dm"]
-        del save_dict["player"]
-        return save_dict
-    
-    def load(self, saved_state: dict) -> None:
-        """Method to load the game state"""
-        logger.debug("(SESSION {s}) State.load".format(s=self.session.session_id))
+        """Method to save the game state to dict.
+        The running game is left untouched and the dict is a copy."""
+        logger.debug("(SESSION %s) State.save", self.session.session_id)
+        with SAVE_SECONDS.time():
+            self._get_fields()
+            save_dict = {
+                key: dict(value) if isinstance(value, ColumnMapping) else value
+                for (key, value) in self.__dict__.items()
+                if key not in self.TRANSIENT
+            }
+            return deepcopy(save_dict)
+
+    def snapshot(self, compress: bool = True) -> bytes:
+        """Method to save the game state to a binary snapshot"""
+        snapshot = SNAPSHOT_CODEC.encode(self.save(), compress)
+        SNAPSHOT_BYTES.observe(len(snapshot))
+        return snapshot
+    
+    def load(self, saved_state) -> None:
+        """Method to load the game state from a dict or a snapshot"""
+        logger.debug("(SESSION %s) State.load", self.session.session_id)
+        if isinstance(saved_state, bytes):
+            saved_state = SNAPSHOT_CODEC.decode(saved_state)
+        else:
+            saved_state = deepcopy(saved_state)
         for key in saved_state:
-            self.__setattr__(key, saved_state[key])
+            # objects and the session belong to the running game
+            if key in self.TRANSIENT:
+                continue
+            if isinstance(getattr(self, key, None), ColumnMapping):
+                # entity table columns are refilled in place
+                column = getattr(self, key)
+                column.clear()
+                column.update(saved_state[key])
+            else:
+                self.__setattr__(key, saved_state[key])
+        self._rebuild_room_index()
+
+    def _rebuild_room_index(self) -> None:
+        """Method to rebuild the room index from the current rooms and
+        statuses, e.g. after loading"""
+        kinds = self.room_index.kinds
+        self.room_index = RoomIndex()
+        for entity in kinds:
+            self.room_index.register(entity, kinds[entity])
+            self._update_room_index(entity)
+
+    def _update_room_index(self, entity: str) -> None:
+        """Method to update the room index for specified entity"""
+        self.room_index.update(entity, self.current_room.get(entity), self.current_status.get(entity))
     
     def nag_player(self, hint: bool = False) -> None:
         """Method to prompt player to make a sensible action"""
@@ -160,14 +291,14 @@ class State():
             if self.hint_requested or (self.help_player and (not self.in_combat or not self.current_conversation)):
                 next_move = self.get_player().agent.get_next_move()
                 if next_move:
-                    logger.debug("(SESSION {s}) Prompting player".format(s=self.session.session_id))
+                    logger.debug("(SESSION %s) Prompting player", self.session.session_id)
                     self.suggested_next_move = {"utter": next_move, "state": True}
                     self.output_builder.append(next_move)
         self.hint_requested = False
         self.help_player = False
 
     def combat(self, attacker: str, target: str) -> None:
-        logger.debug("(SESSION {s}) State.combat".format(s=self.session.session_id))
+        logger.debug("(SESSION %s) State.combat", self.session.session_id)
         if not self.in_combat:
             self.reset_combat_status()
             self.set_current_game_mode("combat")
@@ -187,7 +318,7 @@ class State():
             self.progress_combat_status()
                 
     def combat_with_door(self, target: str) -> None:
-        logger.debug("(SESSION {s}) State.combat_with_door".format(s=self.session.session_id))
+        logger.debug("(SESSION %s) State.combat_with_door", self.session.session_id)
         self.door_target = target
         if not self.in_combat_with_door:
             self.in_combat_with_door = True
@@ -201,7 +332,7 @@ class State():
             self.output_builder.append(NLG.perform_attack_roll())
     
     def explore(self) -> None:
-        logger.debug("(SESSION {s}) State.explore".format(s=self.session.session_id))
+        logger.debug("(SESSION %s) State.explore", self.session.session_id)
         if self.current_game_mode != GameMode.EXPLORE:
             self.set_current_game_mode("explore")
             self.in_combat = False
@@ -214,7 +345,7 @@ class State():
             self.door_target = None
     
     def roleplay(self, target: str) -> None:
-        logger.debug("(SESSION {s}) State.roleplay".format(s=self.session.session_id))
+        logger.debug("(SESSION %s) State.roleplay", self.session.session_id)
         if not self.roleplaying:
             self.set_current_game_mode("roleplay")
             self.in_combat = False
@@ -233,7 +364,7 @@ class State():
     def set_current_goal(self, goal: list) -> None:
         """Method to set the current goal"""
         goal_str = "({g})".format(g=") and (".join([" ".join(g) for g in goal]))
-        logger.debug("(SESSION {s}) Setting current goal: {g}".format(s=self.session.session_id, g=goal_str))
+        logger.debug("(SESSION %s) Setting current goal: %s", self.session.session_id, goal_str)
         self.current_goal = goal
 
     def skip_intro(self) -> None:
@@ -267,21 +398,14 @@ class State():
         self.blessed = True
         
     def set_dm(self, dm) -> None:
-        logger.debug("(SESSION {s}) State.set_dm".format(s=self.session.session_id))
+        logger.debug("(SESSION %s) State.set_dm", self.session.session_id)
         self.dm = dm
         init_room = self.dm.adventure.get_init_room()
         if "player" not in self.current_room:
             self.current_room["player"] = init_room
-        for room in self.dm.adventure.get_all_rooms():
-            for connected_room in room.get_connected_rooms():
-                if room.can_attack_door(connected_room):
-                    if connected_room not in self.current_hp_door:
-                        self.current_hp_door[connected_room] = room.get_door_hp(connected_room)
         
-        # register room triggers
-        for room in self.dm.adventure.get_all_rooms():
-             if hasattr(room, "trigger"):
-                self.dm.register_trigger(room)
+        # register room triggers, the adventure runs those of the current room
+        self.dm.register_trigger(self.dm.adventure)
         # register monster triggers
         for monster in self.dm.npcs.get_all_monsters():
             if hasattr(monster, "trigger"):
@@ -290,6 +414,24 @@ class State():
         for npc in self.dm.npcs.get_all_npcs():
             if hasattr(npc, "trigger"):
                 self.dm.register_trigger(npc)
+        self._register_world()
+
+    def _register_world(self) -> None:
+        """Method to add the rooms, puzzles, monsters and NPCs to the registry.
+        Rooms and puzzles are added by name, they are built on first lookup"""
+        adventure = self.dm.adventure
+        for (room_id, room) in adventure.world.rooms.items():
+            self.registry.add_deferred(room_id, "room", partial(adventure.get_room, room_id), room["name"])
+            for (puzzle_id, puzzle) in room["puzzles"].items():
+                if not puzzle["type"] == "door":
+                    loader = partial(adventure.get_puzzle, puzzle_id)
+                    self.registry.add_deferred(puzzle_id, "puzzle", loader, puzzle["name"])
+                    self.registry.add_deferred("{p}_puzzle".format(p=puzzle_id), "puzzle", loader, puzzle["name"])
+        entities = [(monster.unique_id, monster) for monster in self.dm.npcs.get_all_monsters()]
+        entities += [(npc.id, npc) for npc in self.dm.npcs.get_all_npcs()]
+        for (entity_id, entity) in entities:
+            name = entity.unique_name if hasattr(entity, "unique_name") else entity.name
+            self.registry.add(entity_id, "entity", entity, name)
     
     def get_dm(self) -> None:
         """Method to return dm"""
@@ -298,7 +440,7 @@ class State():
         return self.dm
     
     def set_player(self, player) -> None:
-        logger.debug("(SESSION {s}) State.set_player".format(s=self.session.session_id))
+        logger.debug("(SESSION %s) State.set_player", self.session.session_id)
         self.player = player
         if "player" not in self.current_hp:
             self.current_hp["player"] = player.character.hp_max
@@ -310,6 +452,22 @@ class State():
             self.current_combat_status["player"] = Combat.INITIATIVE
         if not self.char_class:
             self.char_class = player.character.char_class.name
+        self._register_player()
+
+    def _register_player(self) -> None:
+        """Method to add the items, equipment, weapons, abilities and skills
+        known to the player to the registry"""
+        character = self.player.character
+        for (item_id, item) in character.items.item_data.items():
+            self.registry.add(item_id, "item", item, item["name"])
+        for (equipment_id, equipment) in character.equipment.equipment_data.items():
+            self.registry.add(equipment_id, "equipment", equipment, equipment["name"])
+        for (weapon_id, weapon) in character.weapons.weapons_data.items():
+            self.registry.add(weapon_id, "weapon", weapon, weapon["name"])
+        for (ability, name) in Abilities.get_all_abilities():
+            self.registry.add(ability, "ability", None, name)
+        for (skill, name) in Skills.get_all_skills():
+            self.registry.add(skill, "skill", None, name)
     
     def get_player(self):
         """Method to return player"""
@@ -319,72 +477,23 @@ class State():
     
     def get_name(self, thing_id: str) -> str:
         """Method to return the name of ANYTHING in the game"""
-        logger.debug("(SESSION {s}) State.get_name: {t}".format(s=self.session.session_id, t=thing_id))
-        # player, monster or npc
-        if self.get_entity_name(thing_id):
-            logger.debug("(SESSION {s}) {t} is an entity".format(s=self.session.session_id, t=thing_id))
-            return self.get_entity_name(thing_id)
-        else: 
-            logger.debug("(SESSION {s}) Not player, monster or NPC: {t}".format(s=self.session.session_id, t=thing_id))
-        # room
-        try:
-            if self.get_room_name(thing_id):
-                logger.debug("(SESSION {s}) {t} is a room".format(s=self.session.session_id, t=thing_id))
-                return self.get_room_name(thing_id)
-        except UnrecognisedRoomError:
-            logger.debug("(SESSION {s}) Not room: {t}".format(s=self.session.session_id, t=thing_id))
-        
-        # item
-        if thing_id in self.get_player().character.items.item_data:
-            logger.debug("(SESSION {s}) {t} is an item".format(s=self.session.session_id, t=thing_id))
-            return self.get_player().character.items.item_data[thing_id]["name"]
-
-        # equipment
-        if thing_id in self.get_player().character.equipment.equipment_data:
-            logger.debug("(SESSION {s}) {t} is equipment".format(s=self.session.session_id, t=thing_id))
-            return self.get_player().character.equipment.equipment_data[thing_id]["name"]
-
-        # weapon
-        if thing_id in self.get_player().character.weapons.weapons_data:
-            logger.debug("(SESSION {s}) {t} is a weapon".format(s=self.session.session_id, t=thing_id))
-            return self.get_player().character.weapons.weapons_data[thing_id]["name"]
-
-        # ability
-        for ability, name in Abilities.get_all_abilities():
-            if ability == thing_id:
-                logger.debug("(SESSION {s}) {t} is an ability".format(s=self.session.session_id, t=thing_id))
-                return name
-        
-        # skill
-        for skill, name in Skills.get_all_skills():
-                if skill == thing_id:
-                    logger.debug("(SESSION {s}) {t} is a skill".format(s=self.session.session_id, t=thing_id))
-                    return name
-
-        # puzzle
-        for room in self.get_dm().adventure.get_all_rooms():
-            for puzzle in room.puzzles.get_all_puzzles():
-                if not puzzle.type == "door":
-                    if thing_id == puzzle.id or thing_id == "{p}_puzzle".format(p=puzzle.id):
-                        logger.debug("(SESSION {s}) {t} is a puzzle".format(s=self.session.session_id, t=thing_id))
-                        return puzzle.name
-        
-        logger.debug("(SESSION {s}) {t} was not found".format(s=self.session.session_id, t=thing_id))
-        return "unknown"
+        if thing_id == "player" and self.char_name:
+            return self.char_name
+        name = self.registry.get_name(thing_id)
+        if name is None:
+            logger.debug("(SESSION %s) %s was not found", self.session.session_id, thing_id)
+            return "unknown"
+        return name
 
     def get_entity_name(self, entity: str = "player") -> str:
         """Method to return name of entity"""
-        try:
-            if entity == "player":
-                return self.char_name
-            else:
-                if hasattr(self.get_dm().npcs.get_entity(entity), "unique_name"):
-                    return self.get_dm().npcs.get_entity(entity).unique_name
-                else:
-                    return self.get_dm().npcs.get_entity(entity).name
-        except UnrecognisedEntityError:
-            logger.debug("(SESSION {s}) Unrecognised entity: {e}".format(s=self.session.session_id, e=entity))
+        if entity == "player":
+            return self.char_name
+        name = self.registry.get_name(entity, "entity")
+        if name is None:
+            logger.debug("(SESSION %s) Unrecognised entity: %s", self.session.session_id, entity)
             return ""
+        return name
     
     def get_entity(self, entity: str = "player"):
         """Method to return entity"""
@@ -394,7 +503,7 @@ class State():
             else:
                 return self.get_dm().npcs.get_entity(entity)
         except UnrecognisedEntityError:
-            logger.debug("(SESSION {s}) Unrecognised entity: {e}".format(s=self.session.session_id, e=entity))
+            logger.debug("(SESSION %s) Unrecognised entity: %s", self.session.session_id, entity)
             return None
     
     ############################################################
@@ -411,6 +520,8 @@ class State():
             self.set_init_room(unique_id, room_id)
         if unique_id not in self.current_status:
             self.set_init_status(unique_id, status)
+        self.room_index.register(unique_id, "monster")
+        self._update_room_index(unique_id)
     
     def set_init_npc(self, npc_data: dict):
         """Method to set the init status for data objects where 
@@ -421,6 +532,8 @@ class State():
             self.set_init_status(npc_data["id"], npc_data["status"])
         if npc_data["id"] not in self.current_attitude:
             self.set_init_attitude(npc_data["id"], npc_data["attitude"])
+        self.room_index.register(npc_data["id"], "npc")
+        self._update_room_index(npc_data["id"])
         
     def set_init_attitude(self, entity: str, attitude: str) -> None:
         """Method to set the initial attitude towards player for specifed entity."""
@@ -429,10 +542,12 @@ class State():
     def set_init_status(self, entity: str, status: str) -> str:
         """Method to set the initial status for specified entity."""
         self.current_status[entity] = Status(status)
+        self._update_room_index(entity)
 
     def set_init_room(self, entity: str, room_id: str) -> str:
         """Method to set the initial room for specified entity."""
         self.current_room[entity] = room_id
+        self._update_room_index(entity)
         
     def get_current_hp(self, entity: str = "player") -> int:
         """Method to get the current hp for specified entity."""
@@ -446,6 +561,7 @@ class State():
         """Method to set the current status for specified entity."""
         try:
             self.current_status[entity] = Status(status)
+            self._update_room_index(entity)
         except KeyError:
             msg = "Entity not recognised: {e}".format(e=entity)
             raise UnrecognisedEntityError(msg)
@@ -472,14 +588,21 @@ class State():
     
     def all_dead(self, entity: str = "player") -> bool:
         """Method to determine whether all the monsters are dead"""
-        count = 0
-        dead = 0
-        for monster in self.get_dm().npcs.get_all_monster_ids():
-            if self.get_current_room_id() == self.get_current_room_id(monster):
-                count += 1
-                if self.is_dead(monster):
-                    dead += 1
-        return count == dead
+        room_id = self.get_current_room_id()
+        return self.room_index.count(room_id, "monster") == self.room_index.count(room_id, "monster", Status.DEAD)
+
+    def select_entities(self, **conditions) -> list:
+        """Method to find the entities whose values match the conditions,
+        e.g. select_entities(current_room=room_id, current_status=Status.ALIVE)"""
+        return self.entities.select(**conditions)
+
+    def get_room_monster_ids(self, room_id: str) -> list:
+        """Method to return the ids of the monsters in specified room"""
+        return self.room_index.get_ids(room_id, "monster")
+
+    def get_room_npc_ids(self, room_id: str) -> list:
+        """Method to return the ids of the npcs in specified room"""
+        return self.room_index.get_ids(room_id, "npc")
     
     def set_current_attitude(self, entity: str = "player", attitude: str = "indifferent") -> str:
         """Method to set the current attitude towards player for specified entity."""
@@ -518,12 +641,12 @@ class State():
     
     def set_conversation_target(self, target: str) -> None:
         """Method to set the current target for a conversation"""
-        logger.debug("(SESSION {s}) Setting current conversation target: {t}".format(s=self.session.session_id, t=target))
+        logger.debug("(SESSION %s) Setting current conversation target: %s", self.session.session_id, target)
         self.current_conversation = target
     
     def clear_conversation(self, entity: str = "player") -> None:
         """Method to clear the conversation for an entity"""
-        logger.debug("(SESSION {s}) Clearing current conversation: {e}".format(s=self.session.session_id, e=entity))
+        logger.debug("(SESSION %s) Clearing current conversation: %s", self.session.session_id, entity)
         self.current_conversation = None
 
     ############################################################
@@ -555,7 +678,7 @@ class State():
     def drink_ale(self) -> None:
         """Method to drink ale"""
         self.ales += 1
-        logger.debug("(SESSION {s}) Ales drank: {a}".format(s=self.session.session_id, a=self.ales))
+        logger.debug("(SESSION %s) Ales drank: %s", self.session.session_id, self.ales)
 
     ############################################################
     # METHODS RELATING TO INTENTS
@@ -626,7 +749,7 @@ class State():
     
     def set_initiative_order(self) -> None:
         """Method to set the initative order"""
-        logger.debug("(SESSION {s}) Setting initiative order".format(s=self.session.session_id))
+        logger.debug("(SESSION %s) Setting initiative order", self.session.session_id)
         rolls = {}
 
         # get player initiative
@@ -659,7 +782,7 @@ class State():
     def update_initiative_order(self, *args) -> None:
         """Method to update the initiative order by popping from front of list
         and appending to end"""
-        logger.debug("(SESSION {s}) Updating initiative order".format(s=self.session.session_id))
+        logger.debug("(SESSION %s) Updating initiative order", self.session.session_id)
         self.initiative_order.append(self.initiative_order.pop(0))
     
     def get_currently_acting_entity(self) -> str:
@@ -690,7 +813,7 @@ class State():
             msg = "Entity not recognised: {e}".format(e=entity)
             raise UnrecognisedEntityError(msg)
 
-        logger.debug("(SESSION {s}) Setting current target: {t}".format(s=self.session.session_id, t=target))
+        logger.debug("(SESSION %s) Setting current target: %s", self.session.session_id, target)
         # first, deregister any triggers from original target
         if self.get_current_target_id(entity):
             current_target_obj = self.get_entity(self.get_current_target_id(entity))
@@ -714,7 +837,7 @@ class State():
             msg = "Entity not recognised: {e}".format(e=entity)
             raise UnrecognisedEntityError(msg)
 
-        logger.debug("(SESSION {s}) Clearing current target".format(s=self.session.session_id))
+        logger.debug("(SESSION %s) Clearing current target", self.session.session_id)
         if self.get_current_target_id(entity):
             self.get_dm().deregister_trigger(
                 self.get_entity(self.get_current_target_id(entity)))
@@ -752,7 +875,7 @@ class State():
             raise UnrecognisedEntityError(msg)
     
     def kill_monster(self, entity: str) -> None:
-        # player has killed a monster
+        # player has killed a monster, the status update keeps the room index
         name = self.get_entity_name(entity)
         self.set_current_status(entity, "dead")
         self.clear_target()
@@ -820,12 +943,12 @@ class State():
     
     def get_room_name(self, room_id: str) -> str:
         """Method to return the name of a room."""
-        try:
-            if self.check_room_exists(room_id):
-                return self.get_dm().adventure.get_room(room_id).name
-        except UnrecognisedRoomError:
-            logger.debug("(SESSION {s}) Room not recognised: {r}".format(s=self.session.session_id, r=room_id))
-            raise
+        name = self.registry.get_name(room_id, "room")
+        if name is None:
+            logger.debug("(SESSION %s) Room not recognised: %s", self.session.session_id, room_id)
+            msg = "Room not recognised: {r}".format(r=room_id)
+            raise UnrecognisedRoomError(msg)
+        return name
     
     def _check_entity_exists(self, entity_id: str) -> bool:
         """Method to check entity exists.
@@ -879,13 +1002,14 @@ class State():
         try:
             if self._check_entity_exists(entity) and self.check_room_exists(
                     room_id):
-                logger.debug("(SESSION {s}) Setting current room for {e}: {r}".format(
-                    s=self.session.session_id, e=entity, r=room_id))
+                logger.debug("(SESSION %s) Setting current room for %s: %s",
+                    self.session.session_id, entity, room_id)
                 if entity == "player":
                     self.stationary = False
                     self.current_room[entity] = room_id
                 else:
                     self.current_room[entity] = room_id
+                    self._update_room_index(entity)
         except (UnrecognisedRoomError, UnrecognisedEntityError):
             raise
     
@@ -957,10 +1081,9 @@ class State():
     def get_possible_npc_targets(self, entity: str = "player") -> list:
         """Method to get all npcs in a room that specified entity is in"""
         targets = []
-        for npc in self.get_dm().npcs.get_all_npcs():
-            if self.get_current_room_id(npc.id) == self.get_current_room_id(entity):
-                if self.is_alive(npc.id):
-                    targets.append(npc)
+        for npc_id in self.get_room_npc_ids(self.get_current_room_id(entity)):
+            if self.is_alive(npc_id):
+                targets.append(self.get_dm().npcs.get_npc(npc_id))
         return targets
     
     def get_possible_door_targets(self, entity: str = "player") -> list:
@@ -981,10 +1104,9 @@ class State():
     def get_possible_monster_targets(self, entity: str = "player") -> list:
         """Method to get all monsters in a room that specified entity is in"""
         targets = []
-        for monster in self.get_dm().npcs.get_all_monsters():
-            if self.get_current_room_id(monster.unique_id) == self.get_current_room_id(entity):
-                if self.is_alive(monster.unique_id):
-                    targets.append(monster)
+        for monster_id in self.get_room_monster_ids(self.get_current_room_id(entity)):
+            if self.is_alive(monster_id):
+                targets.append(self.get_dm().npcs.get_monster(monster_id))
         return targets
     
     def get_formatted_possible_monster_targets(self, entity: str = "player") -> str:
@@ -997,12 +1119,12 @@ class State():
     def get_monster_status_summary(self, location: str) -> dict:
         """Method to return a dictionary of monster status of specified location"""
         monster_status = {"alive": [], "dead": []}
-        for monster in self.get_dm().npcs.get_all_monsters():
-            if self.get_current_room_id(monster.unique_id) == location:
-                if self.is_alive(monster.unique_id):
-                    monster_status["alive"].append(monster.name)
-                elif self.is_dead(monster.unique_id):
-                    monster_status["dead"].append(monster.name)
+        for monster_id in self.get_room_monster_ids(location):
+            monster = self.get_dm().npcs.get_monster(monster_id)
+            if self.is_alive(monster_id):
+                monster_status["alive"].append(monster.name)
+            elif self.is_dead(monster_id):
+                monster_status["dead"].append(monster.name)
         status_count = {}
         for status in monster_status:
             status_count[status] = dict(Counter(monster_status[status]))
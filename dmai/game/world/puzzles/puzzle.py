@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Mapping
 
 from dmai.utils.output_builder import OutputBuilder
 from dmai.domain.actions.skill_check import SkillCheck
@@ -9,17 +10,13 @@ logger = get_logger(__name__)
 
 
 class Puzzle(ABC):
-    def __init__(self, puzzle_data: dict, state: State, output_builder: OutputBuilder) -> None:
-        """Puzzle abstract class"""
+    def __init__(self, definition: Mapping, state: State, output_builder: OutputBuilder) -> None:
+        """Puzzle abstract class, a session's view of a puzzle definition
+        shared by every session of the adventure"""
+        self.definition = definition
         self.state = state
         self.output_builder = output_builder
-        try:
-            for key in puzzle_data:
-                self.__setattr__(key, puzzle_data[key])
-        except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create puzzle, incorrect attribute: {e}".format(s=self.state.session.session_id, e=e))
-            raise
-        
+
         if self.id not in self.state.puzzle_trigger_map:
             self.state.puzzle_trigger_map[self.id] = {
                     "solution": {},
@@ -42,6 +39,13 @@ class Puzzle(ABC):
     def __repr__(self) -> str:
         return "{c}: {n}".format(c=self.__class__.__name__, n=self.name)
 
+    def __getattr__(self, name: str) -> object:
+        """Method to read static puzzle data from the shared definition"""
+        definition = self.__dict__.get("definition")
+        if definition is None or name not in definition:
+            raise AttributeError("{c} has no attribute {n}".format(c=self.__class__.__name__, n=name))
+        return definition[name]
+
     def solve(self) -> None:
         self.state.solved_puzzles.append(self.id)
 
@@ -144,7 +148,7 @@ class Puzzle(ABC):
         elif solution in self.investigate and "dc" in self.investigate[solution]:
             return self.investigate[solution]["dc"]
         else:
-            logger.debug("(SESSION {s}) Solution {so} not in puzzle {p}".format(s=self.state.session.session_id, so=solution, p=self.id))
+            logger.debug("(SESSION %s) Solution %s not in puzzle %s", self.state.session.session_id, solution, self.id)
             return
     
     def get_armor_class(self) -> int:
@@ -162,7 +166,7 @@ class Puzzle(ABC):
         if not self.id in self.state.solved_puzzles:
             for explore in self.state.puzzle_trigger_map[self.id]["explore"]:
                 if self.state.puzzle_trigger_map[self.id]["explore"][explore]:
-                    logger.debug("(SESSION {s}) Explore trigger: {p}".format(s=self.state.session.session_id, p=self.id))
+                    logger.debug("(SESSION %s) Explore trigger: %s", self.state.session.session_id, self.id)
                     if "skill" in self.explore[explore]:
                         self.state.set_expected_intent(["roll", "skill_check"])
                         skill_check = SkillCheck(self.explore[explore]["skill"], "player", self.state.get_current_room_id(), self.state, self.output_builder, dm_request=True, puzzle=self.id)
@@ -177,7 +181,7 @@ class Puzzle(ABC):
         if not self.id in self.state.solved_puzzles:
             for investigate in self.state.puzzle_trigger_map[self.id]["investigate"]:
                 if self.state.puzzle_trigger_map[self.id]["investigate"][investigate]:
-                    logger.debug("(SESSION {s}) Investigate trigger: {p}".format(s=self.state.session.session_id, p=self.id))
+                    logger.debug("(SESSION %s) Investigate trigger: %s", self.state.session.session_id, self.id)
                     if "skill" in self.investigate[investigate]:
                         self.state.set_expected_intent(["roll", "skill_check"])
                         skill_check = SkillCheck(self.investigate[investigate]["skill"], "player", self.state.get_current_room_id(), self.state, self.output_builder, dm_request=True, puzzle=self.id, investigate=True)
@@ -190,9 +194,9 @@ class Puzzle(ABC):
     def solution_success_func(self, option: str = None) -> None:
         """Method to construct solution success function"""
         # TODO support non-door types
-        logger.debug("(SESSION {s}) Puzzle.solution_success_func : {p}".format(s=self.state.session.session_id, p=self.id))
+        logger.debug("(SESSION %s) Puzzle.solution_success_func : %s", self.state.session.session_id, self.id)
         if not self.id in self.state.solved_puzzles:
-            logger.debug("(SESSION {s}) {p} not in state.solved_puzzles".format(s=self.state.session.session_id, p=self.id))
+            logger.debug("(SESSION %s) %s not in state.solved_puzzles", self.state.session.session_id, self.id)
             if self.solutions[option]["say"]:
                 self.output_builder.append(self.solutions[option]["say"])
             if self.type == "door":
@@ -207,13 +211,13 @@ class Puzzle(ABC):
                     self.state.set_current_status(result, "alive")
                     self.state.combat(result, "player")
             self.solve()
-        logger.debug("(SESSION {s}) Returning from Puzzle.solution_success_func: {p}".format(s=self.state.session.session_id, p=self.id))
+        logger.debug("(SESSION %s) Returning from Puzzle.solution_success_func: %s", self.state.session.session_id, self.id)
         
     def explore_success_func(self, option: str) -> None:
         """Method to construct explore success function"""
-        logger.debug("(SESSION {s}) Puzzle.explore_success_func : {p}".format(s=self.state.session.session_id, p=self.id))
+        logger.debug("(SESSION %s) Puzzle.explore_success_func : %s", self.state.session.session_id, self.id)
         if not self.id in self.state.solved_puzzles:
-            logger.debug("(SESSION {s}) {p} not in state.solved_puzzles".format(s=self.state.session.session_id, p=self.id))
+            logger.debug("(SESSION %s) %s not in state.solved_puzzles", self.state.session.session_id, self.id)
             if self.explore[option]["say"]:
                 self.output_builder.append(self.explore[option]["say"])
             if self.explore[option]["result"]:
@@ -223,21 +227,21 @@ class Puzzle(ABC):
                     room2 = self.id.split("---")[1]
                     self.state.unlock_door(room1, room2)
                 elif result == "add_to_inventory":
-                    item_data = self.__dict__
+                    item_data = dict(self.definition)
                     self.state.get_player().character.items.add_item(self.id, item_data=item_data)
                 elif result == "good_ending":
                     self.output_builder.append(self.state.get_dm().get_good_ending())
                     self.state.gameover()
                     return
             self.solve()
-        logger.debug("(SESSION {s}) Returning from Puzzle.explore_success_func: {p}".format(s=self.state.session.session_id, p=self.id))
+        logger.debug("(SESSION %s) Returning from Puzzle.explore_success_func: %s", self.state.session.session_id, self.id)
     
     def investigate_success_func(self, option: str) -> None:
         """Method to construct investigate success function"""
-        logger.debug("(SESSION {s}) Puzzle.investigate_success_func: {p}".format(s=self.state.session.session_id, p=self.id))
+        logger.debug("(SESSION %s) Puzzle.investigate_success_func: %s", self.state.session.session_id, self.id)
         solve = False
         if not self.id in self.state.solved_puzzles:
-            logger.debug("(SESSION {s}) {p} not in state.solved_puzzles".format(s=self.state.session.session_id, p=self.id))
+            logger.debug("(SESSION %s) %s not in state.solved_puzzles", self.state.session.session_id, self.id)
             if "say" in self.investigate[option]:
                 self.output_builder.append(self.investigate[option]["say"])
             if "result" in self.investigate[option] and self.investigate[option]["result"]:
@@ -248,7 +252,7 @@ class Puzzle(ABC):
                     self.state.unlock_door(room1, room2)
                     solve = True
                 elif result == "add_to_inventory":
-                    item_data = self.__dict__
+                    item_data = dict(self.definition)
                     self.state.get_player().character.items.add_item(self.id, item_data=item_data)
                     solve = True
                 elif result == "explore":
@@ -272,7 +276,7 @@ class Puzzle(ABC):
                 solve = True
             if solve:
                 self.solve()
-        logger.debug("(SESSION {s}) Returning from Puzzle.investigate_success_func: {p}".format(s=self.state.session.session_id, p=self.id))
+        logger.debug("(SESSION %s) Returning from Puzzle.investigate_success_func: %s", self.state.session.session_id, self.id)
     
     def get_solution_success_params(self, roll: str) -> list:
         """Method to return the function params on successful roll"""
@@ -1,3 +1,5 @@
+from typing import Mapping
+
 from dmai.utils.output_builder import OutputBuilder
 from dmai.game.world.puzzles.puzzle import Puzzle
 from dmai.game.state import State
@@ -7,45 +9,44 @@ logger = get_logger(__name__)
 
 
 class PuzzleCollection:
-    def __init__(self, puzzles_dict: dict, state: State, output_builder: OutputBuilder) -> None:
-        """PuzzleCollection class"""
+    def __init__(self, puzzles_dict: Mapping, state: State, output_builder: OutputBuilder) -> None:
+        """PuzzleCollection class.
+        A puzzle is built from its definition when first accessed."""
+        self.definitions = puzzles_dict
         self.puzzles = {}
         self.state = state
         self.output_builder = output_builder
 
-        # prepare the puzzles
-        for puzzle_id in puzzles_dict:
-            puzzle = Puzzle(puzzles_dict[puzzle_id], self.state, self.output_builder)
-            self.puzzles[puzzle_id] = puzzle
-
     def __repr__(self) -> str:
         return "Puzzle collection:\n{a}".format(a=self.puzzles)
 
     def get_all_puzzles(self) -> list:
         """Method to return a list of all puzzles"""
-        return list(self.puzzles.values())
+        return [self.get_puzzle(puzzle_id) for puzzle_id in self.definitions]
     
     def get_puzzle(self, puzzle_id: str) -> Puzzle:
         """Method to return a specified puzzle"""
-        if puzzle_id in self.puzzles:
+        if puzzle_id in self.definitions:
+            if puzzle_id not in self.puzzles:
+                self.puzzles[puzzle_id] = Puzzle(self.definitions[puzzle_id], self.state, self.output_builder)
             return self.puzzles[puzzle_id]
     
     def can_attack_door(self, room: str, door: str) -> bool:
         """Method to return whether a door of room can be attacked"""
         door_id = "{i}---{d}".format(i=room, d=door)
-        return bool(door_id in self.puzzles)
+        return bool(door_id in self.definitions)
     
     def get_door_armor_class(self, room: str, door: str) -> int:
         """Method to return the armor class of specified door"""
         if self.can_attack_door(room, door):
             door_id = "{i}---{d}".format(i=room, d=door)
-            return self.puzzles[door_id].get_armor_class()
+            return self.get_puzzle(door_id).get_armor_class()
 
     def get_door_hp(self, room: str, door: str) -> int:
         """Method to return the armor class of specified door"""
         if self.can_attack_door(room, door):
             door_id = "{i}---{d}".format(i=room, d=door)
-            return self.puzzles[door_id].get_hp()
+            return self.get_puzzle(door_id).get_hp()
     
     def explore_trigger(self) -> None:
         """Method to print any new text if conditions met"""
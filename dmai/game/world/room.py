@@ -1,3 +1,6 @@
+from copy import deepcopy
+from typing import Mapping
+
 from dmai.utils.output_builder import OutputBuilder
 from dmai.domain.items.item import Item
 from dmai.game.world.puzzles.puzzle_collection import PuzzleCollection
@@ -11,59 +14,64 @@ logger = get_logger(__name__)
 
 
 class Room:
-    def __init__(self, room_data: dict, state: State, output_builder: OutputBuilder) -> None:
-        """Main class for a room"""
+    def __init__(self, definition: Mapping, state: State, output_builder: OutputBuilder) -> None:
+        """Main class for a room, a session's view of a room definition
+        shared by every session of the adventure"""
+        self.definition = definition
         self.state = state
         self.output_builder = output_builder
 
         try:
-            for key in room_data:
-                self.__setattr__(key, room_data[key])
-
             # replace the attributes values with objects where appropriate
-            self.puzzles = PuzzleCollection(self.puzzles, self.state, self.output_builder)
+            self.puzzles = PuzzleCollection(self.definition["puzzles"], self.state, self.output_builder)
 
-        except AttributeError as e:
-            logger.error("(SESSION {s}) Cannot create room, incorrect attribute: {e}".format(s=self.state.session.session_id, e=e))
+        except (AttributeError, KeyError) as e:
+            logger.error("(SESSION %s) Cannot create room, incorrect attribute: %s", self.state.session.session_id, e)
             raise
 
-        # set up connections
+        # set up connections, the session gets its own copy to modify
         if self.id not in self.state.room_connect_map:
-            self.state.room_connect_map[self.id] = self.connections
+            self.state.room_connect_map[self.id] = deepcopy(self.connections)
   
         # set up treasure
         if self.id not in self.state.room_treasure_map:
-            self.state.room_treasure_map[self.id] = self.treasure
+            self.state.room_treasure_map[self.id] = deepcopy(self.treasure)
+
+        # set up the hp of doors which can be attacked
+        for connected_room in self.connections:
+            if self.can_attack_door(connected_room):
+                if connected_room not in self.state.current_hp_door:
+                    self.state.current_hp_door[connected_room] = self.get_door_hp(connected_room)
 
         # set up triggers
         if self.id not in self.state.room_trigger_map:
             self.state.room_trigger_map[self.id] = {}
 
-        trigger_map = {
+        # triggers are bound to this session, the shared text is not touched
+        self.trigger_map = {
             "enter": self.enter,
             "visibility": self.trigger_visibility,
             "fight_ends": self.trigger_fight_ends,
         }
-
-        # populate the self.text object
         for text_type in self.text:
-            text = self.text[text_type]
-            trigger = trigger_map[text_type] if text_type in trigger_map else None
             if text_type not in self.state.room_trigger_map[self.id]:
-                can_trigger = text_type in trigger_map
+                can_trigger = text_type in self.trigger_map
                 self.state.room_trigger_map[self.id][text_type] = can_trigger
-            self.text[text_type] = {
-                "text": text,
-                "trigger": trigger,
-            }
 
     def __repr__(self) -> str:
         return "Room: {a}".format(a=self.name)
 
+    def __getattr__(self, name: str) -> object:
+        """Method to read static room data from the shared definition"""
+        definition = self.__dict__.get("definition")
+        if definition is None or name not in definition:
+            raise AttributeError("{c} has no attribute {n}".format(c=self.__class__.__name__, n=name))
+        return definition[name]
+
     def enter(self) -> None:
         """Method when entering a room"""
         if not self.state.stationary and self.state.started:
-            logger.debug("(SESSION {s}) Triggering enter in room: {r}".format(s=self.state.session.session_id, r=self.id))
+            logger.debug("(SESSION %s) Triggering enter in room: %s", self.state.session.session_id, self.id)
             if self.id not in self.state.visited_rooms:
                 self.state.visited_rooms.append(self.id)
                 self.output_builder.append(self.text["enter"]["text"])
@@ -75,14 +83,14 @@ class Room:
         """Method when triggering visibility text"""
         if not self.visibility:
             if self.state.torch_lit or self.state.get_player().character.has_darkvision():
-                logger.debug("(SESSION {s}) Triggering visibility in room: {r}".format(s=self.state.session.session_id, r=self.id))
+                logger.debug("(SESSION %s) Triggering visibility in room: %s", self.state.session.session_id, self.id)
                 self.output_builder.append(self.text["visibility"]["text"])
                 self.state.room_trigger_map[self.id]["visibility"] = False
 
     def trigger_fight_ends(self) -> str:
         """Method when triggering fight ends text"""
         if self.state.all_dead():
-            logger.debug("(SESSION {s}) Triggering fight ending in room: {r}".format(s=self.state.session.session_id, r=self.id))
+            logger.debug("(SESSION %s) Triggering fight ending in room: %s", self.state.session.session_id, self.id)
             self.output_builder.append(self.text["fight_ends"]["text"])
             self.state.room_trigger_map[self.id]["fight_ends"] = False
 
@@ -92,13 +100,13 @@ class Room:
             for text_type in self.text:
                 if self.state.room_trigger_map[self.id][text_type]:
                     # execute function
-                    if text_type in self.text:
-                        self.text[text_type]["trigger"]()
+                    if text_type in self.trigger_map:
+                        self.trigger_map[text_type]()
     
     def explore_trigger(self) -> None:
         """Method to print any new text if conditions met"""
         if self.state.get_current_room_id() == self.id:
-            logger.debug("(SESSION {s}) Triggering explore_trigger in room: {r}".format(s=self.state.session.session_id, r=self.id))
+            logger.debug("(SESSION %s) Triggering explore_trigger in room: %s", self.state.session.session_id, self.id)
             self.puzzles.explore_trigger()
 
     def get_connected_rooms(self) -> list:
@@ -0,0 +1,137 @@
+import threading
+from collections.abc import Mapping
+
+from dmai.utils.bundle import Bundle
+from dmai.utils.loader import Loader
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Definition(Mapping):
+    def __init__(self, data: dict, path: tuple) -> None:
+        """Class which holds a read-only part of the static data of a world.
+        The path locates it in the world, so a pickled definition is restored
+        as the shared definition of the unpickling process."""
+        self._data = data
+        self._path = path
+
+    def __repr__(self) -> str:
+        return "{c}({d})".format(c=self.__class__.__name__, d=self._data)
+
+    def __getitem__(self, key: str) -> object:
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __reduce__(self) -> tuple:
+        return (World.get_definition, self._path)
+
+
+class World:
+
+    # class variables
+    worlds = {}
+    lock = threading.Lock()
+    SOLUTION_TYPES = ["item", "skill", "ability", "equipment", "intent", "spell"]
+
+    def __init__(self, adventure: str) -> None:
+        """Class which holds the static data of an adventure: rooms, puzzle
+        definitions, NPC templates and text.
+        A world is built once per adventure per process and shared read-only
+        by every session, the progress of a session lives in its State."""
+        self.adventure = adventure
+        self.bundle = Bundle.load(adventure)
+        adventure_data = Loader.load_adventure(adventure)
+        self.rooms = Definition({
+            room_id: self._prepare_room(room_id, room_data)
+            for (room_id, room_data) in adventure_data.get("rooms", {}).items()
+        }, (adventure, "rooms"))
+        self.npcs = Definition({
+            npc_id: Definition(npc_data, (adventure, "npcs", npc_id))
+            for (npc_id, npc_data) in adventure_data.get("npcs", {}).items()
+        }, (adventure, "npcs"))
+        self.adventure_data = Definition(
+            {**adventure_data, "rooms": self.rooms, "npcs": self.npcs}, (adventure, ))
+        self._build_indexes()
+
+    def __repr__(self) -> str:
+        return "{c}: {a}".format(c=self.__class__.__name__, a=self.adventure)
+
+    def __reduce__(self) -> tuple:
+        """Method to pickle a world by name, an unpickled game shares the
+        world of this process"""
+        return (World.get_world, (self.adventure, ))
+
+    def _prepare_room(self, room_id: str, room_data: dict) -> Definition:
+        """Method to prepare the static data of a room.
+        Room text is wrapped once here so every session reads it as
+        room.text[text_type]["text"]."""
+        path = (self.adventure, "rooms", room_id)
+        room_data = dict(room_data)
+        room_data["text"] = Definition({
+            text_type: Definition({"text": text}, path + ("text", text_type))
+            for (text_type, text) in room_data.get("text", {}).items()
+        }, path + ("text", ))
+        room_data["puzzles"] = Definition({
+            puzzle_id: Definition(puzzle_data, path + ("puzzles", puzzle_id))
+            for (puzzle_id, puzzle_data) in room_data.get("puzzles", {}).items()
+        }, path + ("puzzles", ))
+        return Definition(room_data, path)
+
+    def _build_indexes(self) -> None:
+        """Method to compile the door and puzzle indexes by id, so code paths
+        run every turn look them up instead of scanning every room.
+        doors holds each connection once as a (room, connected room) tuple.
+        solutions maps each solution type to {puzzle: values}, and
+        item_puzzles maps an item to the puzzles it is a solution of."""
+        self.doors = []
+        self.puzzle_rooms = {}
+        self.room_puzzles = {}
+        self.solutions = {solution_type: {} for solution_type in self.SOLUTION_TYPES}
+        self.item_puzzles = {}
+        seen = set()
+        for (room_id, room) in self.rooms.items():
+            for connection in room.get("connections", {}):
+                if (connection, room_id) not in seen:
+                    seen.add((room_id, connection))
+                    self.doors.append((room_id, connection))
+            self.room_puzzles[room_id] = list(room["puzzles"])
+            for (puzzle_id, puzzle) in room["puzzles"].items():
+                self.puzzle_rooms.setdefault(puzzle_id, room_id)
+                for solution in puzzle.get("solutions", {}).values():
+                    for solution_type in self.SOLUTION_TYPES:
+                        if solution_type in solution:
+                            value = solution[solution_type]
+                            self.solutions[solution_type].setdefault(puzzle_id, []).append(value)
+                            if solution_type == "item":
+                                self.item_puzzles.setdefault(value, []).append(puzzle_id)
+
+    @classmethod
+    def get_world(cls, adventure: str) -> "World":
+        """Method to return the world of an adventure, building it on first
+        use"""
+        with cls.lock:
+            if adventure not in cls.worlds:
+                logger.debug("Building world for adventure: %s", adventure)
+                cls.worlds[adventure] = cls(adventure)
+            return cls.worlds[adventure]
+
+    @classmethod
+    def get_definition(cls, adventure: str, *keys) -> Definition:
+        """Method to return the definition at a path in a world"""
+        definition = cls.get_world(adventure).adventure_data
+        for key in keys:
+            definition = definition[key]
+        return definition
+
+    @classmethod
+    def clear(cls) -> None:
+        """Method to forget the built worlds, e.g. after adventure files
+        change"""
+        with cls.lock:
+            cls.worlds = {}
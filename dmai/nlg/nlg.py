@@ -18,10 +18,6 @@ class NLGMeta(type):
 
 
 class NLG(metaclass=NLGMeta):
-
-    # class variable
-    game = None
-
     def __init__(self) -> None:
         """NLG static class"""
         pass
@@ -0,0 +1,80 @@
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Generator, Iterable
+
+from dmai.nlu.nlu import NLU
+from dmai.nlu.rasa_adapter import RasaAdapter
+from dmai.game.state import State
+from dmai.utils.output_builder import OutputBuilder
+from dmai.utils.config import Config
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BatchParser:
+
+    # class variables
+    PLAYER_LINE = re.compile(r"\(SESSION (?P<session>[^)]*)\) \[PLAYER\]: (?P<utter>.*)$")
+
+    def __init__(self,
+                 adapter: RasaAdapter = None,
+                 max_workers: int = 8,
+                 endpoint: str = None) -> None:
+        """Class which parses batches of player utterances without a game.
+        Parsing never touches a live State, so batches can be run over logged
+        transcripts while games are being played."""
+        if not adapter:
+            adapter = NLU.ADAPTERS[Config.nlu.backend]()
+        self.adapter = adapter
+        self.max_workers = max_workers
+        self.endpoint = endpoint
+
+    def __repr__(self) -> str:
+        return "{c}".format(c=self.__class__.__name__)
+
+    def parse(self, utterances: Iterable, contexts: Iterable = None) -> Generator:
+        """Method to parse an iterable of utterances with bounded concurrency.
+        A context is a saved state dict, when given the intent is resolved
+        against the expected and stored intents of that state.
+        Yields (intent, confidence, entities) tuples in the input order."""
+        if contexts is None:
+            contexts = repeat(None)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = deque()
+            for (utterance, context) in zip(utterances, contexts):
+                # only keep a bounded number of parses in flight
+                if len(pending) >= 2 * self.max_workers:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(self._parse_one, utterance, context))
+            while pending:
+                yield pending.popleft().result()
+
+    def _parse_one(self, utterance: str, context: dict = None) -> tuple:
+        """Method to parse a single utterance.
+        Returns a tuple with the (intent, confidence, entities)."""
+        (intent, confidence, entities) = self.adapter.get_intent(utterance.lower(), self.endpoint)
+        if confidence < NLU.INTENT_CONFIDENCE:
+            intent = "no_intent"
+        if context is None:
+            return (intent, confidence, entities)
+
+        # resolve the intent against a scratch copy of the context
+        output_builder = OutputBuilder()
+        state = State(output_builder)
+        state.load(context)
+        (intent, params) = NLU(state, output_builder, self.endpoint).resolve_intent(intent, entities)
+        return (intent, confidence, params.get("nlu_entities", entities))
+
+    @classmethod
+    def read_log(cls, log_file: str) -> Generator:
+        """Method to read the player utterances from a dmai.log file.
+        Yields (session_id, utterance) tuples, skipping empty utterances."""
+        with open(log_file) as f:
+            for line in f:
+                match = cls.PLAYER_LINE.search(line.rstrip("\n"))
+                if match and match.group("utter"):
+                    yield (match.group("session"), match.group("utter").replace("\\n", "\n"))
@@ -0,0 +1,329 @@
+import argparse
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import yaml
+
+from dmai.utils.config import Config
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class LocalRasaModel:
+
+    # class variables
+    ANNOTATION = re.compile(r"\[(?P<text>[^\]]+)\]\((?P<entity>[^)]+)\)")
+    TOKEN = re.compile(r"[a-z0-9_']+")
+
+    def __init__(self, nlu_file: str) -> None:
+        """Class which imitates a trained Rasa NLU model by matching
+        utterances against the training examples"""
+        self.examples = []
+        self.exact = {}
+        self.lexicon = {}
+        self.token_index = {}
+        self.weights = {}
+        self.max_phrase = 1
+        self._load(nlu_file)
+
+    def __repr__(self) -> str:
+        return "{c}".format(c=self.__class__.__name__)
+
+    def _load(self, nlu_file: str) -> None:
+        """Method to load the training examples from an NLU file"""
+        with open(nlu_file) as f:
+            nlu_data = yaml.safe_load(f)["nlu"]
+
+        synonyms = {}
+        for block in nlu_data:
+            if "synonym" in block:
+                for phrase in self._split_examples(block["examples"]):
+                    synonyms[phrase.lower()] = block["synonym"]
+
+        entity_types = {}
+        for block in nlu_data:
+            if "intent" not in block:
+                continue
+            for example in self._split_examples(block["examples"]):
+                example = example.lower()
+                for match in self.ANNOTATION.finditer(example):
+                    phrase = match.group("text")
+                    entity = match.group("entity")
+                    value = synonyms.get(phrase, phrase)
+                    self._add_phrase(phrase, entity, value)
+                    entity_types[value] = entity
+                text = self.ANNOTATION.sub(lambda m: m.group("text"), example)
+                self.examples.append({"text": text, "intent": block["intent"]})
+
+        # synonyms are recognised for any entity type they were annotated with
+        for (phrase, value) in synonyms.items():
+            if value in entity_types:
+                self._add_phrase(phrase, entity_types[value], value)
+
+        # index the examples with entity phrases masked by their type
+        for (i, example) in enumerate(self.examples):
+            tokens = self._mask(self._tokenise(example["text"]))
+            example["tokens"] = frozenset(tokens)
+            self.exact.setdefault(" ".join(tokens), example["intent"])
+            for token in example["tokens"]:
+                self.token_index.setdefault(token, []).append(i)
+
+        # rare tokens say more about the intent than common ones
+        total = len(self.examples)
+        for (token, postings) in self.token_index.items():
+            self.weights[token] = math.log(1 + total / len(postings))
+        for example in self.examples:
+            example["weight"] = sum(self.weights[t] for t in example["tokens"])
+
+    def _split_examples(self, examples: str) -> list:
+        """Method to split a block of examples into a list"""
+        return [e.strip()[2:].strip() for e in examples.splitlines() if e.strip().startswith("- ")]
+
+    def _tokenise(self, text: str) -> list:
+        """Method to split text into tokens"""
+        return self.TOKEN.findall(text.lower())
+
+    def _add_phrase(self, phrase: str, entity: str, value: str) -> None:
+        """Method to add a phrase to the entity lexicon"""
+        tokens = tuple(self._tokenise(phrase))
+        if tokens and tokens not in self.lexicon:
+            self.lexicon[tokens] = (entity, value)
+            self.max_phrase = max(self.max_phrase, len(tokens))
+
+    def _find_entities(self, tokens: list) -> list:
+        """Method to find the longest lexicon phrases in a list of tokens.
+        Returns a list of (start, end, entity, value) tuples over tokens."""
+        found = []
+        i = 0
+        while i < len(tokens):
+            for n in range(min(self.max_phrase, len(tokens) - i), 0, -1):
+                phrase = tuple(tokens[i:i + n])
+                if phrase in self.lexicon:
+                    (entity, value) = self.lexicon[phrase]
+                    found.append((i, i + n, entity, value))
+                    i += n
+                    break
+            else:
+                i += 1
+        return found
+
+    def _mask(self, tokens: list) -> list:
+        """Method to replace entity phrases with their entity type"""
+        masked = []
+        i = 0
+        for (start, end, entity, value) in self._find_entities(tokens):
+            masked.extend(tokens[i:start])
+            masked.append("<{e}>".format(e=entity))
+            i = end
+        masked.extend(tokens[i:])
+        return masked
+
+    def _classify(self, tokens: list) -> list:
+        """Method to rank intents by similarity to the training examples.
+        Returns a list of (intent, confidence) sorted by confidence."""
+        key = " ".join(tokens)
+        if key in self.exact:
+            return [(self.exact[key], 1.0)]
+
+        token_set = frozenset(tokens)
+        weight = sum(self.weights.get(t, 0) for t in token_set)
+        overlaps = {}
+        for token in token_set:
+            for i in self.token_index.get(token, []):
+                overlaps[i] = overlaps.get(i, 0) + self.weights[token]
+
+        # weighted jaccard similarity, keeping the best example per intent
+        scores = {}
+        for (i, overlap) in overlaps.items():
+            example = self.examples[i]
+            score = overlap / (weight + example["weight"] - overlap)
+            if score > scores.get(example["intent"], 0):
+                scores[example["intent"]] = score
+        if not scores:
+            return [("nlu_fallback", 0.0)]
+        return sorted(scores.items(), key=lambda s: s[1], reverse=True)
+
+    def parse(self, text: str) -> dict:
+        """Method to parse an utterance.
+        Returns a response in the format of the Rasa /model/parse endpoint."""
+        lowered = text.lower()
+        spans = [(m.start(), m.end()) for m in self.TOKEN.finditer(lowered)]
+        tokens = [lowered[start:end] for (start, end) in spans]
+
+        entities = []
+        for (start, end, entity, value) in self._find_entities(tokens):
+            entities.append({
+                "entity": entity,
+                "start": spans[start][0],
+                "end": spans[end - 1][1],
+                "confidence_entity": 1.0,
+                "value": value,
+                "extractor": "LocalRasaModel"
+            })
+
+        ranking = self._classify(self._mask(tokens))
+        return {
+            "text": text,
+            "intent": {"name": ranking[0][0], "confidence": ranking[0][1]},
+            "entities": entities,
+            "intent_ranking": [{"name": i, "confidence": c} for (i, c) in ranking[:10]]
+        }
+
+
+class LocalRasaServer:
+    def __init__(self,
+                 host: str = "localhost",
+                 port: int = 5005,
+                 nlu_file: str = None,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0) -> None:
+        """Class which serves a LocalRasaModel over the same HTTP contract as
+        a Rasa server running with --enable-api"""
+        if not nlu_file:
+            nlu_file = os.path.join(Config.directory.data, "nlu.yml")
+        self.model = LocalRasaModel(nlu_file)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.thread = None
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+
+    def __repr__(self) -> str:
+        return "{c}".format(c=self.__class__.__name__)
+
+    @property
+    def address(self) -> tuple:
+        return self.httpd.server_address
+
+    @property
+    def endpoint(self) -> str:
+        return "http://{h}:{p}/model/parse".format(h=self.address[0], p=self.address[1])
+
+    def _handler(self) -> type:
+        """Method to build the request handler bound to this server"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path == "/":
+                    self._reply(200, "Hello from Rasa: local", "text/plain")
+                elif self.path == "/version":
+                    self._reply(200, json.dumps({"version": "local"}))
+                else:
+                    self._reply(404, json.dumps({"status": "failure", "code": 404}))
+
+            def do_POST(self) -> None:
+                if self.path.split("?")[0] != "/model/parse":
+                    self._reply(404, json.dumps({"status": "failure", "code": 404}))
+                    return
+                server._delay()
+                if random.random() < server.error_rate:
+                    self._reply(500, json.dumps({"status": "failure", "code": 500}))
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length", 0))
+                    text = json.loads(self.rfile.read(length))["text"]
+                except (ValueError, KeyError, TypeError):
+                    self._reply(400, json.dumps({"status": "failure", "code": 400}))
+                    return
+                self._reply(200, json.dumps(server.model.parse(text)))
+
+            def _reply(self, status: int, body: str, content_type: str = "application/json") -> None:
+                body = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        return Handler
+
+    def _delay(self) -> None:
+        """Method to add artificial latency to a request"""
+        delay = self.latency
+        if self.jitter:
+            delay += random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def start(self) -> None:
+        """Method to serve requests on a background thread"""
+        self.thread = threading.Thread(target=self.httpd.serve_forever,
+                                       name="local-rasa-server",
+                                       daemon=True)
+        self.thread.start()
+        logger.debug("Local Rasa server listening on %s", self.endpoint)
+
+    def stop(self) -> None:
+        """Method to stop serving requests"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def serve_forever(self) -> None:
+        """Method to serve requests until interrupted"""
+        logger.debug("Local Rasa server listening on %s", self.endpoint)
+        try:
+            self.httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.httpd.server_close()
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Function constructs an argument parser"""
+    description = "Serve a local stand-in for the Rasa NLU server"
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--host",
+                        default=Config.hosts.rasa_host,
+                        help="Host to listen on")
+    parser.add_argument("--port",
+                        type=int,
+                        default=Config.hosts.rasa_port,
+                        help="Port to listen on")
+    parser.add_argument("--nlu",
+                        help="NLU training data (defaults to data/nlu.yml)")
+    parser.add_argument("--latency",
+                        type=float,
+                        default=0.0,
+                        help="Artificial latency per request in seconds")
+    parser.add_argument("--jitter",
+                        type=float,
+                        default=0.0,
+                        help="Random variation of the latency in seconds")
+    parser.add_argument("--error-rate",
+                        type=float,
+                        default=0.0,
+                        help="Fraction of requests which fail with HTTP 500")
+    return parser
+
+
+def main() -> None:
+    """Main entry point to the local Rasa server"""
+    args = build_arg_parser().parse_args()
+    server = LocalRasaServer(host=args.host,
+                             port=args.port,
+                             nlu_file=args.nlu,
+                             latency=args.latency,
+                             jitter=args.jitter,
+                             error_rate=args.error_rate)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
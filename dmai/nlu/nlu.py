@@ -4,6 +4,9 @@ from dmai.utils.exceptions import UnrecognisedCommandError
 from dmai.utils.output_builder import OutputBuilder
 from dmai.utils.text import Text
 from dmai.nlu.rasa_adapter import RasaAdapter
+from dmai.nlu.rasa_interpreter_adapter import RasaInterpreterAdapter
+from dmai.utils.config import Config
+from dmai.utils.profiler import Profiler
 from dmai.game.state import State
 from dmai.game.state import Combat
 from dmai.utils.logger import get_logger
@@ -15,11 +18,17 @@ class NLU():
 
     # class variables
     INTENT_CONFIDENCE = 0.5
+    ADAPTERS = {
+        "server": RasaAdapter,
+        "embedded": RasaInterpreterAdapter
+    }
 
-    def __init__(self, state: State, output_builder: OutputBuilder) -> None:
+    def __init__(self, state: State, output_builder: OutputBuilder, endpoint: str = None) -> None:
         self.state = state
         self.output_builder = output_builder
+        self.endpoint = endpoint
         self.param = ""
+        self.adapter = self.get_adapter(Config.nlu.backend)
         self.commands = {
             "help": {
                 "text": "/help",
@@ -37,10 +46,33 @@ class NLU():
                 "help":
                 "Show your character stats in a character sheet",
                 "cmd":
-                "self.output_builder.append(self.game.player.get_character_sheet(), wrap=False)"
+                "self.output_builder.append(self.state.get_player().get_character_sheet(), wrap=False)"
+            },
+            "profile": {
+                "text": "/profile",
+                "help": "Profile the next turns: start [turns] [mode], stop or dump",
+                "cmd": "self.profile(self.param)",
+                "default_param": ""
             }
         }
 
+    def get_adapter(self, backend: str) -> RasaAdapter:
+        """Returns the adapter for the configured NLU backend"""
+        try:
+            return self._adapter_factory(backend)
+        except ValueError as e:
+            logger.error("(SESSION %s) %s", self.state.session.session_id, e)
+
+    def _adapter_factory(self, backend: str) -> RasaAdapter:
+        """Construct an instance of a specified NLU adapter"""
+        try:
+            adapter = self.ADAPTERS[backend]
+            return adapter()
+        except (ValueError, KeyError) as e:
+            msg = "Cannot create NLU backend {b} - it does not exist!".format(
+                b=backend)
+            raise ValueError(msg)
+
     def show_commands(self) -> str:
         """Return the command list"""
         cmd_str = "Commands:\n"
@@ -59,7 +91,8 @@ class NLU():
             try:
                 return self._regex_and_exec(player_cmd)
             except UnrecognisedCommandError as e:
-                logger.error("(SESSION {s}) {e}".format(s=self.state.session.session_id, e=e))
+                logger.error("(SESSION %s) %s", self.state.session.session_id, e)
+                self.output_builder.append(str(e), wrap=False)
         return (False, player_cmd)
 
     def _regex_and_exec(self, player_cmd: str) -> None:
@@ -72,7 +105,7 @@ class NLU():
             if len(cmd_tokens) == 2:
                 self.param = cmd_tokens[1]
             elif len(cmd_tokens) > 2:
-                self.param = " ".join(cmd_tokens[2:])
+                self.param = " ".join(cmd_tokens[1:])
             elif "default_param" in self.commands[cmd]:
                 self.param = self.commands[cmd]["default_param"]
 
@@ -100,6 +133,38 @@ class NLU():
         else:
             return (True, "")
 
+    def profile(self, param: str) -> None:
+        """Method to start, stop or dump the profile of the session's turns,
+        e.g. /profile start 5 deterministic"""
+        session_id = self.state.session.session_id
+        tokens = param.split()
+        action = tokens[0] if tokens else "start"
+        if action == "start":
+            turns = None
+            mode = "sampling"
+            for token in tokens[1:]:
+                if token.isdigit():
+                    turns = int(token)
+                else:
+                    mode = token
+            try:
+                Profiler.start(session_id, turns, mode)
+            except ValueError as e:
+                self.output_builder.append(str(e))
+                return
+            self.output_builder.append("Profiling the next {t} ({m}).".format(
+                t="{n} turns".format(n=turns) if turns else "turns until /profile stop", m=mode))
+        elif action in ("stop", "dump"):
+            run = Profiler.stop(session_id) if action == "stop" else Profiler.get_run(session_id)
+            file = Profiler.dump(run) if run else None
+            if file:
+                self.output_builder.append("Wrote the profile of {n} turns to {f}".format(n=run.profiled, f=file))
+            else:
+                self.output_builder.append("There is no profile to write.")
+        else:
+            self.output_builder.append("Cannot profile: {a}. Use /profile start [turns] [mode], stop or dump".format(
+                a=action))
+
     def process_player_utterance(self, player_utter: str) -> tuple:
         """Method to process the player utterance"""
         return self._determine_intent(player_utter)
@@ -107,8 +172,9 @@ class NLU():
     def _determine_intent(self, player_utter: str) -> tuple:
         """Method to determine the player intent"""
         player_utter = player_utter.lower()
-        (intent, confidence, entities) = RasaAdapter.get_intent(player_utter)
-        logger.debug("(SESSION {s}) Detected player intent: {i} ({c})".format(s=self.state.session.session_id, i=intent, c=confidence))
+        (intent, confidence, entities) = self.state.journal.draw(
+            "nlu", self.adapter.get_intent, player_utter, self.endpoint)
+        logger.debug("(SESSION %s) Detected player intent: %s (%s)", self.state.session.session_id, intent, confidence)
         if confidence < self.INTENT_CONFIDENCE:
             intent = "no_intent"
         self.state.set_intent(intent)
@@ -116,11 +182,16 @@ class NLU():
             print("intent: " + intent)
         if entities:
             print(entities)
+        return self.resolve_intent(intent, entities)
 
-        logger.debug("(SESSION {s}) Expected entities: {i}".format(s=self.state.session.session_id, i=str(self.state.expected_entities)))
-        logger.debug("(SESSION {s}) Expected intent: {i}".format(s=self.state.session.session_id, i=str(self.state.expected_intent)))
-        logger.debug("(SESSION {s}) Stored intent: {i}".format(s=self.state.session.session_id, i=str(self.state.stored_intent)))
-        logger.debug("(SESSION {s}) Suggested next move: {i}".format(s=self.state.session.session_id, i=str(self.state.suggested_next_move["utter"])))
+    def resolve_intent(self, intent: str, entities: list) -> tuple:
+        """Method to resolve a detected intent against the expected and stored
+        intents in the state.
+        Returns a tuple with the (intent, params) to be processed."""
+        logger.debug("(SESSION %s) Expected entities: %s", self.state.session.session_id, str(self.state.expected_entities))
+        logger.debug("(SESSION %s) Expected intent: %s", self.state.session.session_id, str(self.state.expected_intent))
+        logger.debug("(SESSION %s) Stored intent: %s", self.state.session.session_id, str(self.state.stored_intent))
+        logger.debug("(SESSION %s) Suggested next move: %s", self.state.session.session_id, str(self.state.suggested_next_move["utter"]))
 
         # check if there's expected entities
         if self.state.expected_entities:
@@ -139,10 +210,10 @@ class NLU():
                 if intent not in self.state.expected_intent:
                     # TODO make exception for hints or questions
                     # TODO this also seems a little broken when input is not recognised and player corrects themselves to roll initiative
-                    intents = [self.state.get_dm().player_intent_map[intent]["desc"] for intent in self.state.expected_intent]
+                    intents = [self._describe_intent(intent) for intent in self.state.expected_intent]
                     intent_str = Text.properly_format_list(intents, last_delimiter=" or ")
                     self.output_builder.append("I was expecting you to {i}.".format(i=intent_str))
-                    logger.debug("(SESSION {s}) Intent being processed: None".format(s=self.state.session.session_id))
+                    logger.debug("(SESSION %s) Intent being processed: None", self.state.session.session_id)
                     return (None, {"nlu_entities": entities})
         
         # check if there's a suggested next move
@@ -153,13 +224,13 @@ class NLU():
         # check if in combat before allowing any player utterance
         if self.state.in_combat:
             if self.state.get_combat_status() == Combat.ATTACK_ROLL:
-                logger.debug("(SESSION {s}) Intent being processed: attack".format(s=self.state.session.session_id))
+                logger.debug("(SESSION %s) Intent being processed: attack", self.state.session.session_id)
                 return ("attack", {"nlu_entities": entities})
             else:
-                logger.debug("(SESSION {s}) Intent being processed: roll".format(s=self.state.session.session_id))
+                logger.debug("(SESSION %s) Intent being processed: roll", self.state.session.session_id)
                 return ("roll", {"nlu_entities": entities})
         
-        logger.debug("(SESSION {s}) Intent being processed: {i}".format(s=self.state.session.session_id, i=str(intent)))
+        logger.debug("(SESSION %s) Intent being processed: %s", self.state.session.session_id, str(intent))
 
         if intent == "no_intent":
             return ("no_intent", {})
@@ -229,3 +300,9 @@ class NLU():
                 })
 
         return (None, {})
+
+    def _describe_intent(self, intent: str) -> str:
+        """Method to return the description of an intent"""
+        if self.state.dm and intent in self.state.dm.player_intent_map:
+            return self.state.dm.player_intent_map[intent]["desc"]
+        return intent
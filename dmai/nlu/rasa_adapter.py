@@ -1,19 +1,16 @@
-import requests
-
 from dmai.utils.config import Config
+from dmai.utils.metrics import Metrics
 from dmai.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+NLU_SECONDS = Metrics.histogram("dmai_nlu_parse_seconds", "Seconds spent parsing an utterance", ("adapter", ))
+NLU_ERRORS = Metrics.counter("dmai_nlu_errors_total", "Utterances the NLU failed to parse", ("adapter", ))
+
 
 class RasaAdapterMeta(type):
     _instances = {}
 
-    def __new__(cls, name, bases, dict):
-        instance = super().__new__(cls, name, bases, dict)
-        instance.endpoint = ""
-        return instance
-
     def __call__(cls, *args, **kwargs) -> None:
         """RasaAdapter static singleton metaclass"""
         if cls not in cls._instances:
@@ -29,32 +26,40 @@ class RasaAdapter(metaclass=RasaAdapterMeta):
         pass
 
     @classmethod
-    def configure_endpoint(cls) -> None:
-        """Method to configure the endpoint"""
-        cls.endpoint = "http://{h}:{p}/model/parse".format(
-            h=Config.hosts.rasa_host,
-            p=Config.hosts.rasa_port
+    def get_endpoint(cls, host: str = None, port: int = None) -> str:
+        """Method to return the endpoint of a Rasa server, defaulting to the
+        configured host and port"""
+        return "http://{h}:{p}/model/parse".format(
+            h=host if host else Config.hosts.rasa_host,
+            p=port if port else Config.hosts.rasa_port
         )
 
     @classmethod
-    def get_intent(cls, player_utter: str) -> tuple:
+    def get_intent(cls, player_utter: str, endpoint: str = None) -> tuple:
         """Method which determines player intent from utterance.
         Returns a tuple with the (intent, entities)."""
         try:
-            response = cls._parse_message(player_utter)
+            with NLU_SECONDS.time(adapter=cls.__name__):
+                response = cls._parse_message(player_utter, endpoint)
             intent = response["intent"]["name"]
             confidence = response["intent"]["confidence"]
             entities = cls._prepare_entities(response["entities"])
             return (intent, confidence, entities)
         except ValueError as e:
+            NLU_ERRORS.inc(adapter=cls.__name__)
             return ("no_intent", 1, [])
 
     @classmethod
-    def _parse_message(cls, message: str) -> str:
+    def _parse_message(cls, message: str, endpoint: str = None) -> str:
         """Method which sends a message to Rasa NLU server.
         Returns a response."""
+        # requests is slow to import, only the server backend needs it
+        import requests
+
+        if not endpoint:
+            endpoint = cls.get_endpoint()
         data = "{{\"text\":\"{t}\"}}".format(t=message)
-        r = requests.post(cls.endpoint, data=data)
+        r = requests.post(endpoint, data=data)
 
         if r.status_code == 200:
             # successful request, return response
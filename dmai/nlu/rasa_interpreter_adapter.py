@@ -0,0 +1,133 @@
+import os
+import queue
+import threading
+from concurrent.futures import Future, TimeoutError
+
+from dmai.nlu.rasa_adapter import RasaAdapter
+from dmai.utils.config import Config
+from dmai.utils.metrics import Metrics
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+NLU_CACHE_HITS = Metrics.counter(
+    "dmai_nlu_cache_hits_total", "Utterances answered by the parse of an identical utterance in the same batch")
+
+
+class RasaInterpreterAdapter(RasaAdapter):
+
+    # class variables
+    interpreter = None
+    parse_queue = None
+    worker = None
+    lock = threading.Lock()
+
+    def __init__(self) -> None:
+        """Class which is used for processing inputs and outputs with a
+        Rasa NLU interpreter embedded in the game process"""
+        pass
+
+    @classmethod
+    def load(cls) -> None:
+        """Method to load the trained NLU model into the process.
+        The model is only loaded once and is shared by every session."""
+        with cls.lock:
+            if cls.interpreter:
+                return
+
+            # rasa is a heavy optional dependency, only import it when the
+            # embedded backend is used
+            try:
+                from rasa.model import get_model, get_model_subdirectories
+                from rasa.nlu.model import Interpreter
+            except ImportError as e:
+                logger.error("Cannot load embedded NLU backend: %s", e)
+                raise
+
+            model_path = os.path.join(Config.directory.models, Config.nlu.model)
+            logger.debug("Loading NLU model: %s", model_path)
+            model_dir = get_model(model_path)
+            _, nlu_model = get_model_subdirectories(model_dir)
+            cls.interpreter = Interpreter.load(nlu_model)
+            cls._start_worker()
+
+    @classmethod
+    def unload(cls) -> None:
+        """Method to stop the batching worker and release the model"""
+        with cls.lock:
+            if cls.worker:
+                cls.parse_queue.put(None)
+                cls.worker.join()
+            cls.interpreter = None
+            cls.parse_queue = None
+            cls.worker = None
+
+    @classmethod
+    def _start_worker(cls) -> None:
+        """Method to start the thread which parses batches of messages"""
+        cls.parse_queue = queue.Queue()
+        cls.worker = threading.Thread(target=cls._run_worker,
+                                      args=(cls.parse_queue, ),
+                                      name="rasa-interpreter",
+                                      daemon=True)
+        cls.worker.start()
+
+    @classmethod
+    def _run_worker(cls, parse_queue: queue.Queue) -> None:
+        """Method to collect concurrent parse requests into micro-batches"""
+        while True:
+            request = parse_queue.get()
+            if request is None:
+                return
+
+            # wait a short window for other sessions to submit messages
+            batch = [request]
+            stop = False
+            while len(batch) < Config.nlu.batch_size:
+                try:
+                    request = parse_queue.get(timeout=Config.nlu.batch_window)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                batch.append(request)
+
+            cls._parse_batch(batch)
+            if stop:
+                return
+
+    @classmethod
+    def _parse_batch(cls, batch: list) -> None:
+        """Method to run a batch of messages through the interpreter.
+        Identical messages in the batch are only parsed once."""
+        results = {}
+        for (message, future) in batch:
+            # the caller has given up waiting
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if message not in results:
+                    results[message] = cls.interpreter.parse(message)
+                future.set_result(results[message])
+            except Exception as e:
+                future.set_exception(ValueError("Rasa error: {e}".format(e=e)))
+        NLU_CACHE_HITS.inc(len(batch) - len(results))
+        logger.debug("Parsed NLU batch of %s messages (%s unique)",
+            len(batch), len(results))
+
+    @classmethod
+    def _parse_message(cls, message: str, endpoint: str = None) -> dict:
+        """Method which sends a message to the embedded interpreter, the
+        endpoint is not used.
+        Returns a response."""
+        if not cls.worker:
+            raise ValueError("Rasa error: embedded NLU model is not loaded")
+        future = Future()
+        cls.parse_queue.put((message, future))
+        try:
+            return future.result(timeout=Config.nlu.parse_timeout)
+        except TimeoutError:
+            future.cancel()
+            msg = "Rasa error: embedded NLU did not respond in {t}s".format(t=Config.nlu.parse_timeout)
+            raise ValueError(msg)
@@ -5,10 +5,15 @@ from dmai.game.state import State
 from dmai.utils.output_builder import OutputBuilder
 from dmai.planning.planner_adapter import PlannerAdapter
 from dmai.utils.config import Config
+from dmai.utils.metrics import Metrics
 from dmai.utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+PLANNER_RUNS = Metrics.counter("dmai_planner_invocations_total", "Planner runs", ("agent", ))
+PLANNER_FAILURES = Metrics.counter("dmai_planner_failures_total", "Planner runs which did not find a plan", ("agent", ))
+PLANNER_SECONDS = Metrics.histogram("dmai_planner_seconds", "Seconds spent running the planner", ("agent", ))
+
 
 class FastDownwardAdapter(PlannerAdapter):
     def __init__(self, domain: str, problem: str, state: State, output_builder: OutputBuilder) -> None:
@@ -21,7 +26,7 @@ class FastDownwardAdapter(PlannerAdapter):
     def build_plan(self) -> bool:
         """Build a plan using FastDownward.
         Returns boolean indicating successful execution"""
-        logger.debug("(SESSION {s}) Started building plan with FastDownward".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) Started building plan with FastDownward", self.state.session.session_id)
         domain_file = os.path.join(
             Config.directory.planning,
             "{u}.{d}.domain.pddl".format(u=self.state.session.session_id, d=self.domain))
@@ -33,17 +38,25 @@ class FastDownwardAdapter(PlannerAdapter):
             "{u}.{d}-{p}.plan".format(u=self.state.session.session_id,
                                       d=self.domain,
                                       p=self.problem))
-        p = run([
-            'fast-downward.py', '--plan-file', plan_file, domain_file,
-            problem_file, '--search', 'astar(add())'
-        ],
-                stdout=PIPE,
-                stderr=PIPE,
-                universal_newlines=True)
-        logger.debug("(SESSION {s}) Finished building plan with FastDownward".format(s=self.state.session.session_id))
-        logger.debug("(SESSION {s}) FastDownward returncode: {r}".format(s=self.state.session.session_id, r=p.returncode))
+        PLANNER_RUNS.inc(agent=self.domain)
+        try:
+            with PLANNER_SECONDS.time(agent=self.domain):
+                p = run([
+                    'fast-downward.py', '--plan-file', plan_file, domain_file,
+                    problem_file, '--search', 'astar(add())'
+                ],
+                        stdout=PIPE,
+                        stderr=PIPE,
+                        universal_newlines=True)
+        except OSError:
+            PLANNER_FAILURES.inc(agent=self.domain)
+            raise
+        logger.debug("(SESSION %s) Finished building plan with FastDownward", self.state.session.session_id)
+        logger.debug("(SESSION %s) FastDownward returncode: %s", self.state.session.session_id, p.returncode)
         if p.stderr:
-            logger.debug("(SESSION {s}) FastDownward standard error: {e}".format(s=self.state.session.session_id, e=p.stderr))
+            logger.debug("(SESSION %s) FastDownward standard error: %s", self.state.session.session_id, p.stderr)
+        if p.returncode != 0:
+            PLANNER_FAILURES.inc(agent=self.domain)
         return p.returncode == 0
 
     def parse_plan(self) -> None:
@@ -32,12 +32,17 @@ class PlannerAdapter(ABC):
     def pop_move(self) -> str:
         """Method to pop the first action from the plan"""
         if not self.plan:
-            self.parse_plan()
+            self.plan = self.state.journal.draw("plan_file", self._read_plan)
             if not self.plan:
-                logger.debug("(SESSION {s}) Plan failed".format(s=self.state.session.session_id))
+                logger.debug("(SESSION %s) Plan failed", self.state.session.session_id)
         if len(self.plan) > 0:
             return self.plan.pop(0)
         
+    def _read_plan(self) -> list:
+        """Method to read the plan built by the planner"""
+        self.parse_plan()
+        return self.plan
+
     def to_natural_language(self, step: str) -> str:
         """Method to convert a step in a plan to natural language"""
         step = step.replace("(", "").replace(")", "").replace("\n", "")
@@ -5,6 +5,7 @@ from dmai.planning.planner_adapter import PlannerAdapter
 from dmai.planning.fast_downward_adapter import FastDownwardAdapter
 from dmai.planning.planning_actions import PlanningActions
 from dmai.utils.output_builder import OutputBuilder
+from dmai.utils.tracer import Tracer
 from dmai.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -36,7 +37,7 @@ class PlanningAgent(ABC):
         try:
             return self._planner_factory(planner)
         except ValueError as e:
-            logger.error("(SESSION {s}) {e}".format(s=self.state.session.session_id, e=e))
+            logger.error("(SESSION %s) %s", self.state.session.session_id, e)
 
     def _planner_factory(self, planner: str) -> PlannerAdapter:
         """Construct an instance of a PlannerAdapter"""
@@ -52,13 +53,25 @@ class PlanningAgent(ABC):
     def prepare_next_move(self) -> bool:
         """Method to prepare the next move, e.g. planning agents build a plan.
         Returns bool for whether plan was built."""
-        self.build_domain()
-        self.build_problem()
+        (succeed, plan) = self.state.journal.draw("plan", self._build_plan)
+        self.planner.plan = plan
+        return succeed
+
+    def _build_plan(self) -> tuple:
+        """Method to build a plan with the planner.
+        Returns a tuple with (bool, list) for whether plan was built and the plan."""
+        with Tracer.span("planning.build_domain"):
+            self.build_domain()
+        with Tracer.span("planning.build_problem"):
+            self.build_problem()
         # TODO do something with succeed
-        succeed = self.planner.build_plan()
+        with Tracer.span("planning.build_plan", planner=str(self.planner)) as span:
+            succeed = self.planner.build_plan()
+            span.tag(succeed=succeed)
         if succeed:
-            self.planner.parse_plan()
-        return succeed
+            with Tracer.span("planning.parse_plan"):
+                self.planner.parse_plan()
+        return (succeed, self.planner.plan)
 
     def get_next_move(self) -> str:
         if bool(self.planner.plan):
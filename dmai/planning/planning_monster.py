@@ -21,7 +21,7 @@ class PlanningMonster(PlanningAgent):
         return "{c}".format(c=self.__class__.__name__)
 
     def build_domain(self) -> None:
-        logger.debug("(SESSION {s}) Building domain: monster".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) Building domain: monster", self.state.session.session_id)
         domain_file = os.path.join(
             Config.directory.planning,
             "{u}.{d}.domain.pddl".format(u=self.state.session.session_id, d=self.domain),
@@ -175,7 +175,7 @@ class PlanningMonster(PlanningAgent):
             writer.write(self._construct_domain_footer())
 
     def build_problem(self) -> None:
-        logger.debug("(SESSION {s}) Building problem: {p}".format(s=self.state.session.session_id, p=self.problem))
+        logger.debug("(SESSION %s) Building problem: %s", self.state.session.session_id, self.problem)
         monster = self.state.get_entity(self.problem)
         problem_file = os.path.join(
             Config.directory.planning,
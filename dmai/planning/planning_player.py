@@ -22,7 +22,7 @@ class PlanningPlayer(PlanningAgent):
         return "{c}".format(c=self.__class__.__name__)
 
     def build_domain(self) -> None:
-        logger.debug("(SESSION {s}) Building domain: player".format(s=self.state.session.session_id))
+        logger.debug("(SESSION %s) Building domain: player", self.state.session.session_id)
         domain_file = os.path.join(
             Config.directory.planning,
             "{u}.{d}.domain.pddl".format(u=self.state.session.session_id, d=self.domain),
@@ -301,7 +301,7 @@ class PlanningPlayer(PlanningAgent):
             writer.write(self._construct_domain_footer())
 
     def build_problem(self) -> None:
-        logger.debug("(SESSION {s}) Building problem: {p}".format(s=self.state.session.session_id, p=self.problem))
+        logger.debug("(SESSION %s) Building problem: %s", self.state.session.session_id, self.problem)
         problem_file = os.path.join(
             Config.directory.planning,
             "{u}.{p}.problem.pddl".format(u=self.state.session.session_id, p=self.problem),
@@ -331,19 +331,14 @@ class PlanningPlayer(PlanningAgent):
             objects.append(["hostile", "hostile"])
 
             # Rooms
-            for room in self.state.get_dm().adventure.get_all_rooms():
+            adventure = self.state.get_dm().adventure
+            for room in adventure.get_all_rooms():
                 objects.append([room.id, "room"])
 
             # Doors
-            doors = []
-            for room in self.state.get_dm().adventure.get_all_rooms():
-                for connection in room.get_connected_rooms():
-                    door = "{r}---{c}".format(r=room.id, c=connection)
-                    reverse_door = "{c}---{r}".format(r=room.id, c=connection)
-                    if not reverse_door in doors:
-                        doors.append(door)
-            for door in doors:
-                objects.append([door, "door"])
+            doors = adventure.get_doors()
+            for (room1, room2) in doors:
+                objects.append(["{r}---{c}".format(r=room1, c=room2), "door"])
 
             # Monsters
             for monster in self.state.get_dm().npcs.get_all_monsters():
@@ -366,11 +361,10 @@ class PlanningPlayer(PlanningAgent):
                 objects.append([equipment, "equipment"])
 
             # Puzzles
-            for room in self.state.get_dm().adventure.get_all_rooms():
-                for puzzle in room.puzzles.get_all_puzzles():
-                    if not puzzle.type == "door":
-                        if not self.state.get_player().character.items.has_item(puzzle.id)[0]:
-                            objects.append(["{p}_puzzle".format(p=puzzle.id), "puzzle"])
+            for puzzle in adventure.get_all_puzzles():
+                if not puzzle.type == "door":
+                    if not self.state.get_player().character.items.has_item(puzzle.id)[0]:
+                        objects.append(["{p}_puzzle".format(p=puzzle.id), "puzzle"])
 
             # Construct the string
             writer.write(self._construct_objects(objects))
@@ -456,9 +450,8 @@ class PlanningPlayer(PlanningAgent):
                     init.append(["treasure", room.id])
                     
             # Room connections
-            for door in doors:
-                room1 = door.split("---")[0]
-                room2 = door.split("---")[1]
+            for (room1, room2) in doors:
+                door = "{r}---{c}".format(r=room1, c=room2)
                 init.append(["connected", door, room1, room2])
                 init.append(["connected", door, room2, room1])
                 init.append(["at", door, room1])
@@ -472,11 +465,10 @@ class PlanningPlayer(PlanningAgent):
             for item in self.state.get_player().character.items.item_data.keys():
                 init.append([item, item])
                 # if item is used for a puzzle solution, also put the location in init
-                for room in self.state.get_dm().adventure.get_all_rooms():
-                    for puzzle in room.puzzles.get_all_puzzles():
-                        if puzzle.id not in self.state.solved_puzzles:
-                            if puzzle.type == "item" and puzzle.id == item:
-                                init.append(["at", puzzle.id, room.id])
+                puzzle = adventure.get_puzzle(item)
+                if puzzle and puzzle.id not in self.state.solved_puzzles:
+                    if puzzle.type == "item":
+                        init.append(["at", puzzle.id, adventure.get_puzzle_room(puzzle.id)])
             # check if NPC has item
             for npc in self.state.npc_treasure_map:
                 if self.state.npc_treasure_map[npc]:
@@ -487,60 +479,61 @@ class PlanningPlayer(PlanningAgent):
                 init.append(["has", "player", item])
 
             # Puzzles
-            for room in self.state.get_dm().adventure.get_all_rooms():
-                for puzzle in room.puzzles.get_all_puzzles():
-                    puzzle_id = puzzle.id if puzzle.type == "door" else "{p}_puzzle".format(p=puzzle.id)
-                    if puzzle.type != "door":
-                        init.append(["at", puzzle_id, room.id])
-                    if puzzle.id not in self.state.solved_puzzles:
-                        puzzle_solution = False
-                        if not puzzle_solution:
-                            # Item solution
-                            for solution in puzzle.get_all_solutions():
-                                if "item" in puzzle.get_solution(solution):
-                                    item = puzzle.get_solution(solution)["item"]
-                                    if self.state.get_player().has_item(item)[0]:
-                                        init.append(["item_solution", puzzle_id, item])
-                                        puzzle_solution = True
-                                        break
-                        if not puzzle_solution:
-                            # Skill solution
-                            for skill in Skills.get_all_skills():
-                                if puzzle.check_solution_skill(skill[0]):
-                                    init.append(["skill_solution", puzzle_id, skill[0]])
-                                    puzzle_solution = True
-                                    break
-                        if not puzzle_solution:
-                            # Explore solution
-                            for explore in self.state.puzzle_trigger_map[puzzle.id]["explore"]:
-                                if self.state.puzzle_trigger_map[puzzle.id]["explore"][explore]:
-                                    if puzzle.check_solution_explore():
-                                        init.append(["explore_solution", puzzle_id])
-                                        puzzle_solution = True
-                                        break
-                        if not puzzle_solution:
-                            # Ability solution
-                            for ability in Abilities.get_all_abilities():
-                                if puzzle.check_solution_ability(ability[0]):
-                                    init.append(["ability_solution", puzzle_id, ability[0]])
+            for puzzle in adventure.get_all_puzzles():
+                puzzle_id = puzzle.id if puzzle.type == "door" else "{p}_puzzle".format(p=puzzle.id)
+                if puzzle.type != "door":
+                    init.append(["at", puzzle_id, adventure.get_puzzle_room(puzzle.id)])
+                if puzzle.id not in self.state.solved_puzzles:
+                    puzzle_solution = False
+                    if not puzzle_solution:
+                        # Item solution
+                        for item in adventure.get_solutions("item", puzzle.id):
+                            if self.state.get_player().has_item(item)[0]:
+                                init.append(["item_solution", puzzle_id, item])
+                                puzzle_solution = True
+                                break
+                    if not puzzle_solution:
+                        # Skill solution
+                        skills = adventure.get_solutions("skill", puzzle.id)
+                        for skill in Skills.get_all_skills():
+                            if skill[0] in skills:
+                                init.append(["skill_solution", puzzle_id, skill[0]])
+                                puzzle_solution = True
+                                break
+                    if not puzzle_solution:
+                        # Explore solution
+                        for explore in self.state.puzzle_trigger_map[puzzle.id]["explore"]:
+                            if self.state.puzzle_trigger_map[puzzle.id]["explore"][explore]:
+                                if puzzle.check_solution_explore():
+                                    init.append(["explore_solution", puzzle_id])
                                     puzzle_solution = True
                                     break
-                        if not puzzle_solution:
-                            # Intent solution
-                            for intent in self.state.get_dm().player_intent_map.keys():
-                                if puzzle.check_solution_intent(intent):
-                                    init.append(["intent_solution", puzzle_id, intent])
-                                    puzzle_solution = True
-                                    break
-                        if not puzzle_solution:
-                            # Equipment solution
-                            for equipment in self.state.get_player().get_all_equipment_ids():
-                                if puzzle.check_solution_equipment(equipment):
-                                    init.append(["equipment_solution", puzzle_id, equipment])
-                                    puzzle_solution = True
-                                    break
-
-                    # TODO add spell solution
+                    if not puzzle_solution:
+                        # Ability solution
+                        abilities = adventure.get_solutions("ability", puzzle.id)
+                        for ability in Abilities.get_all_abilities():
+                            if ability[0] in abilities:
+                                init.append(["ability_solution", puzzle_id, ability[0]])
+                                puzzle_solution = True
+                                break
+                    if not puzzle_solution:
+                        # Intent solution
+                        intents = adventure.get_solutions("intent", puzzle.id)
+                        for intent in self.state.get_dm().player_intent_map.keys():
+                            if intent in intents:
+                                init.append(["intent_solution", puzzle_id, intent])
+                                puzzle_solution = True
+                                break
+                    if not puzzle_solution:
+                        # Equipment solution
+                        equipment_solutions = adventure.get_solutions("equipment", puzzle.id)
+                        for equipment in self.state.get_player().get_all_equipment_ids():
+                            if equipment in equipment_solutions:
+                                init.append(["equipment_solution", puzzle_id, equipment])
+                                puzzle_solution = True
+                                break
+
+                # TODO add spell solution
 
             # Construct the string
             writer.write(self._construct_init(init))
@@ -0,0 +1,162 @@
+import json
+import os
+import shutil
+import time
+from glob import glob
+
+from dmai.utils.config import Config
+from dmai.utils.loader import Loader
+from dmai.utils.bundle import Bundle
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Prewarmer:
+
+    # class variables
+    # stages in the order they run, later stages use the caches built by
+    # earlier ones
+    STAGES = ["domain", "bundles", "nlu", "game", "planning", "translate"]
+    READINESS_FILE = "prewarm.json"
+
+    def __init__(self, adventures: list = None, session_id: str = "prewarm") -> None:
+        """Class which builds every cache a session uses before the first
+        session starts, e.g. after a deploy.
+        Each stage is timed and the report is written to a readiness file
+        once every stage has finished, so a readiness probe can wait for it."""
+        self.adventures = adventures or self.get_adventures()
+        self.session_id = session_id
+        self.games = {}
+        self.report = {}
+
+    def __repr__(self) -> str:
+        return "{c} for {a}".format(c=self.__class__.__name__, a=", ".join(self.adventures))
+
+    @staticmethod
+    def get_adventures() -> list:
+        """Method to return the names of every adventure on disk"""
+        files = glob(os.path.join(Config.directory.adventure, "*.json"))
+        return sorted(os.path.splitext(os.path.basename(file))[0] for file in files)
+
+    @classmethod
+    def get_path(cls) -> str:
+        """Method to return the path of the readiness file"""
+        return os.path.join(Config.directory.output, cls.READINESS_FILE)
+
+    @classmethod
+    def is_ready(cls) -> bool:
+        """Method to return whether the last prewarm finished without a
+        failed stage"""
+        try:
+            with open(cls.get_path()) as f:
+                return json.load(f)["ready"]
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def run(self) -> dict:
+        """Method to run every stage and write the readiness file.
+        Returns a dict with the status and seconds taken by each stage."""
+        # a readiness file from an earlier run is not valid for this one
+        try:
+            os.remove(self.get_path())
+        except FileNotFoundError:
+            pass
+
+        logger.info("Prewarming caches for %s", ", ".join(self.adventures))
+        started = time.perf_counter()
+        for stage in self.STAGES:
+            stage_started = time.perf_counter()
+            try:
+                status = getattr(self, "_{s}".format(s=stage))()
+            except Exception as e:
+                logger.error("Prewarm stage %s failed: %s", stage, e)
+                status = "failed"
+            seconds = time.perf_counter() - stage_started
+            self.report[stage] = {"status": status, "seconds": round(seconds, 4)}
+            logger.info("Prewarm stage %s: %s in %.3fs", stage, status, seconds)
+
+        ready = all(stage["status"] != "failed" for stage in self.report.values())
+        self.write({
+            "ready": ready,
+            "adventures": self.adventures,
+            "seconds": round(time.perf_counter() - started, 4),
+            "finished": time.time(),
+            "stages": self.report,
+        })
+        return self.report
+
+    def write(self, readiness: dict) -> None:
+        """Method to write the readiness file, replacing it atomically so a
+        probe never reads a partial file"""
+        path = self.get_path()
+        temp = "{p}.{i}.tmp".format(p=path, i=os.getpid())
+        with open(temp, "w") as f:
+            json.dump(readiness, f, indent=4)
+        os.replace(temp, path)
+
+    ################################################
+    # Stages, each returns "done" or "skipped" and raises if it fails
+    def _domain(self) -> str:
+        """Parse every domain file into the Loader cache"""
+        for file in sorted(glob(os.path.join(Config.directory.domain, "*.json"))):
+            Loader.load_cached(file)
+        return "done"
+
+    def _bundles(self) -> str:
+        """Compile the bundle of every adventure which is missing or stale"""
+        for adventure in self.adventures:
+            Bundle.load(adventure)
+        return "done"
+
+    def _nlu(self) -> str:
+        """Load the NLU model, only the embedded backend loads it in the
+        game process"""
+        if Config.nlu.backend != "embedded":
+            return "skipped"
+        from dmai.nlu.rasa_interpreter_adapter import RasaInterpreterAdapter
+        RasaInterpreterAdapter.load()
+        return "done"
+
+    def _game(self) -> str:
+        """Load a game of every adventure, which imports the game modules and
+        loads the character and monster collections"""
+        from dmai.game.game import Game
+        for adventure in self.adventures:
+            game = Game(char_class="fighter",
+                        char_name="Prewarm",
+                        skip_intro=True,
+                        adventure=adventure,
+                        session_id=self.session_id)
+            game.load()
+            self.games[adventure] = game
+        return "done"
+
+    def _planning(self) -> str:
+        """Generate the player and monster PDDL files of every adventure"""
+        if not self.games:
+            return "skipped"
+        for game in self.games.values():
+            player = game.state.get_player()
+            player.agent.build_domain()
+            player.agent.build_problem()
+            monster = self._get_monster(game)
+            if monster:
+                monster.agent.build_domain()
+        return "done"
+
+    def _translate(self) -> str:
+        """Run Fast Downward on the player files, which loads the planner and
+        its translator from disk"""
+        if not self.games or not shutil.which("fast-downward.py"):
+            return "skipped"
+        for game in self.games.values():
+            if not game.state.get_player().agent.planner.build_plan():
+                logger.debug("Prewarm plan for %s was not found", game.adventure)
+        return "done"
+
+    def _get_monster(self, game) -> object:
+        """Method to return the first monster of the game, or None"""
+        for room in game.dm.adventure.world.rooms:
+            for monster_id in game.state.get_room_monster_ids(room):
+                return game.state.get_entity(monster_id)
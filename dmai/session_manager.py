@@ -0,0 +1,195 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from dmai.dmai_helpers import init
+from dmai.game.game_template import GameTemplate
+from dmai.ui.ui import UserInterface
+from dmai.utils.metrics import Metrics
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+ACTIVE_SESSIONS = Metrics.gauge("dmai_active_sessions", "Games held in memory by session managers")
+
+
+class SessionManager:
+    def __init__(self,
+                 root_path: str,
+                 capacity: int = 64,
+                 store_file: str = ":memory:",
+                 rasa_host: str = "localhost",
+                 rasa_port: int = 5005,
+                 template: GameTemplate = None) -> None:
+        """Class which keeps the most recently used games in memory, so
+        repeat requests for a session skip building the world.
+        Games evicted from memory are saved as snapshots in an SQLite store
+        and rebuilt transparently when their session is next requested.
+        New sessions are cloned from the template when one is given.
+        A game in use by a turn, see use, is never evicted."""
+        self.root_path = root_path
+        self.capacity = capacity
+        self.rasa_host = rasa_host
+        self.rasa_port = rasa_port
+        self.template = template
+        self.sessions = OrderedDict()
+        self.last_used = {}
+        self.in_use = {}
+        self.lock = threading.RLock()
+        self.store = sqlite3.connect(store_file, check_same_thread=False)
+        self.store.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (session_id TEXT PRIMARY KEY, snapshot BLOB NOT NULL, saved REAL NOT NULL)")
+        self.store.commit()
+
+    def __repr__(self) -> str:
+        return "{c} holding {n} sessions".format(c=self.__class__.__name__, n=len(self.sessions))
+
+    def __len__(self) -> int:
+        return len(self.sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.sessions
+
+    @contextmanager
+    def use(self, session_id: str = None) -> tuple:
+        """Method to hold the game for a session while a turn is played, e.g.
+        with manager.use(session_id) as (ui, session_id): ui.input(utter)
+        The game is not evicted until the turn is over."""
+        (ui, session_id) = self.get(session_id, acquire=True)
+        try:
+            yield (ui, session_id)
+        finally:
+            self.release(session_id)
+
+    def get(self, session_id: str = None, acquire: bool = False) -> tuple:
+        """Method to return the game for a session, from memory, from the
+        store or by starting a new game.
+        If acquire is True the game is marked in use until release is called.
+        Returns a tuple with (UserInterface, session_id)."""
+        with self.lock:
+            if session_id in self.sessions:
+                self.sessions.move_to_end(session_id)
+                self.last_used[session_id] = time.monotonic()
+                if acquire:
+                    self._acquire(session_id)
+                return (self.sessions[session_id], session_id)
+            snapshot = self._load_snapshot(session_id) if session_id else None
+
+        # build the game without holding the lock, other sessions are served
+        if snapshot:
+            logger.debug("(SESSION %s) Rehydrating session", session_id)
+        (ui, session_id) = init(self.root_path,
+                                rasa_host=self.rasa_host,
+                                rasa_port=self.rasa_port,
+                                saved_state=snapshot,
+                                session_id=session_id,
+                                template=self.template)
+
+        with self.lock:
+            # another request may have built the same session meanwhile
+            if session_id in self.sessions:
+                if acquire:
+                    self._acquire(session_id)
+                return (self.sessions[session_id], session_id)
+            if acquire:
+                self._acquire(session_id)
+            self._add(session_id, ui)
+            return (ui, session_id)
+
+    def _acquire(self, session_id: str) -> None:
+        """Method to mark a game in use"""
+        self.in_use[session_id] = self.in_use.get(session_id, 0) + 1
+
+    def release(self, session_id: str) -> None:
+        """Method to mark the end of a turn on a game from get with acquire,
+        evicting the games which were kept over capacity while in use"""
+        with self.lock:
+            count = self.in_use.get(session_id, 0) - 1
+            if count > 0:
+                self.in_use[session_id] = count
+            else:
+                self.in_use.pop(session_id, None)
+            self._trim()
+
+    def _add(self, session_id: str, ui: UserInterface) -> None:
+        """Method to add a game to memory, evicting the least recently used
+        games when over capacity"""
+        self.sessions[session_id] = ui
+        self.last_used[session_id] = time.monotonic()
+        ACTIVE_SESSIONS.inc()
+        self._trim()
+
+    def _trim(self) -> None:
+        """Method to evict the least recently used games which are not in
+        use until the games fit the capacity"""
+        idle = [s for s in self.sessions if s not in self.in_use]
+        for session_id in idle[:max(len(self.sessions) - self.capacity, 0)]:
+            self._evict(session_id)
+
+    def evict(self, session_id: str) -> bool:
+        """Method to save a game to the store and remove it from memory, a
+        game in use is not evicted.
+        Returns True if the game was evicted."""
+        with self.lock:
+            if session_id in self.in_use:
+                logger.debug("(SESSION %s) Not evicting session in use", session_id)
+                return False
+            return self._evict(session_id)
+
+    def _evict(self, session_id: str) -> bool:
+        """Method to save a game to the store and remove it from memory"""
+        ui = self.sessions.pop(session_id, None)
+        self.last_used.pop(session_id, None)
+        if not ui:
+            return False
+        ACTIVE_SESSIONS.dec()
+        logger.debug("(SESSION %s) Evicting session", session_id)
+        self._save_snapshot(session_id, ui.snapshot())
+        return True
+
+    def evict_idle(self, max_idle: float) -> int:
+        """Method to evict the games which have not been used for max_idle
+        seconds.
+        Returns the number of games evicted."""
+        with self.lock:
+            now = time.monotonic()
+            idle = [
+                s for s in self.sessions
+                if now - self.last_used[s] >= max_idle and s not in self.in_use
+            ]
+            for session_id in idle:
+                self._evict(session_id)
+            return len(idle)
+
+    def remove(self, session_id: str) -> None:
+        """Method to forget a session, e.g. when the game is over"""
+        with self.lock:
+            if self.sessions.pop(session_id, None):
+                ACTIVE_SESSIONS.dec()
+            self.last_used.pop(session_id, None)
+            self.store.execute("DELETE FROM sessions WHERE session_id = ?", (session_id, ))
+            self.store.commit()
+
+    def close(self) -> None:
+        """Method to save every game in memory and close the store, turns
+        should be over"""
+        with self.lock:
+            for session_id in list(self.sessions):
+                self._evict(session_id)
+            self.store.close()
+
+    def _save_snapshot(self, session_id: str, snapshot: bytes) -> None:
+        """Method to write a snapshot to the store"""
+        self.store.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, snapshot, saved) VALUES (?, ?, ?)",
+            (session_id, snapshot, time.time()))
+        self.store.commit()
+
+    def _load_snapshot(self, session_id: str) -> bytes:
+        """Method to read a snapshot from the store"""
+        row = self.store.execute(
+            "SELECT snapshot FROM sessions WHERE session_id = ?", (session_id, )).fetchone()
+        if row:
+            return bytes(row[0])
@@ -1,5 +1,6 @@
 from dmai.utils.output_builder import OutputBuilder
 from dmai.game.game import Game
+from dmai.game.delta import DeltaChain
 from dmai.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,7 +20,7 @@ class UserInterface:
         player and DM"""
         while True:
             output = self.game.output()
-            logger.info("(SESSION {s}) [DM]: {o}".format(s=self.game.state.session.session_id, o=output.replace("\n", "\\n")))
+            logger.info("(SESSION %s) [DM]: %s", self.game.state.session.session_id, output.replace("\n", "\\n"))
 
             if output:
                 prompt = "\n" + output + "\n"
@@ -34,18 +35,18 @@ class UserInterface:
                 prompt += "Press enter to continue... "
 
             user_input = input(prompt)
-            logger.info("(SESSION {s}) [PLAYER]: {i}".format(s=self.game.state.session.session_id, i=user_input.replace("\n", "\\n")))
+            logger.info("(SESSION %s) [PLAYER]: %s", self.game.state.session.session_id, user_input.replace("\n", "\\n"))
             self.game.input(user_input)
 
     def input(self, user_input: str) -> None:
         """Input the user input"""
-        logger.info("(SESSION {s}) [PLAYER]: {i}".format(s=self.game.state.session.session_id, i=user_input.replace("\n", "\\n")))
+        logger.info("(SESSION %s) [PLAYER]: %s", self.game.state.session.session_id, user_input.replace("\n", "\\n"))
         self.game.input(user_input)
     
     def output(self) -> str:
         """Return the DM output"""
         output = self.game.output()
-        logger.info("(SESSION {s}) [DM]: {o}".format(s=self.game.state.session.session_id, o=output.replace("\n", "\\n")))
+        logger.info("(SESSION %s) [DM]: %s", self.game.state.session.session_id, output.replace("\n", "\\n"))
 
         if output:
             prompt = "\n" + output + "\n"
@@ -66,6 +67,20 @@ class UserInterface:
         Returns a dict."""
         return self.game.state.save()
 
+    def snapshot(self) -> bytes:
+        """Method to save the game state.
+        Returns compact snapshot bytes which can be passed to dmai.init."""
+        return self.game.state.snapshot()
+
+    def save_delta(self) -> bytes:
+        """Method to save the changes to the game state since the last save.
+        Returns an encoded checkpoint or delta record to append to the stored
+        records, or None if nothing changed. The list of stored records can
+        be passed to dmai.init."""
+        record = self.game.tracker.commit()
+        if record:
+            return DeltaChain.encode(record)
+
     def character_sheet(self) -> str:
         """Method to return the character sheet in a string"""
         return self.game.state.get_player().get_character_sheet()
@@ -0,0 +1,144 @@
+import hashlib
+import os
+import pickle
+import struct
+import threading
+from glob import glob
+
+from dmai.utils.config import Config
+from dmai.utils.loader import Loader
+from dmai.utils.exceptions import BundleError
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Bundle:
+
+    # class variables
+    MAGIC = b"DMAB"
+    VERSION = 1
+    HEADER = struct.Struct(">4sB32s")
+    lock = threading.Lock()
+
+    def __init__(self, adventure: str, files: dict, content_hash: bytes = None) -> None:
+        """Class which is a precompiled adventure: the parsed adventure file
+        and the domain files it depends on, frozen and pickled into one
+        binary file with a content hash.
+        Files are keyed by their path relative to the root and hold a tuple
+        with (mtime, data), so a bundle is valid while no source changed."""
+        self.adventure = adventure
+        self.files = files
+        self.payload = pickle.dumps((adventure, files), protocol=pickle.HIGHEST_PROTOCOL)
+        self.hash = content_hash or hashlib.sha256(self.payload).digest()
+
+    def __repr__(self) -> str:
+        return "{c}: {a} ({h})".format(c=self.__class__.__name__, a=self.adventure, h=self.hash.hex()[:12])
+
+    @staticmethod
+    def get_path(adventure: str) -> str:
+        """Method to return the path of an adventure's bundle"""
+        return os.path.join(Config.directory.bundles, "{a}.bundle".format(a=adventure))
+
+    @staticmethod
+    def get_sources(adventure: str) -> dict:
+        """Method to return the source files of an adventure's bundle, by
+        path relative to the root"""
+        files = [Loader.adventure_file(adventure)]
+        files.extend(sorted(glob(os.path.join(Config.directory.domain, "*.json"))))
+        return {os.path.relpath(file, Config.directory.root): file for file in files}
+
+    @classmethod
+    def load(cls, adventure: str) -> "Bundle":
+        """Method to add an adventure's data to the Loader cache from its
+        bundle, compiling the bundle first if it is missing or stale.
+        Returns the bundle."""
+        with cls.lock:
+            try:
+                bundle = cls.read(adventure)
+                if bundle.is_current():
+                    bundle.install()
+                    return bundle
+                logger.debug("Bundle for %s is stale", adventure)
+            except FileNotFoundError:
+                pass
+            except BundleError as e:
+                logger.warning("Rebuilding bundle for %s: %s", adventure, e)
+            bundle = cls.compile(adventure)
+            bundle.write()
+            return bundle
+
+    @classmethod
+    def compile(cls, adventure: str) -> "Bundle":
+        """Method to parse the sources of an adventure into a bundle"""
+        logger.debug("Compiling bundle for %s", adventure)
+        files = {}
+        for (name, file) in cls.get_sources(adventure).items():
+            Loader.load_cached(file)
+            cached = Loader.get_cached(file)
+            if cached:
+                files[name] = cached
+        return cls(adventure, files)
+
+    @classmethod
+    def read(cls, adventure: str) -> "Bundle":
+        """Method to read an adventure's bundle with a single read.
+        Raises BundleError if the bundle is not valid."""
+        with open(cls.get_path(adventure), mode="rb") as f:
+            raw = f.read()
+        try:
+            (magic, version, content_hash) = cls.HEADER.unpack_from(raw)
+        except struct.error:
+            raise BundleError("Bundle is truncated")
+        if magic != cls.MAGIC:
+            raise BundleError("Not a bundle")
+        if version != cls.VERSION:
+            raise BundleError("Unsupported bundle version {v}".format(v=version))
+        payload = raw[cls.HEADER.size:]
+        if hashlib.sha256(payload).digest() != content_hash:
+            raise BundleError("Bundle content does not match its hash")
+        try:
+            (name, files) = pickle.loads(payload)
+        except Exception as e:
+            raise BundleError("Cannot unpickle bundle: {e}".format(e=e))
+        if name != adventure:
+            raise BundleError("Bundle is for adventure {n}".format(n=name))
+        bundle = cls.__new__(cls)
+        bundle.adventure = name
+        bundle.files = files
+        bundle.payload = payload
+        bundle.hash = content_hash
+        return bundle
+
+    def is_current(self) -> bool:
+        """Method to return whether the sources are the ones the bundle was
+        compiled from, by name and mtime"""
+        sources = self.get_sources(self.adventure)
+        if sources.keys() != self.files.keys():
+            return False
+        for (name, file) in sources.items():
+            try:
+                if os.stat(file).st_mtime_ns != self.files[name][0]:
+                    return False
+            except FileNotFoundError:
+                return False
+        return True
+
+    def install(self) -> None:
+        """Method to add the bundled data to the Loader cache"""
+        for (name, (mtime, json_data)) in self.files.items():
+            Loader.add_cached(os.path.join(Config.directory.root, name), mtime, json_data)
+
+    def write(self) -> None:
+        """Method to write the bundle, replacing the old one atomically.
+        The data is already in the Loader cache, so a failed write only
+        costs the next process a compile."""
+        path = self.get_path(self.adventure)
+        temp = "{p}.{i}.tmp".format(p=path, i=os.getpid())
+        try:
+            with open(temp, mode="wb") as f:
+                f.write(self.HEADER.pack(self.MAGIC, self.VERSION, self.hash))
+                f.write(self.payload)
+            os.replace(temp, path)
+        except OSError as e:
+            logger.warning("Cannot write bundle %s: %s", path, e)
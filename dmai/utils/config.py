@@ -1,3 +1,4 @@
+import logging
 import os
 from pathlib import Path
 
@@ -65,6 +66,24 @@ class Config(metaclass=ConfigMeta):
                 Path(path).mkdir(parents=True, exist_ok=True)
             return path
 
+        @property
+        def bundles(self) -> str:
+            path = os.path.join(self.output, "bundles")
+            if not os.path.exists(path):
+                Path(path).mkdir(parents=True, exist_ok=True)
+            return path
+
+        @property
+        def profiles(self) -> str:
+            path = os.path.join(self.output, "profiles")
+            if not os.path.exists(path):
+                Path(path).mkdir(parents=True, exist_ok=True)
+            return path
+
+        @property
+        def models(self) -> str:
+            return os.path.join(self.root, "models")
+
         @property
         def test(self) -> str:
             return os.path.join(self.root, "tests")
@@ -99,6 +118,90 @@ class Config(metaclass=ConfigMeta):
         def set_monster(cls, agent: str) -> None:
             cls.monster = agent
 
+    ################################################################
+    class NLU(object):
+        backend = "server"
+        model = "dmai_nlu.tar.gz"
+        batch_size = 16
+        batch_window = 0.005
+        # seconds to wait for the embedded interpreter to parse a message
+        parse_timeout = 10.0
+
+        @classmethod
+        def set_backend(cls, backend: str) -> None:
+            cls.backend = backend
+
+        @classmethod
+        def set_model(cls, model: str) -> None:
+            cls.model = model
+
+        @classmethod
+        def set_parse_timeout(cls, parse_timeout: float) -> None:
+            cls.parse_timeout = parse_timeout
+
+    ################################################################
+    class Logging(object):
+        file = "dmai.log"
+        stream_level = "WARNING"
+        # levels by subsystem, i.e. by logger name, a subsystem without a
+        # level uses the level of its parent
+        levels = {"dmai": "DEBUG"}
+
+        @classmethod
+        def set_file(cls, file: str) -> None:
+            cls.file = file
+
+        @classmethod
+        def set_stream_level(cls, level: str) -> None:
+            """Method to set the level of records printed to stderr, the log
+            file holds every record"""
+            cls.stream_level = level.upper()
+
+        @classmethod
+        def set_level(cls, subsystem: str, level: str) -> None:
+            """Method to set the level of a subsystem, e.g.
+            set_level("dmai.nlu", "info")"""
+            logging.getLogger(subsystem).setLevel(level.upper())
+            cls.levels[subsystem] = level.upper()
+
+        @classmethod
+        def set_levels(cls, levels: str) -> None:
+            """Method to set the levels of several subsystems from a
+            comma separated string, e.g. dmai.nlu=info,dmai.game=warning"""
+            for level in filter(None, levels.split(",")):
+                (subsystem, _, level) = level.partition("=")
+                if not level:
+                    raise ValueError("Cannot set log level {l} - expected subsystem=level".format(l=subsystem))
+                cls.set_level(subsystem.strip(), level.strip())
+
+    ################################################################
+    class Tracing(object):
+        # the oldest spans are dropped when more are recorded
+        max_spans = 100000
+
+        @classmethod
+        def set_max_spans(cls, max_spans: int) -> None:
+            cls.max_spans = max_spans
+
+    ################################################################
+    class Journal(object):
+        # the journal restarts from a checkpoint of the state when it holds
+        # this many events, so a long session's journal stays bounded
+        max_events = 200
+
+        @classmethod
+        def set_max_events(cls, max_events: int) -> None:
+            cls.max_events = max_events
+
+    ################################################################
+    class Profiling(object):
+        # seconds between stack samples in sampling mode
+        interval = 0.001
+
+        @classmethod
+        def set_interval(cls, interval: float) -> None:
+            cls.interval = interval
+
     ################################################################
     # class variables
     cleanup = False
@@ -108,6 +211,11 @@ class Config(metaclass=ConfigMeta):
     directory = Directories()
     agent = Agents()
     planner = Planners()
+    nlu = NLU()
+    logging = Logging()
+    tracing = Tracing()
+    journal = Journal()
+    profiling = Profiling()
 
     @classmethod
     def set_root(cls, root: str) -> None:
@@ -1,4 +1,5 @@
 import random
+import threading
 
 from dmai.utils.exceptions import DiceFormatError
 
@@ -26,6 +27,8 @@ class DiceRoller(metaclass=DiceRollerMeta):
         "d20": 20,
         "d100": 100
     }
+    # the journal of the game turn running on each thread
+    context = threading.local()
 
     def __init__(self) -> None:
         """DiceRoller static class"""
@@ -73,6 +76,24 @@ class DiceRoller(metaclass=DiceRollerMeta):
             raise DiceFormatError(msg)
 
 
+    @classmethod
+    def set_journal(cls, journal) -> None:
+        """Method to record or replay the rolls made on this thread"""
+        cls.context.journal = journal
+
+    @classmethod
+    def get_journal(cls):
+        """Method to return the journal for rolls made on this thread"""
+        return getattr(cls.context, "journal", None)
+
+    @classmethod
+    def _randint(cls, max_val: int) -> int:
+        """Method to draw a random number between 1 and max_val"""
+        journal = cls.get_journal()
+        if journal:
+            return journal.draw("dice", random.randint, 1, max_val)
+        return random.randint(1, max_val)
+
     @classmethod
     def roll_die(cls, die: str, silent: bool = False) -> int:
         """Roll singular specified die"""
@@ -80,7 +101,7 @@ class DiceRoller(metaclass=DiceRollerMeta):
 
         try:
             max_val = cls.dice_map[die]
-            val = random.randint(1, max_val)
+            val = cls._randint(max_val)
             roll_str = ""
             if not silent:
                 roll_str = "Rolling {d}... {v}".format(d=die, v=val)
@@ -107,7 +128,7 @@ class DiceRoller(metaclass=DiceRollerMeta):
             elif max:
                 rolls = [max_val for _ in dice]
             else:
-                rolls = [random.randint(1, max_val) for _ in dice]
+                rolls = [cls._randint(max_val) for _ in dice]
             total_roll = sum(rolls) + modifier
             die = cls.construct_dice_spec_string(dice_spec)
             roll_str = ""
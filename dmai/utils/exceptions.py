@@ -72,4 +72,31 @@ class UnrecognisedItem(Exception):
         super().__init__(self.message)
 
     def __str__(self):
-        return f"{self.message}"
\ No newline at end of file
+        return f"{self.message}"
+
+class SnapshotError(Exception):
+    """Raised when a state snapshot cannot be encoded or decoded"""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f"{self.message}"
+
+class ReplayError(Exception):
+    """Raised when a recorded game journal cannot be replayed"""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f"{self.message}"
+
+class BundleError(Exception):
+    """Raised when a precompiled adventure bundle cannot be read"""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+    def __str__(self):
+        return f"{self.message}"
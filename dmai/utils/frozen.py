@@ -0,0 +1,91 @@
+import sys
+
+
+class FrozenDict(dict):
+    def __init__(self, *args, **kwargs) -> None:
+        """Class which is a read-only dict, for data shared by every session.
+        It compares, iterates and serialises like a dict, but any attempt to
+        change it raises TypeError.
+        A copy is a plain mutable dict owned by the caller."""
+        super().__init__(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return "{c}({d})".format(c=self.__class__.__name__, d=dict.__repr__(self))
+
+    def _readonly(self, *args, **kwargs) -> None:
+        raise TypeError("{c} is read-only".format(c=self.__class__.__name__))
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __ior__ = _readonly
+    clear = _readonly
+    pop = _readonly
+    popitem = _readonly
+    setdefault = _readonly
+    update = _readonly
+
+    def __copy__(self) -> dict:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict) -> dict:
+        return thaw(self)
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__, (dict(self), ))
+
+
+class FrozenList(list):
+    def __init__(self, *args) -> None:
+        """Class which is a read-only list, for data shared by every session.
+        It compares, iterates and serialises like a list, but any attempt to
+        change it raises TypeError.
+        A copy is a plain mutable list owned by the caller."""
+        super().__init__(*args)
+
+    def __repr__(self) -> str:
+        return "{c}({d})".format(c=self.__class__.__name__, d=list.__repr__(self))
+
+    def _readonly(self, *args, **kwargs) -> None:
+        raise TypeError("{c} is read-only".format(c=self.__class__.__name__))
+
+    __setitem__ = _readonly
+    __delitem__ = _readonly
+    __iadd__ = _readonly
+    __imul__ = _readonly
+    append = _readonly
+    clear = _readonly
+    extend = _readonly
+    insert = _readonly
+    pop = _readonly
+    remove = _readonly
+    reverse = _readonly
+    sort = _readonly
+
+    def __copy__(self) -> list:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict) -> list:
+        return thaw(self)
+
+    def __reduce__(self) -> tuple:
+        return (self.__class__, (list(self), ))
+
+
+def freeze(data: object) -> object:
+    """Function to return a read-only copy of JSON data"""
+    if isinstance(data, dict):
+        # keys repeat across records, so keep one copy of each
+        return FrozenDict((sys.intern(key), freeze(value)) for (key, value) in data.items())
+    if isinstance(data, list):
+        return FrozenList(freeze(value) for value in data)
+    return data
+
+
+def thaw(data: object) -> object:
+    """Function to return a mutable copy of JSON data, e.g. for an object
+    which modifies its own copy of shared data"""
+    if isinstance(data, dict):
+        return {key: thaw(value) for (key, value) in data.items()}
+    if isinstance(data, list):
+        return [thaw(value) for value in data]
+    return data
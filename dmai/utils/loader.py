@@ -1,7 +1,9 @@
 import json
 import os
+import threading
 
 from dmai.utils.config import Config
+from dmai.utils.frozen import FrozenDict, freeze
 from dmai.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,23 +21,77 @@ class LoaderMeta(type):
 
 
 class Loader(metaclass=LoaderMeta):
+
+    # class variables
+    # parsed files by path, with the mtime they were parsed at
+    cache = {}
+    lock = threading.Lock()
+
     def __init__(self) -> None:
         """Loader static class"""
         pass
 
     @staticmethod
-    def load_adventure(adventure: str) -> dict:
-        """Loads specified adventure data"""
+    def adventure_file(adventure: str) -> str:
+        """Returns the path of specified adventure's JSON file"""
         adventure = "{a}.json".format(a=adventure)
-        file = os.path.join(Config.directory.adventure, adventure)
-        return Loader.load_json(file)
+        return os.path.join(Config.directory.adventure, adventure)
 
     @staticmethod
-    def load_domain(domain: str) -> dict:
-        """Loads specified domain data"""
+    def domain_file(domain: str) -> str:
+        """Returns the path of specified domain's JSON file"""
         domain = "{d}.json".format(d=domain)
-        file = os.path.join(Config.directory.domain, domain)
-        return Loader.load_json(file)
+        return os.path.join(Config.directory.domain, domain)
+
+    @staticmethod
+    def load_adventure(adventure: str) -> dict:
+        """Loads specified adventure data, read-only"""
+        return Loader.load_cached(Loader.adventure_file(adventure))
+
+    @staticmethod
+    def load_domain(domain: str) -> dict:
+        """Loads specified domain data, read-only"""
+        return Loader.load_cached(Loader.domain_file(domain))
+
+    @classmethod
+    def load_cached(cls, file: str) -> dict:
+        """Loads a read-only data structure from JSON file.
+        Each file is parsed once per process and the same frozen data is
+        returned until the file's mtime changes."""
+        try:
+            mtime = os.stat(file).st_mtime_ns
+        except FileNotFoundError:
+            logger.error("%s does not exist!", file)
+            return FrozenDict()
+
+        with cls.lock:
+            cached = cls.cache.get(file)
+            if cached and cached[0] == mtime:
+                return cached[1]
+            logger.debug("Parsing %s", file)
+            json_data = freeze(Loader.load_json(file))
+            cls.cache[file] = (mtime, json_data)
+            return json_data
+
+    @classmethod
+    def get_cached(cls, file: str) -> tuple:
+        """Returns a tuple with (mtime, data) for a parsed file, or None if
+        it is not cached"""
+        with cls.lock:
+            return cls.cache.get(file)
+
+    @classmethod
+    def add_cached(cls, file: str, mtime: int, json_data: dict) -> None:
+        """Adds data parsed elsewhere, e.g. in a precompiled bundle, to the
+        cache"""
+        with cls.lock:
+            cls.cache[file] = (mtime, json_data)
+
+    @classmethod
+    def clear(cls) -> None:
+        """Method to forget the parsed files"""
+        with cls.lock:
+            cls.cache = {}
 
     @staticmethod
     def load_json(file: str) -> dict:
@@ -45,6 +101,6 @@ class Loader(metaclass=LoaderMeta):
             with open(file, mode="r") as f:
                 json_data = json.load(f)
         except FileNotFoundError:
-            logger.error("{f} does not exist!".format(f=file))
+            logger.error("%s does not exist!", file)
 
         return json_data
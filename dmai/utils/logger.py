@@ -1,25 +1,151 @@
+import atexit
 import logging
+import os
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+from dmai.utils.config import Config
+
+
+class LazyQueueHandler(QueueHandler):
+
+    # class variables
+    # argument types which cannot change after the log call
+    IMMUTABLE = (str, int, float, bool, type(None))
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Method to prepare a record for the queue.
+        A record whose arguments cannot change is put on the queue as is and
+        formatted by the writer thread, any other record is formatted now so
+        the log shows the arguments at the time of the call."""
+        args = record.args
+        if record.exc_info or not isinstance(args, tuple) or not all(isinstance(arg, self.IMMUTABLE) for arg in args):
+            return super().prepare(record)
+        return record
+
+
+class BufferedFileHandler(logging.FileHandler):
+    def __init__(self, filename: str) -> None:
+        """Class which is a log file handler that does not flush after every
+        record, the writer thread drains it when the queue is empty"""
+        # the log file is opened on the first record, not at import
+        super().__init__(filename, delay=True)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> None:
+        """Method to flush the written records to disk"""
+        super().flush()
+
+
+class BatchQueueListener(QueueListener):
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        """Method to return the next record, draining the buffered handlers
+        before waiting for one"""
+        if block and self.queue.empty():
+            for handler in self.handlers:
+                if isinstance(handler, BufferedFileHandler):
+                    handler.drain()
+        return self.queue.get(block)
+
+
+class LogPipeline:
+
+    # class variables
+    ROOT = "dmai"
+    FORMAT = "%(asctime)s.%(msecs)03d [%(levelname)s] %(message)s"
+    DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+    queue = None
+    listener = None
+    registered = False
+    lock = threading.Lock()
+
+    def __init__(self) -> None:
+        """Class which owns the one set of log handlers of the process.
+        Log calls put records on a queue and a background thread writes them
+        to stderr and the log file, so a call never waits on disk.
+        Config.logging is read when the pipeline starts, on the first
+        get_logger call."""
+        pass
+
+    @classmethod
+    def start(cls) -> None:
+        """Method to configure the handlers and start the writer thread,
+        only the first call has an effect"""
+        with cls.lock:
+            if cls.listener:
+                return
+
+            formatter = logging.Formatter(cls.FORMAT, datefmt=cls.DATE_FORMAT)
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(formatter)
+            stream_handler.setLevel(Config.logging.stream_level)
+            file_handler = BufferedFileHandler(Config.logging.file)
+            file_handler.setFormatter(formatter)
+            file_handler.setLevel(logging.DEBUG)
+
+            cls.queue = queue.SimpleQueue()
+            root = logging.getLogger(cls.ROOT)
+            root.addHandler(LazyQueueHandler(cls.queue))
+            root.propagate = False
+
+            levels = dict(Config.logging.levels)
+            if os.environ.get("DMAI_LOG_LEVELS"):
+                Config.logging.set_levels(os.environ["DMAI_LOG_LEVELS"])
+                levels = dict(Config.logging.levels)
+            for (subsystem, level) in levels.items():
+                logging.getLogger(subsystem).setLevel(level)
+
+            cls.listener = BatchQueueListener(cls.queue, stream_handler, file_handler, respect_handler_level=True)
+            cls.listener.start()
+            if not cls.registered:
+                atexit.register(cls.stop)
+                os.register_at_fork(after_in_child=cls._after_fork)
+                cls.registered = True
+
+    @classmethod
+    def stop(cls) -> None:
+        """Method to write the queued records and stop the writer thread"""
+        with cls.lock:
+            if not cls.listener:
+                return
+            cls.listener.stop()
+            for handler in cls.listener.handlers:
+                handler.close()
+            root = logging.getLogger(cls.ROOT)
+            for handler in list(root.handlers):
+                if isinstance(handler, LazyQueueHandler):
+                    root.removeHandler(handler)
+            cls.listener = None
+            cls.queue = None
+
+    @classmethod
+    def _after_fork(cls) -> None:
+        """Method to start a writer thread in a forked process, e.g. a server
+        worker, threads do not survive a fork"""
+        cls.lock = threading.Lock()
+        if cls.listener:
+            cls.listener = BatchQueueListener(cls.queue, *cls.listener.handlers, respect_handler_level=True)
+            cls.listener.start()
+
+    @classmethod
+    def flush(cls) -> None:
+        """Method to wait until the queued records are written"""
+        if cls.listener:
+            cls.stop()
+            cls.start()
 
 
 def get_logger(module_name: str) -> logging.Logger:
-    """Method to return the logger"""
-    log_name = "dmai.log"
-    logger = logging.getLogger(module_name)
-    stream_handler = logging.StreamHandler()
-    file_handler = logging.FileHandler(log_name)
-
-    formatter = logging.Formatter(
-        "%(asctime)s.%(msecs)03d [%(levelname)s] %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
-    stream_handler.setFormatter(formatter)
-    file_handler.setFormatter(formatter)
-
-    logger.addHandler(stream_handler)
-    logger.addHandler(file_handler)
-
-    logger.setLevel(logging.DEBUG)
-    stream_handler.setLevel(logging.WARNING)
-    file_handler.setLevel(logging.DEBUG)
-
-    return logger
+    """Method to return the logger of a module.
+    Every logger is a child of the dmai logger, which holds the handlers, so
+    the level of a subsystem can be set by its package name.
+    Log calls should pass arguments rather than a formatted string, e.g.
+    logger.debug("(SESSION %s) Moving %s", session_id, entity), they are only
+    formatted if the record is written."""
+    LogPipeline.start()
+    if module_name != LogPipeline.ROOT and not module_name.startswith(LogPipeline.ROOT + "."):
+        module_name = "{r}.{m}".format(r=LogPipeline.ROOT, m=module_name)
+    return logging.getLogger(module_name)
@@ -0,0 +1,293 @@
+import atexit
+import bisect
+import os
+import threading
+import time
+
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Metric:
+
+    # class variables
+    TYPE = None
+
+    def __init__(self, name: str, description: str, labels: tuple = ()) -> None:
+        """Metric abstract class, the values are kept by label values"""
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        return "{c}: {n}".format(c=self.__class__.__name__, n=self.name)
+
+    def _key(self, labels: dict) -> tuple:
+        """Method to return the label values in declared order.
+        Raises ValueError if the labels are not the declared ones."""
+        if len(labels) != len(self.labels) or not all(label in labels for label in self.labels):
+            raise ValueError("Cannot record {n} - expected labels {l}".format(n=self.name, l=", ".join(self.labels)))
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def _format_labels(self, key: tuple, extra: dict = None) -> str:
+        """Method to format label values for the text format"""
+        pairs = list(zip(self.labels, key))
+        if extra:
+            pairs.extend(extra.items())
+        if not pairs:
+            return ""
+        escaped = (
+            (label, value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n"))
+            for (label, value) in pairs
+        )
+        return "{{{p}}}".format(p=",".join("{l}=\"{v}\"".format(l=label, v=value) for (label, value) in escaped))
+
+    def render(self) -> list:
+        """Method to return the lines of the metric in Prometheus text format"""
+        lines = [
+            "# HELP {n} {d}".format(n=self.name, d=self.description),
+            "# TYPE {n} {t}".format(n=self.name, t=self.TYPE),
+        ]
+        with self.lock:
+            values = dict(self.values)
+        for (key, value) in sorted(values.items()):
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key: tuple, value: float) -> list:
+        return ["{n}{l} {v}".format(n=self.name, l=self._format_labels(key), v=_format_number(value))]
+
+    def get(self, **labels) -> float:
+        """Method to return the value for specified labels"""
+        with self.lock:
+            return self.values.get(self._key(labels), 0)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.values.clear()
+
+
+class Counter(Metric):
+
+    # class variables
+    TYPE = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Method to increase the counter"""
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+
+    # class variables
+    TYPE = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+
+    # class variables
+    TYPE = "histogram"
+    # latency buckets in seconds
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, name: str, description: str, labels: tuple = (), buckets: tuple = None) -> None:
+        """Class which counts observations in cumulative buckets and keeps
+        their sum, the values are [bucket counts, count, sum]"""
+        Metric.__init__(self, name, description, labels)
+        self.buckets = tuple(sorted(buckets or self.BUCKETS))
+
+    def observe(self, value: float, **labels) -> None:
+        """Method to record an observation"""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            if key not in self.values:
+                self.values[key] = [[0] * len(self.buckets), 0, 0]
+            observations = self.values[key]
+            if index < len(self.buckets):
+                observations[0][index] += 1
+            observations[1] += 1
+            observations[2] += value
+
+    def time(self, **labels) -> "Timer":
+        """Method to return a context manager which observes the seconds
+        spent in its block"""
+        return Timer(self, labels)
+
+    def get(self, **labels) -> int:
+        """Method to return the number of observations for specified labels"""
+        with self.lock:
+            observations = self.values.get(self._key(labels))
+        return observations[1] if observations else 0
+
+    def _render_value(self, key: tuple, value: list) -> list:
+        (counts, count, total) = value
+        lines = []
+        cumulative = 0
+        for (bound, bucket) in zip(self.buckets, counts):
+            cumulative += bucket
+            lines.append("{n}_bucket{l} {c}".format(
+                n=self.name, l=self._format_labels(key, {"le": _format_number(bound)}), c=cumulative))
+        lines.append("{n}_bucket{l} {c}".format(n=self.name, l=self._format_labels(key, {"le": "+Inf"}), c=count))
+        lines.append("{n}_sum{l} {s}".format(n=self.name, l=self._format_labels(key), s=_format_number(total)))
+        lines.append("{n}_count{l} {c}".format(n=self.name, l=self._format_labels(key), c=count))
+        return lines
+
+
+class Timer:
+
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: dict) -> None:
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self) -> "Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+
+
+class Metrics:
+
+    # class variables
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+    registry = {}
+    server = None
+    lock = threading.Lock()
+
+    def __init__(self) -> None:
+        """Class which holds every metric of the process.
+        Metrics are declared once by the module which records them, e.g.
+        TURNS = Metrics.counter("dmai_turns_total", "Turns processed"), and
+        exposed in Prometheus text format on a local port or as a file."""
+        pass
+
+    @classmethod
+    def _register(cls, metric_class: type, name: str, *args, **kwargs) -> Metric:
+        """Method to return the metric with specified name, adding it if new.
+        Raises ValueError if the name is used by another type of metric."""
+        with cls.lock:
+            metric = cls.registry.get(name)
+            if not metric:
+                metric = metric_class(name, *args, **kwargs)
+                cls.registry[name] = metric
+            elif not isinstance(metric, metric_class):
+                raise ValueError("Cannot register {n} - it is a {t}".format(n=name, t=metric.TYPE))
+            return metric
+
+    @classmethod
+    def counter(cls, name: str, description: str, labels: tuple = ()) -> Counter:
+        return cls._register(Counter, name, description, labels)
+
+    @classmethod
+    def gauge(cls, name: str, description: str, labels: tuple = ()) -> Gauge:
+        return cls._register(Gauge, name, description, labels)
+
+    @classmethod
+    def histogram(cls, name: str, description: str, labels: tuple = (), buckets: tuple = None) -> Histogram:
+        return cls._register(Histogram, name, description, labels, buckets)
+
+    @classmethod
+    def get(cls, name: str) -> Metric:
+        """Method to return a metric by name, or None"""
+        return cls.registry.get(name)
+
+    @classmethod
+    def reset(cls) -> None:
+        """Method to zero every metric"""
+        with cls.lock:
+            for metric in cls.registry.values():
+                metric.reset()
+
+    @classmethod
+    def render(cls) -> str:
+        """Method to return every metric in Prometheus text format"""
+        with cls.lock:
+            metrics = sorted(cls.registry.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    @classmethod
+    def dump(cls, file: str) -> None:
+        """Method to write every metric to a file, replacing it atomically so
+        a collector never reads a partial file"""
+        temp = "{f}.{i}.tmp".format(f=file, i=os.getpid())
+        with open(temp, "w") as f:
+            f.write(cls.render())
+        os.replace(temp, file)
+
+    @classmethod
+    def dump_at_exit(cls, file: str) -> None:
+        atexit.register(cls.dump, file)
+
+    @classmethod
+    def serve(cls, port: int, host: str = "127.0.0.1") -> object:
+        """Method to serve the metrics on a local port from a daemon thread,
+        only the first call starts a server.
+        Returns the server."""
+        # http.server is slow to import, only a served process needs it
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class MetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                """Method to serve the metrics in Prometheus text format"""
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = Metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", Metrics.CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug("Metrics request: " + format, *args)
+
+        with cls.lock:
+            if not cls.server:
+                cls.server = ThreadingHTTPServer((host, port), MetricsRequestHandler)
+                thread = threading.Thread(target=cls.server.serve_forever, name="dmai-metrics", daemon=True)
+                thread.start()
+                logger.info("Serving metrics on http://%s:%s/metrics", host, cls.server.server_address[1])
+            return cls.server
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Method to stop the metrics server"""
+        with cls.lock:
+            if cls.server:
+                cls.server.shutdown()
+                cls.server.server_close()
+                cls.server = None
+
+
+def _format_number(value: float) -> str:
+    """Function to format a number for the text format, ints without a
+    decimal point"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
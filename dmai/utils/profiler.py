@@ -0,0 +1,239 @@
+import atexit
+import cProfile
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+
+from dmai.utils.config import Config
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class NullProfile:
+
+    __slots__ = ()
+
+    def __enter__(self) -> "NullProfile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+class StackSampler:
+    def __init__(self, thread_id: int, interval: float) -> None:
+        """Class which samples the stack of a thread from a background thread
+        and counts each distinct stack, the counts are flamegraph collapsed
+        stacks"""
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="dmai-profiler", daemon=True)
+
+    def start(self) -> None:
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stopped.set()
+        self.thread.join()
+
+    def _run(self) -> None:
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame:
+                code = frame.f_code
+                stack.append("{f}:{n}".format(f=os.path.basename(code.co_filename), n=getattr(code, "co_qualname", code.co_name)))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+
+class ProfileRun:
+    def __init__(self, session_id: str, turns: int, mode: str) -> None:
+        """Class which is a profile of the next turns of a session, or of
+        every session if session_id is None.
+        Each turn is written to its own file and the turns are merged for
+        dump."""
+        self.session_id = session_id
+        self.turns = turns
+        self.mode = mode
+        self.profiled = 0
+        self.stopped = False
+        self.stacks = Counter()
+        self.stats = None
+        self.files = []
+
+    def __repr__(self) -> str:
+        return "{c}: {m} for {s}".format(c=self.__class__.__name__, m=self.mode, s=self.session_id or "all sessions")
+
+    @property
+    def finished(self) -> bool:
+        return self.stopped or (self.turns is not None and self.profiled >= self.turns)
+
+
+class TurnProfile:
+    def __init__(self, run: ProfileRun, session_id: str, turn: int) -> None:
+        """Class which profiles one turn, as a context manager"""
+        self.run = run
+        self.session_id = session_id
+        self.turn = turn
+        self.profiler = None
+
+    def __enter__(self) -> "TurnProfile":
+        if self.run.mode == "deterministic":
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError as e:
+                # only one cProfile can run at a time from python 3.12
+                logger.warning("(SESSION %s) Cannot profile turn %s: %s", self.session_id, self.turn, e)
+                self.profiler = None
+        else:
+            self.profiler = StackSampler(threading.get_ident(), Config.profiling.interval)
+            self.profiler.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if not self.profiler:
+            return
+        if self.run.mode == "deterministic":
+            self.profiler.disable()
+        else:
+            self.profiler.stop()
+        # the turn which stopped the run is not part of it
+        if self.run.stopped:
+            return
+        name = "{s}.turn{t}".format(s=Profiler.get_name(self.session_id), t=self.turn)
+        if self.run.mode == "deterministic":
+            file = Profiler.get_path("{n}.pstats".format(n=name))
+            self.profiler.dump_stats(file)
+            stats = pstats.Stats(self.profiler)
+        else:
+            file = Profiler.get_path("{n}.collapsed".format(n=name))
+            Profiler.write_collapsed(file, self.profiler.stacks)
+
+        # a run of every session is shared by their threads
+        with Profiler.lock:
+            if self.run.mode == "deterministic":
+                if self.run.stats:
+                    self.run.stats.add(stats)
+                else:
+                    self.run.stats = stats
+            else:
+                self.run.stacks.update(self.profiler.stacks)
+            self.run.files.append(file)
+            self.run.profiled += 1
+        if self.run.finished:
+            logger.info("Finished profiling %s after %s turns", self.run, self.run.profiled)
+
+
+class Profiler:
+
+    # class variables
+    MODES = ["sampling", "deterministic"]
+    NULL_PROFILE = NullProfile()
+    runs = {}
+    lock = threading.Lock()
+
+    def __init__(self) -> None:
+        """Class which profiles the turns of a session on demand, e.g. from
+        the /profile command, without restarting the process.
+        The sampling mode writes flamegraph collapsed stacks and is cheap
+        enough for a production session, the deterministic mode runs cProfile
+        and writes pstats files.
+        Files are written to the profiles output directory, one per turn."""
+        pass
+
+    @staticmethod
+    def get_path(name: str) -> str:
+        """Method to return the path of a profile file"""
+        return os.path.join(Config.directory.profiles, name)
+
+    @staticmethod
+    def get_name(session_id: str) -> str:
+        """Method to return the name of the profile files of a session, a
+        session without an id is named by the process and thread playing
+        it so concurrent games do not overwrite each other's files"""
+        if session_id:
+            return session_id
+        return "game-{p}-{t}".format(p=os.getpid(), t=threading.get_ident())
+
+    @classmethod
+    def start(cls, session_id: str = None, turns: int = None, mode: str = "sampling") -> ProfileRun:
+        """Method to profile the next turns of a session, or of every session
+        if session_id is None, until stopped if turns is None.
+        Raises ValueError if the mode is not supported."""
+        if mode not in cls.MODES:
+            raise ValueError("Cannot profile in {m} mode - it does not exist!".format(m=mode))
+        run = ProfileRun(session_id, turns, mode)
+        with cls.lock:
+            cls.runs[session_id] = run
+        logger.info("Started profiling %s", run)
+        return run
+
+    @classmethod
+    def stop(cls, session_id: str = None) -> ProfileRun:
+        """Method to stop profiling a session.
+        Returns the run, or None if the session was not being profiled."""
+        with cls.lock:
+            run = cls.runs.pop(session_id, None)
+        if run:
+            run.stopped = True
+            logger.info("Stopped profiling %s", run)
+        return run
+
+    @classmethod
+    def get_run(cls, session_id: str = None) -> ProfileRun:
+        """Method to return the run of a session, or None.
+        A finished run is kept until the next start or stop so it can be
+        dumped."""
+        return cls.runs.get(session_id) or cls.runs.get(None)
+
+    @classmethod
+    def turn(cls, session_id: str, turn: int) -> object:
+        """Method to return a context manager which profiles a turn if the
+        session is being profiled"""
+        if not cls.runs:
+            return cls.NULL_PROFILE
+        run = cls.get_run(session_id)
+        if not run or run.finished:
+            return cls.NULL_PROFILE
+        return TurnProfile(run, session_id, turn)
+
+    @classmethod
+    def dump(cls, run: ProfileRun) -> str:
+        """Method to write the merged profile of every turn of a run.
+        Returns the path of the file, or None if no turn was profiled."""
+        if not run.profiled:
+            return None
+        if run.session_id is None:
+            name = "sessions-{p}".format(p=os.getpid())
+        else:
+            name = cls.get_name(run.session_id)
+        with cls.lock:
+            if run.mode == "deterministic":
+                file = cls.get_path("{n}.pstats".format(n=name))
+                run.stats.dump_stats(file)
+            else:
+                file = cls.get_path("{n}.collapsed".format(n=name))
+                cls.write_collapsed(file, run.stacks)
+        logger.info("Wrote the profile of %s turns to %s", run.profiled, file)
+        return file
+
+    @classmethod
+    def dump_at_exit(cls, run: ProfileRun) -> None:
+        atexit.register(cls.dump, run)
+
+    @staticmethod
+    def write_collapsed(file: str, stacks: Counter) -> None:
+        """Method to write stacks in collapsed format, one "frame;frame count"
+        line per stack, as read by flamegraph.pl and speedscope"""
+        with open(file, "w") as f:
+            for (stack, count) in sorted(stacks.items()):
+                f.write("{s} {c}\n".format(s=stack, c=count))
@@ -10,6 +10,11 @@ class TextMeta(type):
 
 
 class Text(metaclass=TextMeta):
+
+    # class variables
+    # the inflect engine is slow to import, it is created on first use
+    inflect_engine = None
+
     def __init__(self) -> None:
         """Text static class"""
         pass
@@ -44,3 +49,11 @@ class Text(metaclass=TextMeta):
             values_str = "{a}".format(a=delimiter.join(values[0:-1]))
             values_str += "{l}{a}".format(l=last_delimiter, a=values[-1])
         return values_str
+
+    @classmethod
+    def plural(cls, word: str) -> str:
+        """Method to return the plural of a word"""
+        if not cls.inflect_engine:
+            import inflect
+            cls.inflect_engine = inflect.engine()
+        return cls.inflect_engine.plural(word)
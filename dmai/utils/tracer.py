@@ -0,0 +1,191 @@
+import atexit
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from dmai.utils.config import Config
+from dmai.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class NullSpan:
+
+    __slots__ = ()
+
+    def __enter__(self) -> "NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def tag(self, **tags) -> None:
+        pass
+
+
+class Span:
+
+    __slots__ = ("name", "id", "parent", "tags", "thread", "start", "end")
+
+    def __init__(self, name: str, span_id: int, parent: "Span", tags: dict) -> None:
+        """Class which is a timed stage of a turn.
+        The session id and turn of the parent span are inherited, so only
+        the turn span has to set them."""
+        self.name = name
+        self.id = span_id
+        self.parent = parent.id if parent else None
+        self.tags = dict(parent.tags) if parent else {}
+        self.tags.update(tags)
+        self.thread = threading.get_ident()
+        self.start = None
+        self.end = None
+
+    def __repr__(self) -> str:
+        return "{c}: {n}".format(c=self.__class__.__name__, n=self.name)
+
+    def __enter__(self) -> "Span":
+        Tracer.get_stack().append(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end = time.perf_counter_ns()
+        if exc_type:
+            self.tags["error"] = exc_type.__name__
+        Tracer.get_stack().pop()
+        Tracer.finish(self)
+
+    def tag(self, **tags) -> None:
+        """Method to add tags to the span"""
+        self.tags.update(tags)
+
+    @property
+    def duration(self) -> float:
+        """Duration in milliseconds"""
+        return (self.end - self.start) / 1e6
+
+    def to_json(self) -> dict:
+        """Method to return the span as a JSON line record"""
+        record = {
+            "name": self.name,
+            "id": self.id,
+            "parent": self.parent,
+            "start": (self.start + Tracer.EPOCH_OFFSET) / 1e9,
+            "duration_ms": round(self.duration, 4),
+            "thread": self.thread,
+        }
+        record.update(self.tags)
+        return record
+
+    def to_chrome(self) -> dict:
+        """Method to return the span as a Chrome trace complete event"""
+        return {
+            "name": self.name,
+            "cat": "dmai",
+            "ph": "X",
+            "ts": self.start / 1e3,
+            "dur": (self.end - self.start) / 1e3,
+            "pid": os.getpid(),
+            "tid": self.thread,
+            "args": self.tags,
+        }
+
+
+class Tracer:
+
+    # class variables
+    NULL_SPAN = NullSpan()
+    FORMATS = ["jsonl", "chrome"]
+    # converts perf_counter_ns to wall clock ns
+    EPOCH_OFFSET = time.time_ns() - time.perf_counter_ns()
+    enabled = False
+    spans = deque()
+    ids = itertools.count(1)
+    local = threading.local()
+    lock = threading.Lock()
+
+    def __init__(self) -> None:
+        """Class which records timed spans around the stages of a turn, e.g.
+        with Tracer.span("nlu.parse"): ...
+        Spans are kept in memory, up to Config.tracing.max_spans, and
+        exported as JSON lines or in Chrome trace format.
+        When tracing is disabled span returns a shared no-op span."""
+        pass
+
+    @classmethod
+    def enable(cls, file: str = None, trace_format: str = None) -> None:
+        """Method to start recording spans.
+        If a file is specified the spans are exported to it at exit."""
+        with cls.lock:
+            cls.spans = deque(cls.spans, maxlen=Config.tracing.max_spans)
+            cls.enabled = True
+        if file:
+            atexit.register(cls.export, file, trace_format)
+
+    @classmethod
+    def disable(cls) -> None:
+        """Method to stop recording spans, recorded spans are kept"""
+        cls.enabled = False
+
+    @classmethod
+    def clear(cls) -> None:
+        """Method to remove the recorded spans"""
+        with cls.lock:
+            cls.spans.clear()
+
+    @classmethod
+    def span(cls, name: str, **tags) -> Span:
+        """Method to return a span to use as a context manager, tags such as
+        session_id and turn are added to the span and its children"""
+        if not cls.enabled:
+            return cls.NULL_SPAN
+        stack = cls.get_stack()
+        return Span(name, next(cls.ids), stack[-1] if stack else None, tags)
+
+    @classmethod
+    def get_stack(cls) -> list:
+        """Method to return the open spans of the current thread"""
+        try:
+            return cls.local.stack
+        except AttributeError:
+            cls.local.stack = []
+            return cls.local.stack
+
+    @classmethod
+    def finish(cls, span: Span) -> None:
+        """Method to record a finished span"""
+        with cls.lock:
+            cls.spans.append(span)
+
+    @classmethod
+    def get_spans(cls, **tags) -> list:
+        """Method to return the recorded spans with specified tags, e.g.
+        get_spans(session_id="ABC", turn=3)"""
+        with cls.lock:
+            spans = list(cls.spans)
+        return [
+            span for span in spans
+            if all(span.tags.get(tag) == value for (tag, value) in tags.items())
+        ]
+
+    @classmethod
+    def export(cls, file: str, trace_format: str = None) -> None:
+        """Method to write the recorded spans to a file, as JSON lines or in
+        Chrome trace format, by default chosen by the file extension.
+        Raises ValueError if the format is not supported."""
+        if not trace_format:
+            trace_format = "chrome" if file.endswith(".json") else "jsonl"
+        if trace_format not in cls.FORMATS:
+            raise ValueError("Cannot export trace as {f} - it is not supported!".format(f=trace_format))
+        spans = cls.get_spans()
+        with open(file, "w") as f:
+            if trace_format == "chrome":
+                json.dump({"traceEvents": [span.to_chrome() for span in spans]}, f)
+            else:
+                for span in spans:
+                    f.write(json.dumps(span.to_json()))
+                    f.write("\n")
+        logger.debug("Exported %s spans to %s", len(spans), file)
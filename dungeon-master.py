@@ -3,6 +3,9 @@ import os
 
 import dmai
 from dmai.utils.config import Config
+from dmai.utils.tracer import Tracer
+from dmai.utils.metrics import Metrics
+from dmai.utils.profiler import Profiler
 from dmai.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -48,6 +51,30 @@ def build_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument("--no-monsters",
                         action="store_true",
                         help="Disable monsters")
+    parser.add_argument("--embedded-nlu",
+                        action="store_true",
+                        help="Load the Rasa NLU model into the game process")
+    parser.add_argument("--prewarm",
+                        action="store_true",
+                        help="Build every cache, report the time of each stage and exit")
+    parser.add_argument("--trace",
+                        metavar="FILE",
+                        help="Trace the stages of each turn, written at exit as Chrome trace (.json) or JSON lines")
+    parser.add_argument("--metrics-port",
+                        type=int,
+                        help="Serve metrics in Prometheus text format on a local port")
+    parser.add_argument("--metrics-file",
+                        help="Write metrics in Prometheus text format to a file at exit")
+    parser.add_argument("--profile",
+                        metavar="TURNS",
+                        type=int,
+                        help="Profile the first TURNS turns, written to output/profiles")
+    parser.add_argument("--profile-mode",
+                        choices=Profiler.MODES,
+                        default="sampling",
+                        help="Sample stacks as flamegraph collapsed stacks or run cProfile")
+    parser.add_argument("--log-levels",
+                        help="Set log levels by subsystem, e.g. dmai.nlu=info,dmai.game=warning")
     return parser
 
 
@@ -65,7 +92,28 @@ def main() -> None:
         Config.enable_god_mode()
     if args.no_monsters:
         Config.disable_monsters()
-        
+    if args.embedded_nlu:
+        Config.nlu.set_backend("embedded")
+    if args.log_levels:
+        Config.logging.set_levels(args.log_levels)
+    if args.trace:
+        Tracer.enable(args.trace)
+    if args.metrics_port:
+        Metrics.serve(args.metrics_port)
+    if args.metrics_file:
+        Metrics.dump_at_exit(args.metrics_file)
+    if args.profile:
+        Profiler.dump_at_exit(Profiler.start(turns=args.profile, mode=args.profile_mode))
+
+    # build the caches instead of playing
+    if args.prewarm:
+        report = dmai.prewarm()
+        for (stage, result) in report.items():
+            print("{s}: {r} in {t:.3f}s".format(s=stage, r=result["status"], t=result["seconds"]))
+        if any(result["status"] == "failed" for result in report.values()):
+            exit(1)
+        return
+
     # start the game
     char_class = None
     if args.cleric:
@@ -2,15 +2,126 @@ import unittest
 import sys
 import os
 import shutil
+import json
+import subprocess
+import tempfile
 
 p = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, p + "/../")
 
 from dmai.game.game import Game
+from dmai.prewarmer import Prewarmer
+from dmai.nlu.local_rasa_server import LocalRasaServer
 from dmai.utils.config import Config
+from dmai.utils.metrics import Metrics
 from dmai.utils.exceptions import UnrecognisedRoomError
 
 
+class TestStartup(unittest.TestCase):
+    """Test the startup time of the dmai package"""
+
+    # budgets in seconds, generous so slow CI machines pass
+    IMPORT_BUDGET = 0.25
+    START_BUDGET = 3.0
+    FIRST_TURN_BUDGET = 3.0
+    # modules which must only load on first use
+    LAZY_MODULES = ["requests", "inflect", "dmai.game.game", "dmai.dm", "dmai.nlu.rasa_adapter"]
+
+    BENCHMARK = """
+import json, sys, time
+start = time.perf_counter()
+import dmai
+imported = time.perf_counter()
+loaded = [m for m in {lazy} if m in sys.modules]
+game = dmai.start(char_class="fighter", char_name="Xena", skip_intro=True, rasa_port={port})
+started = time.perf_counter()
+game.input({utterance!r})
+print(json.dumps({{
+    "import": imported - start,
+    "start": started - imported,
+    "first_turn": time.perf_counter() - started,
+    "intent": (game.state.stored_intent or {{}}).get("intent"),
+    "loaded": loaded
+}}))
+"""
+
+    def benchmark(self, utterance: str = "", port: int = None) -> dict:
+        """Method to measure the import time, game start time and latency
+        of a first turn with specified utterance in a fresh process"""
+        result = subprocess.run(
+            [sys.executable, "-c", self.BENCHMARK.format(lazy=self.LAZY_MODULES, utterance=utterance, port=port)],
+            cwd=p + "/../",
+            capture_output=True,
+            text=True,
+            check=True)
+        return json.loads(result.stdout.splitlines()[-1])
+
+    def test_startup_budget(self) -> None:
+        timings = self.benchmark()
+        self.assertListEqual([], timings["loaded"])
+        self.assertLess(timings["import"], self.IMPORT_BUDGET)
+        self.assertLess(timings["start"], self.START_BUDGET)
+
+    @unittest.skipUnless(shutil.which("fast-downward.py"), "the first turn plans with Fast Downward")
+    def test_first_turn_budget(self) -> None:
+        # the turn is parsed by the local NLU stand-in, resolved by the move
+        # intent handler and runs the triggers and the planning agents
+        server = LocalRasaServer(port=0, nlu_file=p + "/../data/nlu.yml")
+        server.start()
+        try:
+            timings = self.benchmark("go to the cellar", server.address[1])
+        finally:
+            server.stop()
+        self.assertEqual("move", timings["intent"])
+        self.assertLess(timings["first_turn"], self.FIRST_TURN_BUDGET)
+
+    def test_lazy_exports(self) -> None:
+        import dmai
+        self.assertIn("SessionManager", dir(dmai))
+        self.assertTrue(callable(dmai.init))
+        with self.assertRaises(AttributeError):
+            dmai.not_a_name
+
+
+class TestPrewarmer(unittest.TestCase):
+    """Test the Prewarmer class"""
+
+    def setUp(self) -> None:
+        # write the caches under a temporary root which shares the inputs
+        self.root = Config.directory.root
+        self.directory = tempfile.mkdtemp()
+        for name in ["data", "adventures"]:
+            os.symlink(os.path.join(self.root, name), os.path.join(self.directory, name))
+        Config.set_root(self.directory)
+
+    def tearDown(self) -> None:
+        Config.set_root(self.root)
+        shutil.rmtree(self.directory)
+
+    def test_prewarm(self) -> None:
+        import dmai
+        report = dmai.prewarm()
+        self.assertListEqual(Prewarmer.STAGES, list(report))
+        for result in report.values():
+            self.assertIn(result["status"], ["done", "skipped"])
+            self.assertGreaterEqual(result["seconds"], 0)
+        self.assertTrue(Prewarmer.is_ready())
+        with open(Prewarmer.get_path()) as f:
+            readiness = json.load(f)
+        self.assertListEqual(["the_tomb_of_baradin_stormfury"], readiness["adventures"])
+        self.assertTrue(os.path.exists(os.path.join(Config.directory.planning, "prewarm.player.domain.pddl")))
+
+    def test_prewarm_failed_stage(self) -> None:
+        prewarmer = Prewarmer()
+        def fail() -> str:
+            raise OSError("disk full")
+        prewarmer._domain = fail
+        report = prewarmer.run()
+        self.assertEqual("failed", report["domain"]["status"])
+        self.assertEqual("done", report["game"]["status"])
+        self.assertFalse(Prewarmer.is_ready())
+
+
 class TestDM(unittest.TestCase):
     """Test the DM class"""
 
@@ -209,6 +320,21 @@ class TestDM(unittest.TestCase):
         self.assertEqual(False, self.dm.attack(nlu_entities=nlu_entities1))
         self.assertEqual(False, self.dm.attack(nlu_entities=nlu_entities2))
     
+    def test_attack_nlu_entities_unknown_monster(self) -> None:
+        self.game.state.set_current_room("player", "inns_cellar")
+        self.game.state.light_torch()
+        nlu_entities = [{"entity": "monster", "confidence": 1, "value": "giant_spider"}]
+        self.assertEqual(False, self.dm.attack(nlu_entities=nlu_entities))
+        self.assertFalse(self.game.state.in_combat)
+        self.assertIn("You could attack Giant Rat 1 or Giant Rat 2", self.game.output_builder.format())
+
+    def test_move_nlu_entities_unknown(self) -> None:
+        self.game.state.quest()
+        for value in ["inn", "eastern_corridor"]:
+            nlu_entities = [{"entity": "location", "confidence": 1, "value": value}]
+            self.assertEqual(False, self.dm.move(nlu_entities=nlu_entities))
+        self.assertEqual("stout_meal_inn", self.game.state.get_current_room_id())
+
     def test_attack_nlu_entities_door_good(self) -> None:
         self.game.state.set_current_room("player", "antechamber")
         nlu_entities1 = [
@@ -347,6 +473,17 @@ class TestDM(unittest.TestCase):
         self.dm.affirm()
         self.assertEqual(True, self.game.state.questing)
 
+    def test_affirm_suggested_next_move_one_turn(self) -> None:
+        self.game.state.set_current_room("player", "stout_meal_inn")
+        self.game.state.suggested_next_move = {"utter": "go to the inn", "state": True}
+        nlu_entities = [{"entity": "location", "confidence": 1, "value": "stout_meal_inn"}]
+        self.dm.nlu.process_player_utterance = lambda utter: ("move", {"nlu_entities": nlu_entities})
+        turns = Metrics.get("dmai_turns_total").get()
+        timed = Metrics.get("dmai_turn_seconds").get()
+        self.dm.input("yes", intent="affirm")
+        self.assertEqual(turns + 1, Metrics.get("dmai_turns_total").get())
+        self.assertEqual(timed + 1, Metrics.get("dmai_turn_seconds").get())
+
     def test_deny_gameover(self) -> None:
         self.game.state.roleplay("corvus")
         self.game.state.received_quest()
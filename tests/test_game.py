@@ -3,12 +3,18 @@ import unittest
 import sys
 import os
 import pickle
+import json
+import time
+import tempfile
+import threading
+from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
 
 p = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, p + "/../")
 
 import dmai
-from dmai.game.state import State
+from dmai.game.state import State, Status, Combat, SNAPSHOT_CODEC
 from dmai.utils.output_builder import OutputBuilder
 from dmai.game.npcs.npc import NPC
 from dmai.domain.monsters.monster_collection import MonsterCollection
@@ -16,7 +22,21 @@ from dmai.domain.monsters.skeleton import Skeleton
 from dmai.game.adventure import Adventure
 from dmai.game.game import Game
 from dmai.game.npcs.npc_collection import NPCCollection
-from dmai.utils.exceptions import UnrecognisedEntityError, UnrecognisedRoomError, RoomConnectionError
+from dmai.game.delta import DeltaTracker, DeltaChain
+from dmai.game.entity_table import EntityTable, ColumnMapping, IntColumn, CodeColumn
+from dmai.game.journal import Journal
+from dmai.game.replay import Replay
+from dmai.game.world.world import World
+from dmai.nlu.local_rasa_server import LocalRasaServer
+from dmai.utils.dice_roller import DiceRoller
+from dmai.utils.bundle import Bundle
+from dmai.utils.frozen import FrozenDict, FrozenList, freeze, thaw
+from dmai.utils.loader import Loader
+from dmai.utils.config import Config
+from dmai.utils.tracer import Tracer
+from dmai.utils.metrics import Metrics
+from dmai.utils.profiler import Profiler
+from dmai.utils.exceptions import UnrecognisedEntityError, UnrecognisedRoomError, RoomConnectionError, SnapshotError, ReplayError, BundleError
 
 
 class TestGame(unittest.TestCase):
@@ -32,6 +52,45 @@ class TestGame(unittest.TestCase):
         self.assertEqual("antechamber", ui.game.state.get_current_room_id())
         self.assertEqual(session_id, session_id2)
 
+    def test_saving_and_loading_snapshot(self) -> None:
+        (ui, session_id) = dmai.init(".")
+        ui.game.state.set_current_room("player", "antechamber")
+        snapshot = ui.snapshot()
+        self.assertEqual("antechamber", ui.game.state.get_current_room_id())
+        (ui, session_id2) = dmai.init(".", session_id=session_id, saved_state=snapshot)
+        self.assertEqual("antechamber", ui.game.state.get_current_room_id())
+        self.assertEqual(session_id, session_id2)
+
+    def test_trace_turn(self) -> None:
+        (ui, session_id) = dmai.init(".")
+        Tracer.enable()
+        try:
+            ui.input("")
+            ui.input("")
+        finally:
+            Tracer.disable()
+        spans = Tracer.get_spans(session_id=session_id)
+        Tracer.clear()
+        self.assertListEqual(["turn", "turn"], [span.name for span in spans])
+        self.assertListEqual([1, 2], [span.tags["turn"] for span in spans])
+
+    def test_profile_command(self) -> None:
+        game = dmai.start(char_class="fighter", char_name="Xena", skip_intro=True, session_id="PROFILE")
+        root = Config.directory.root
+        with tempfile.TemporaryDirectory() as directory:
+            Config.set_root(directory)
+            try:
+                game.input("/profile start 1")
+                self.assertIn("Profiling the next 1 turns", game.output())
+                game.input("/help")
+                self.assertIn("/profile", game.output())
+                game.input("/profile dump")
+                self.assertIn("PROFILE.collapsed", game.output())
+                self.assertTrue(os.path.exists(Profiler.get_path("PROFILE.turn2.collapsed")))
+            finally:
+                Profiler.stop("PROFILE")
+                Config.set_root(root)
+
     def test_continue_after_load(self) -> None:
         # 1st input
         (ui, session_id) = dmai.init(".")
@@ -69,6 +128,310 @@ class TestGame(unittest.TestCase):
         (ui, session_id) = dmai.init(".", session_id=session_id, saved_state=loaded_state)
         self.assertEqual("Xena", ui.game.state.char_name)
 
+
+class TestSessionManager(unittest.TestCase):
+    """Test the SessionManager class"""
+    def setUp(self) -> None:
+        self.manager = dmai.SessionManager(".", capacity=2)
+
+    def tearDown(self) -> None:
+        self.manager.close()
+
+    def test_get_cached(self) -> None:
+        (ui, session_id) = self.manager.get()
+        self.assertIn(session_id, self.manager)
+        (ui2, session_id2) = self.manager.get(session_id)
+        self.assertIs(ui, ui2)
+        self.assertEqual(session_id, session_id2)
+
+    def test_evict_and_rehydrate(self) -> None:
+        (ui, session_id) = self.manager.get()
+        ui.game.state.set_current_room("player", "antechamber")
+        self.manager.get()
+        self.manager.get()
+        self.assertEqual(2, len(self.manager))
+        self.assertNotIn(session_id, self.manager)
+        (ui2, session_id2) = self.manager.get(session_id)
+        self.assertIsNot(ui, ui2)
+        self.assertEqual(session_id, session_id2)
+        self.assertEqual("antechamber", ui2.game.state.get_current_room_id())
+        self.assertEqual(session_id, ui2.game.state.session.session_id)
+
+    def test_in_use_not_evicted(self) -> None:
+        started = threading.Event()
+        finish = threading.Event()
+        used = []
+
+        def play() -> None:
+            with self.manager.use() as (ui, session_id):
+                used.append(session_id)
+                started.set()
+                finish.wait()
+                ui.game.state.set_current_room("player", "antechamber")
+
+        thread = threading.Thread(target=play)
+        thread.start()
+        started.wait()
+        session_id = used[0]
+        (_, session_id2) = self.manager.get()
+        self.manager.get()
+        # the idle session is evicted in place of the older one in use
+        self.assertIn(session_id, self.manager)
+        self.assertNotIn(session_id2, self.manager)
+        self.assertFalse(self.manager.evict(session_id))
+        self.assertEqual(1, self.manager.evict_idle(0))
+        finish.set()
+        thread.join()
+        self.assertTrue(self.manager.evict(session_id))
+        (ui, session_id) = self.manager.get(session_id)
+        self.assertEqual("antechamber", ui.game.state.get_current_room_id())
+
+    def test_active_sessions(self) -> None:
+        active = Metrics.get("dmai_active_sessions").get()
+        (ui, session_id) = self.manager.get()
+        self.assertEqual(active + 1, Metrics.get("dmai_active_sessions").get())
+        self.manager.remove(session_id)
+        self.assertEqual(active, Metrics.get("dmai_active_sessions").get())
+
+    def test_evict_idle(self) -> None:
+        self.manager.get()
+        self.manager.get()
+        self.assertEqual(0, self.manager.evict_idle(60))
+        self.assertEqual(2, self.manager.evict_idle(0))
+        self.assertEqual(0, len(self.manager))
+
+    def test_store_file(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            store_file = os.path.join(directory, "sessions.db")
+            manager = dmai.SessionManager(".", store_file=store_file)
+            (ui, session_id) = manager.get()
+            ui.game.state.light_torch()
+            manager.close()
+            manager = dmai.SessionManager(".", store_file=store_file)
+            (ui, session_id) = manager.get(session_id)
+            self.assertTrue(ui.game.state.torch_lit)
+            manager.remove(session_id)
+            (ui, session_id) = manager.get(session_id)
+            self.assertFalse(ui.game.state.torch_lit)
+            manager.close()
+
+
+class TestGameTemplate(unittest.TestCase):
+    """Test the GameTemplate class"""
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.template = dmai.GameTemplate(char_class="fighter")
+
+    def test_new_game(self) -> None:
+        game = self.template.new_game("CLONE1", rasa_port=6001)
+        fresh = Game(char_class="fighter", session_id="CLONE1")
+        fresh.load()
+        self.assertEqual(fresh.state.save(), game.state.save())
+        self.assertEqual("CLONE1", game.state.session.session_id)
+        self.assertIs(game.state.session, game.dm.npcs.state.session)
+        self.assertTrue(game.nlu.endpoint.endswith(":6001/model/parse"))
+        self.assertIs(game.state, game.dm.state)
+        self.assertIs(game.player, game.state.get_player())
+
+    def test_games_are_isolated(self) -> None:
+        game1 = self.template.new_game("CLONE1")
+        game2 = self.template.new_game("CLONE2")
+        game1.state.set_current_room("player", "antechamber")
+        self.assertEqual("stout_meal_inn", game2.state.get_current_room_id())
+        self.assertEqual("CLONE2", game2.state.session.session_id)
+        self.assertIsNot(game1.dm.npcs.get_monster("giant_rat_1"), game2.dm.npcs.get_monster("giant_rat_1"))
+
+    def test_init(self) -> None:
+        (ui, session_id) = dmai.init(".", template=self.template)
+        self.assertEqual(session_id, ui.game.state.session.session_id)
+        self.assertIn("Welcome to the Dungeon Master AI!", ui.game.output_builder.format())
+
+    def test_faster_than_load(self) -> None:
+        start = time.perf_counter()
+        for _ in range(5):
+            Game(char_class="fighter").load()
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(5):
+            self.template.new_game()
+        self.assertLess(time.perf_counter() - start, load_time)
+
+
+class TestSessionIsolation(unittest.TestCase):
+    """Test running several games in one process"""
+    ROOMS = ["stout_meal_inn", "inns_cellar", "antechamber", "western_corridor"]
+
+    def play(self, i: int) -> tuple:
+        game = dmai.start(char_class="fighter",
+                          char_name="Xena",
+                          session_id="SESSION{i}".format(i=i),
+                          rasa_port=6000 + i)
+        room = self.ROOMS[i % len(self.ROOMS)]
+        game.state.set_current_room("player", room)
+        rat = game.dm.npcs.get_monster_id("giant_rat")
+        hp = game.state.get_current_hp(rat) - i % 2
+        game.state.take_damage(i % 2, "player", rat)
+        game.player.damage_roll()
+        return (game, room, rat, hp)
+
+    def test_concurrent_games(self) -> None:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self.play, range(16)))
+
+        for (i, (game, room, rat, hp)) in enumerate(results):
+            session_id = "SESSION{i}".format(i=i)
+            self.assertEqual(session_id, game.state.session.session_id)
+            self.assertEqual(session_id, game.dm.npcs.state.session.session_id)
+            self.assertTrue(game.nlu.endpoint.endswith(":{p}/model/parse".format(p=6000 + i)))
+            self.assertEqual(room, game.state.get_current_room_id())
+            self.assertEqual(hp, game.state.get_current_hp(rat))
+            self.assertNotIn("mod", game.player.character.weapons.get_damage_dice("greataxe"))
+        (game0, game1) = (results[0][0], results[1][0])
+        self.assertIs(game0.dm.adventure.world, game1.dm.adventure.world)
+        self.assertIsNot(game0.state.room_treasure_map, game1.state.room_treasure_map)
+        self.assertIsNot(game0.dm.npcs.get_monster(results[0][2]).senses,
+                         game1.dm.npcs.get_monster(results[1][2]).senses)
+
+
+class TestWorld(unittest.TestCase):
+    """Test the World class"""
+    def setUp(self) -> None:
+        self.game0 = Game(char_class="fighter", char_name="Xena", session_id="SESSION0")
+        self.game0.load()
+        self.game1 = Game(char_class="fighter", char_name="Xena", session_id="SESSION1")
+        self.game1.load()
+
+    def test_get_world(self) -> None:
+        world = World.get_world("the_tomb_of_baradin_stormfury")
+        self.assertIs(world, self.game0.dm.adventure.world)
+        self.assertIs(world, self.game1.dm.adventure.world)
+        self.assertIn("stout_meal_inn", world.rooms)
+
+    def test_rooms_share_definition(self) -> None:
+        room0 = self.game0.dm.adventure.get_room("burial_chamber")
+        room1 = self.game1.dm.adventure.get_room("burial_chamber")
+        self.assertIsNot(room0, room1)
+        self.assertIs(room0.definition, room1.definition)
+        self.assertIs(room0.text, room1.text)
+        self.assertIs(room0.puzzles.get_puzzle("vault").definition,
+                      room1.puzzles.get_puzzle("vault").definition)
+        self.assertEqual("Burial Chamber", room0.name)
+        self.assertIsNot(room0.trigger_map["enter"], room1.trigger_map["enter"])
+
+    def test_definition_is_read_only(self) -> None:
+        room = self.game0.dm.adventure.get_room("burial_chamber")
+        with self.assertRaises(TypeError):
+            room.definition["name"] = "Tomb"
+        with self.assertRaises(TypeError):
+            room.text["enter"]["text"] = "Tomb"
+
+    def test_progress_is_per_session(self) -> None:
+        self.game0.dm.adventure.get_room("inns_cellar").took_item("potion_of_healing")
+        self.game0.state.unlock_door("dungeon_entrance", "western_corridor")
+        self.assertTrue(self.game1.dm.adventure.get_room("inns_cellar").has_item("potion_of_healing"))
+        self.assertFalse(self.game1.state.travel_allowed("dungeon_entrance", "western_corridor"))
+        world = self.game0.dm.adventure.world
+        self.assertIn("potion_of_healing", world.rooms["inns_cellar"]["treasure"])
+        self.assertTrue(world.rooms["dungeon_entrance"]["connections"]["western_corridor"]["locked"])
+
+    def test_pickle_shares_world(self) -> None:
+        clone = pickle.loads(pickle.dumps(self.game0))
+        self.assertIs(clone.dm.adventure.world, self.game0.dm.adventure.world)
+        self.assertIs(self.game0.dm.adventure.get_room("burial_chamber").definition,
+                      clone.dm.adventure.get_room("burial_chamber").definition)
+
+
+class TestLoader(unittest.TestCase):
+    """Test the Loader class"""
+    def test_load_domain_is_cached(self) -> None:
+        skills = Loader.load_domain("skills")
+        self.assertIs(skills, Loader.load_domain("skills"))
+        self.assertIsInstance(skills, dict)
+        self.assertEqual("dex", skills["acrobatics"]["ability"])
+
+    def test_data_is_read_only(self) -> None:
+        weapons = Loader.load_domain("weapons")
+        with self.assertRaises(TypeError):
+            weapons["dagger"] = {}
+        with self.assertRaises(TypeError):
+            weapons["dagger"]["properties"].append("heavy")
+        with self.assertRaises(TypeError):
+            weapons.update({})
+
+    def test_copy_is_mutable(self) -> None:
+        weapons = Loader.load_domain("weapons")
+        club = deepcopy(weapons["dagger"])
+        club["properties"].append("heavy")
+        self.assertNotIn("heavy", weapons["dagger"]["properties"])
+        self.assertEqual(weapons["dagger"], thaw(weapons["dagger"]))
+
+    def test_pickle(self) -> None:
+        data = freeze({"a": [1, {"b": 2}]})
+        clone = pickle.loads(pickle.dumps(data))
+        self.assertIsInstance(clone, FrozenDict)
+        self.assertIsInstance(clone["a"], FrozenList)
+        self.assertEqual(data, clone)
+
+    def test_reload_on_mtime_change(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "data.json")
+            with open(file, "w") as f:
+                json.dump({"version": 1}, f)
+            os.utime(file, ns=(1, 1))
+            data = Loader.load_cached(file)
+            self.assertIs(data, Loader.load_cached(file))
+            with open(file, "w") as f:
+                json.dump({"version": 2}, f)
+            os.utime(file, ns=(2, 2))
+            self.assertEqual(2, Loader.load_cached(file)["version"])
+
+    def test_items_do_not_change_shared_data(self) -> None:
+        game = Game(char_class="fighter", char_name="Xena", session_id="SESSION0")
+        game.load()
+        items = game.state.player.character.items
+        self.assertTrue(items.add_item("bag", item_data={"id": "bag", "name": "Bag", "type": "item"}))
+        self.assertIn("silver_key", items.item_data)
+        self.assertIn("bag", items.item_data)
+        magic_items = Loader.load_domain("magic_items")
+        self.assertNotIn("silver_key", magic_items)
+        self.assertNotIn("bag", magic_items)
+
+
+class TestBundle(unittest.TestCase):
+    """Test the Bundle class"""
+    def setUp(self) -> None:
+        self.adventure = "the_tomb_of_baradin_stormfury"
+        self.bundle = Bundle.load(self.adventure)
+
+    def test_read(self) -> None:
+        bundle = Bundle.read(self.adventure)
+        self.assertEqual(self.bundle.hash, bundle.hash)
+        self.assertTrue(bundle.is_current())
+        self.assertIn(os.path.join("data", "domain", "monsters.json"), bundle.files)
+        self.assertIn(os.path.join("adventures", "the_tomb_of_baradin_stormfury.json"), bundle.files)
+
+    def test_install(self) -> None:
+        Loader.clear()
+        Bundle.read(self.adventure).install()
+        (mtime, skills) = Loader.get_cached(Loader.domain_file("skills"))
+        self.assertIsInstance(skills, FrozenDict)
+        self.assertIs(skills, Loader.load_domain("skills"))
+
+    def test_stale(self) -> None:
+        bundle = Bundle.read(self.adventure)
+        name = os.path.join("data", "domain", "skills.json")
+        bundle.files[name] = (0, bundle.files[name][1])
+        self.assertFalse(bundle.is_current())
+
+    def test_rebuild_corrupt_bundle(self) -> None:
+        with open(Bundle.get_path(self.adventure), "wb") as f:
+            f.write(b"DMAB\x01" + bytes(32) + b"garbage")
+        with self.assertRaises(BundleError):
+            Bundle.read(self.adventure)
+        bundle = Bundle.load(self.adventure)
+        self.assertEqual(bundle.hash, Bundle.read(self.adventure).hash)
+
+
 class TestState(unittest.TestCase):
     """Test the State class"""
     def setUp(self) -> None:
@@ -76,12 +439,26 @@ class TestState(unittest.TestCase):
         self.game.load()
         self.adventure = self.game.dm.adventure
 
+    def test_snapshot_metrics(self) -> None:
+        snapshots = Metrics.get("dmai_snapshot_bytes").get()
+        self.game.state.snapshot()
+        self.assertEqual(snapshots + 1, Metrics.get("dmai_snapshot_bytes").get())
+        self.assertIn("dmai_state_save_seconds_count", Metrics.render())
+
     def test_save_state(self) -> None:
         self.game.state.light_torch()
         self.game.state.set_current_room("player", "antechamber")
         saved_state = self.game.state.save()
         self.assertIn("torch_lit", saved_state)
         self.assertEqual("Fighter", saved_state["char_class"])
+
+    def test_save_state_keeps_game_running(self) -> None:
+        saved_state = self.game.state.save()
+        self.assertNotIn("dm", saved_state)
+        self.assertIs(self.game.dm, self.game.state.dm)
+        self.assertIs(self.game.player, self.game.state.get_player())
+        saved_state["current_room"]["player"] = "antechamber"
+        self.assertEqual("stout_meal_inn", self.game.state.get_current_room_id())
     
     def test_load_state(self) -> None:
         saved_state = {
@@ -104,6 +481,31 @@ class TestState(unittest.TestCase):
         with self.assertRaises(UnrecognisedRoomError):
             self.game.state.get_room_name(room)
 
+    def test_get_name(self) -> None:
+        state = self.game.state
+        self.assertEqual("Xena", state.get_name("player"))
+        self.assertEqual("Giant Rat 1", state.get_name("giant_rat_1"))
+        self.assertEqual("Corvus", state.get_name("corvus"))
+        self.assertEqual("Burial Chamber", state.get_name("burial_chamber"))
+        self.assertEqual("Potion of Healing", state.get_name("potion_of_healing"))
+        self.assertEqual("Torch", state.get_name("torch"))
+        self.assertEqual("Greataxe", state.get_name("greataxe"))
+        self.assertEqual("Strength", state.get_name("str"))
+        self.assertEqual("Perception", state.get_name("perception"))
+        self.assertEqual("Altar", state.get_name("altar_puzzle"))
+        self.assertEqual("unknown", state.get_name("yoda"))
+
+    def test_registry(self) -> None:
+        registry = self.game.state.registry
+        (kind, room, name) = registry.lookup("burial_chamber")
+        self.assertEqual("room", kind)
+        self.assertIs(self.game.dm.adventure.get_room("burial_chamber"), room)
+        self.assertIs(self.game.dm.npcs.get_monster("giant_rat_1"), registry.get("giant_rat_1", "entity"))
+        self.assertIsNone(registry.lookup("burial_chamber", "entity"))
+        self.game.player.character.items.add_item("strange_orb", item_data={"name": "Strange Orb"})
+        self.assertEqual("Strange Orb", self.game.state.get_name("strange_orb"))
+        self.assertNotIn("registry", self.game.state.save())
+
     def test__check_room_exists(self) -> None:
         room = "burial_chamber"
         self.assertEqual(True, self.game.state.check_room_exists(room))
@@ -228,6 +630,388 @@ class TestState(unittest.TestCase):
         self.game.state.light_torch()
         self.assertEqual(self.game.state.get_formatted_possible_monster_targets(entity), "You could attack Giant Rat 1 or Giant Rat 2.")
 
+    def test_room_index(self) -> None:
+        state = self.game.state
+        self.assertListEqual(["giant_rat_1", "giant_rat_2"], state.get_room_monster_ids("inns_cellar"))
+        self.assertListEqual(["anvil"], state.get_room_npc_ids("inns_cellar"))
+        self.assertListEqual([], state.get_room_monster_ids("the_moon"))
+        state.set_current_room("giant_rat_1", "antechamber")
+        self.assertListEqual(["giant_rat_2"], state.get_room_monster_ids("inns_cellar"))
+        self.assertListEqual(["giant_rat_1", "goblin_2", "goblin_3"], state.get_room_monster_ids("antechamber"))
+        state.set_current_room("giant_rat_1", "inns_cellar")
+        self.assertListEqual(["giant_rat_1", "giant_rat_2"], state.get_room_monster_ids("inns_cellar"))
+
+    def test_all_dead(self) -> None:
+        state = self.game.state
+        state.set_current_room("player", "inns_cellar")
+        self.assertFalse(state.all_dead())
+        state.set_current_status("giant_rat_1", "dead")
+        self.assertFalse(state.all_dead())
+        self.assertDictEqual({"alive": {"Giant Rat": 1}, "dead": {"Giant Rat": 1}},
+                             state.get_monster_status_summary("inns_cellar"))
+        state.set_current_status("giant_rat_2", "dead")
+        self.assertTrue(state.all_dead())
+        self.assertListEqual([], state.get_possible_monster_targets())
+
+    def test_room_index_after_load(self) -> None:
+        self.game.state.set_current_room("giant_rat_1", "antechamber")
+        self.game.state.set_current_status("giant_rat_2", "dead")
+        game = Game(saved_state=self.game.state.save())
+        game.load()
+        self.assertListEqual(["giant_rat_2"], game.state.get_room_monster_ids("inns_cellar"))
+        self.assertEqual(1, game.state.room_index.count("inns_cellar", "monster", Status.DEAD))
+        self.assertIn("giant_rat_1", game.state.get_room_monster_ids("antechamber"))
+        self.assertNotIn("room_index", game.state.save())
+
+
+class TestFork(unittest.TestCase):
+    """Test forking the State"""
+    def setUp(self) -> None:
+        self.game = Game(char_class="fighter", char_name="Xena")
+        self.game.load()
+        self.state = self.game.state
+        self.state.questing = True
+        self.saved_state = self.state.save()
+
+    def test_fork_is_cheap(self) -> None:
+        start = time.perf_counter()
+        for _ in range(100):
+            self.state.fork()
+        self.assertLess((time.perf_counter() - start) / 100, 0.001)
+
+    def test_actions_on_branch(self) -> None:
+        branch = self.state.fork()
+        self.assertTrue(branch.get_dm().actions.move("player", "inns_cellar"))
+        branch.take_damage(3, "giant_rat_1")
+        branch.set_current_status("giant_rat_2", "dead")
+        branch.get_dm().register_trigger("what-if")
+        self.assertEqual("inns_cellar", branch.get_current_room_id())
+        self.assertEqual(self.state.get_current_hp() - 3, branch.get_current_hp())
+        self.assertListEqual(["giant_rat_1"], [m.unique_id for m in branch.get_possible_monster_targets()])
+
+        # the parent is untouched
+        self.assertEqual("stout_meal_inn", self.state.get_current_room_id())
+        self.assertTrue(self.state.is_alive("giant_rat_2"))
+        self.assertNotIn("what-if", self.state.get_dm().triggers)
+        self.assertEqual(self.saved_state, self.state.save())
+        self.assertIsNot(self.state.output_builder, branch.output_builder)
+
+    def test_triggers_on_branch(self) -> None:
+        branch = self.state.fork()
+        self.assertTrue(branch.get_dm().actions.move("player", "inns_cellar"))
+        branch.get_dm().execute_triggers()
+        for monster_id in ["giant_rat_1", "giant_rat_2"]:
+            branch.set_current_status(monster_id, "dead")
+        self.assertIsNone(branch.get_dm().npcs.get_monster_id("giant_rat", status="alive"))
+        self.assertIs(branch, branch.get_dm().npcs.get_monster("giant_rat_1").state)
+        self.assertIs(branch, branch.get_player().state)
+        self.assertIs(branch, branch.registry.get("inns_cellar").state)
+
+        # the parent is untouched
+        self.assertEqual(self.saved_state, self.state.save())
+        self.assertEqual("giant_rat_1", self.state.get_dm().npcs.get_monster_id("giant_rat", status="alive"))
+        self.assertIs(self.state, self.state.get_dm().npcs.get_monster("giant_rat_1").state)
+
+    def test_fork_of_fork(self) -> None:
+        branch = self.state.fork()
+        branch.set_current_room("player", "inns_cellar")
+        leaf = branch.fork()
+        leaf.set_current_room("player", "dungeon_entrance")
+        self.assertEqual("inns_cellar", branch.get_current_room_id())
+        self.assertEqual("dungeon_entrance", leaf.get_current_room_id())
+        self.assertEqual("stout_meal_inn", self.state.get_current_room_id())
+
+    def test_save_branch(self) -> None:
+        branch = self.state.fork()
+        branch.set_current_room("player", "inns_cellar")
+        saved_state = branch.save()
+        self.assertEqual(set(self.saved_state), set(saved_state))
+        self.assertEqual("inns_cellar", saved_state["current_room"]["player"])
+        self.assertNotIn("_parent", saved_state)
+
+
+class TestEntityTable(unittest.TestCase):
+    """Test the EntityTable class"""
+    def setUp(self) -> None:
+        self.table = EntityTable()
+        self.hp = self.table.add_column("hp", IntColumn())
+        self.room = self.table.add_column("room", CodeColumn())
+        self.status = self.table.add_column("status", CodeColumn(list(Status)))
+
+    def test_column_mapping(self) -> None:
+        self.hp["rat"] = 7
+        self.room["rat"] = "cellar"
+        self.room["player"] = "inn"
+        self.assertEqual(7, self.hp["rat"])
+        self.assertIn("rat", self.hp)
+        self.assertNotIn("player", self.hp)
+        self.assertIsNone(self.hp.get("player"))
+        with self.assertRaises(KeyError):
+            self.hp["player"]
+        self.assertDictEqual({"rat": "cellar", "player": "inn"}, dict(self.room))
+        del self.room["rat"]
+        self.assertDictEqual({"player": "inn"}, dict(self.room))
+        self.assertEqual(1, len(self.room))
+        self.room.clear()
+        self.assertEqual(0, len(self.room))
+        self.assertEqual(2, len(self.table))
+
+    def test_select(self) -> None:
+        for i in range(100000):
+            entity = "rat_{i}".format(i=i)
+            self.room[entity] = "room_{r}".format(r=i % 100)
+            self.status[entity] = Status.DEAD if i % 3 else Status.ALIVE
+        start = time.perf_counter()
+        alive = self.table.select(room="room_7", status=Status.ALIVE)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertEqual(333, len(alive))
+        self.assertListEqual(["rat_207", "rat_507"], alive[:2])
+        self.assertListEqual([], self.table.select(room="the_moon"))
+        self.assertEqual(Status.ALIVE, self.table.get("rat_0")["status"])
+
+    def test_state_columns(self) -> None:
+        game = Game(char_class="fighter", char_name="Xena")
+        game.load()
+        self.assertIsInstance(game.state.current_hp, ColumnMapping)
+        self.assertListEqual(["giant_rat_1", "giant_rat_2"], game.state.select_entities(
+            current_room="inns_cellar", current_status=Status.ALIVE)[-2:])
+        saved_state = game.state.save()
+        self.assertIs(dict, type(saved_state["current_hp"]))
+        self.assertEqual(game.state.current_hp["giant_rat_1"], saved_state["current_hp"]["giant_rat_1"])
+        saved_state["current_hp"]["giant_rat_1"] = 1
+        game.state.load(saved_state)
+        self.assertEqual(1, game.state.get_current_hp("giant_rat_1"))
+        self.assertIsInstance(game.state.current_hp, ColumnMapping)
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test the SnapshotCodec class"""
+    def setUp(self) -> None:
+        self.game = Game(char_class="fighter", char_name="Xena", adventure="the_tomb_of_baradin_stormfury")
+        self.game.load()
+        self.game.state.set_current_room("player", "antechamber")
+        self.game.state.set_current_status("giant_rat_1", "dead")
+        self.game.state.current_combat_status["giant_rat_2"] = Combat.DAMAGE_ROLL
+        self.saved_state = self.game.state.save()
+
+    def to_json(self, saved_state: dict) -> str:
+        return json.dumps(saved_state, default=lambda e: e.value)
+
+    def test_round_trip(self) -> None:
+        for compress in (True, False):
+            snapshot = SNAPSHOT_CODEC.encode(self.saved_state, compress)
+            self.assertEqual(self.saved_state, SNAPSHOT_CODEC.decode(snapshot))
+
+    def test_round_trip_values(self) -> None:
+        value = {"a": [1, -1, 0, 2 ** 70, -2 ** 70], "b": (1.5, None, True, False), 3: {"x", "y"}, "c": b"\x00\xff"}
+        self.assertEqual(value, SNAPSHOT_CODEC.decode(SNAPSHOT_CODEC.encode(value)))
+
+    def test_enums(self) -> None:
+        loaded = SNAPSHOT_CODEC.decode(self.game.state.snapshot())
+        self.assertIs(Status.DEAD, loaded["current_status"]["giant_rat_1"])
+        self.assertIs(Combat.DAMAGE_ROLL, loaded["current_combat_status"]["giant_rat_2"])
+
+    def test_load(self) -> None:
+        state = State(OutputBuilder(), "test")
+        state.load(self.game.state.snapshot())
+        self.assertEqual("antechamber", state.current_room["player"])
+        self.assertEqual("test", state.session.session_id)
+
+    def test_unsupported_value(self) -> None:
+        with self.assertRaises(SnapshotError):
+            SNAPSHOT_CODEC.encode({"output_builder": OutputBuilder()})
+
+    def test_corrupt(self) -> None:
+        snapshot = self.game.state.snapshot()
+        with self.assertRaises(SnapshotError):
+            SNAPSHOT_CODEC.decode(b"JSON" + snapshot[4:])
+        with self.assertRaises(SnapshotError):
+            SNAPSHOT_CODEC.decode(snapshot[:6] + b"\x00" + snapshot[7:])
+        with self.assertRaises(SnapshotError):
+            SNAPSHOT_CODEC.decode(snapshot[:4] + bytes([SNAPSHOT_CODEC.VERSION + 1]) + snapshot[5:])
+
+    def test_size(self) -> None:
+        json_size = len(self.to_json(self.saved_state).encode("utf-8"))
+        self.assertLess(len(SNAPSHOT_CODEC.encode(self.saved_state, False)), json_size * 0.6)
+        self.assertLess(len(SNAPSHOT_CODEC.encode(self.saved_state)), len(pickle.dumps(self.saved_state)))
+
+    def test_latency(self) -> None:
+        n = 50
+        start = time.perf_counter()
+        for _ in range(n):
+            SNAPSHOT_CODEC.decode(SNAPSHOT_CODEC.encode(self.saved_state))
+        snapshot_time = (time.perf_counter() - start) / n
+        start = time.perf_counter()
+        for _ in range(n):
+            json.loads(self.to_json(self.saved_state))
+        json_time = (time.perf_counter() - start) / n
+        # a pure python codec is slower than the C json module, but a
+        # round trip must stay well inside a request budget
+        self.assertLess(snapshot_time, max(0.005, json_time * 20))
+
+
+class TestDeltaTracker(unittest.TestCase):
+    """Test the DeltaTracker and DeltaChain classes"""
+    ROOMS = ["stout_meal_inn", "inns_cellar", "dungeon_entrance", "burial_chamber"]
+
+    def setUp(self) -> None:
+        self.game = Game(char_class="fighter", char_name="Xena", adventure="the_tomb_of_baradin_stormfury")
+        self.game.load()
+        self.tracker = DeltaTracker(self.game.state, checkpoint_interval=20)
+
+    def play_turn(self) -> None:
+        state = self.game.state
+        state.turns += 1
+        state.set_current_room("player", self.ROOMS[state.turns % len(self.ROOMS)])
+        if state.turns % 10 == 0:
+            state.take_damage(1, "giant_rat_1", "player")
+        if state.turns % 5 == 0:
+            state.expected_intent = ["roll"]
+
+    def test_diff_and_apply(self) -> None:
+        old = {"turns": 1, "a": 1, "b": {"x": 1, "y": 2}, "c": [1], "d": True}
+        new = {"turns": 2, "a": 1, "b": {"x": 1, "z": 3}, "c": [1, 2]}
+        delta = DeltaChain.diff(old, new)
+        self.assertEqual({"turns": 2, "c": [1, 2]}, delta["set"])
+        self.assertEqual({"set": {"z": 3}, "unset": ["y"]}, delta["keys"]["b"])
+        self.assertEqual(["d"], delta["unset"])
+        delta.update({"kind": "delta", "turn": 2, "base": 1})
+        DeltaChain.apply(old, delta)
+        self.assertEqual(new, old)
+
+    def test_first_commit_is_checkpoint(self) -> None:
+        record = self.tracker.commit()
+        self.assertEqual("checkpoint", record["kind"])
+        self.assertIsNone(self.tracker.commit())
+
+    def test_reconstruct(self) -> None:
+        records = [DeltaChain.encode(self.tracker.commit())]
+        for _ in range(45):
+            self.play_turn()
+            records.append(DeltaChain.encode(self.tracker.commit()))
+        kinds = [DeltaChain.decode(r)["kind"] for r in records]
+        self.assertEqual(3, kinds.count("checkpoint"))
+        self.assertEqual(self.game.state.save(), DeltaChain.reconstruct(records))
+        self.assertEqual(self.game.state.save(), DeltaChain.reconstruct(records[:41] + records[41:]))
+
+    def test_delta_size(self) -> None:
+        # rooms and puzzles add their state when first built, build them all
+        # before measuring
+        self.game.dm.adventure.get_all_rooms()
+        self.game.dm.adventure.get_all_puzzles()
+        self.tracker.commit()
+        for _ in range(15):
+            self.play_turn()
+            delta = DeltaChain.encode(self.tracker.commit())
+            self.assertLess(len(delta) * 10, len(self.game.state.snapshot()))
+
+    def test_broken_chain(self) -> None:
+        records = [self.tracker.commit()]
+        self.play_turn()
+        self.tracker.commit()
+        self.play_turn()
+        records.append(self.tracker.commit())
+        with self.assertRaises(SnapshotError):
+            DeltaChain.reconstruct(records)
+        with self.assertRaises(SnapshotError):
+            DeltaChain.reconstruct(records[1:])
+
+    def test_continue_after_reload(self) -> None:
+        (ui, session_id) = dmai.init(".")
+        records = [ui.save_delta()]
+        ui.game.state.turns += 1
+        ui.game.state.set_current_room("player", "inns_cellar")
+        records.append(ui.save_delta())
+        (ui, session_id) = dmai.init(".", session_id=session_id, saved_state=records)
+        self.assertEqual("inns_cellar", ui.game.state.get_current_room_id())
+        ui.game.state.turns += 1
+        ui.game.state.light_torch()
+        records.append(ui.save_delta())
+        self.assertEqual("delta", DeltaChain.decode(records[-1])["kind"])
+        self.assertTrue(DeltaChain.reconstruct(records)["torch_lit"])
+
+
+class TestReplay(unittest.TestCase):
+    """Test the Journal and Replay classes"""
+    class PlannerlessJournal(Journal):
+        def draw(self, kind: str, func, *args) -> object:
+            # record empty plans, the planner is not available to the tests
+            if kind == "plan" and not self.replaying:
+                func = lambda: (False, [])
+            elif kind == "plan_file" and not self.replaying:
+                func = lambda: []
+            return Journal.draw(self, kind, func, *args)
+
+    UTTERANCES = ["go to the cellar", "attack the giant rat", "roll", "roll", "roll", "attack giant rat 2", "roll"]
+
+    def setUp(self) -> None:
+        (self.game, self.journal) = self.record()
+
+    def record(self) -> tuple:
+        """Method to play the utterances and return the (game, journal)"""
+        server = LocalRasaServer(port=0, nlu_file=p + "/../data/nlu.yml")
+        server.start()
+        game = Game(char_class="fighter", char_name="Xena", skip_intro=True, rasa_port=server.address[1])
+        game.load()
+        journal = self.PlannerlessJournal()
+        journal.start(game.state.journal.initial, game.state.journal.settings)
+        game.state.journal = journal
+        for utter in self.UTTERANCES:
+            game.input(utter)
+            game.output()
+        # replays must not need the NLU server
+        server.stop()
+        return (game, journal)
+
+    def test_record(self) -> None:
+        self.assertEqual(2 * len(self.UTTERANCES), len(self.journal.events))
+        self.assertEqual("go to the cellar", self.journal.events[0]["utter"])
+        draws = [kind for event in self.journal.events for (kind, value) in event["draws"]]
+        self.assertEqual(len(self.UTTERANCES), draws.count("nlu"))
+        self.assertIn("dice", draws)
+        self.assertIsNone(DiceRoller.get_journal())
+
+    def test_replay(self) -> None:
+        game = Replay(self.journal).run()
+        self.assertEqual(self.game.state.save(), game.state.save())
+        self.assertFalse(game.state.journal.replaying)
+
+    def test_replay_turns(self) -> None:
+        game = Replay(self.journal).run(turns=2)
+        self.assertEqual(1, game.state.turns)
+
+    def test_replay_encoded(self) -> None:
+        journal = Replay.decode(Replay.encode(self.journal))
+        self.assertEqual(self.game.state.save(), Replay(journal).run().state.save())
+
+    def test_replay_checkpoint(self) -> None:
+        max_events = Config.journal.max_events
+        Config.journal.set_max_events(4)
+        try:
+            (recorded, journal) = self.record()
+        finally:
+            Config.journal.set_max_events(max_events)
+        self.assertLessEqual(len(journal.events), 4)
+        self.assertEqual(recorded.state.turns - len(journal.events) // 2, journal.initial["turns"])
+        self.assertEqual(recorded.state.save(), Replay(journal).run().state.save())
+
+    def test_replay_diverged(self) -> None:
+        (kind, (intent, params)) = self.journal.events[0]["draws"][1]
+        self.journal.events[0]["draws"][1] = (kind, ("attack", params))
+        with self.assertRaises(ReplayError):
+            Replay(self.journal).run()
+
+    def test_replay_dice(self) -> None:
+        journal = Journal()
+        journal.start({}, {})
+        with journal.turn("input", "roll"):
+            rolls = [DiceRoller.roll("2d20")[1] for _ in range(10)]
+        journal.replay(journal.events)
+        with journal.turn("input", "roll"):
+            self.assertEqual(rolls, [DiceRoller.roll("2d20")[1] for _ in range(10)])
+            with self.assertRaises(ReplayError):
+                DiceRoller.roll("d20")
+
 
 class TestAdventure(unittest.TestCase):
     """Test the Adventure class"""
@@ -261,6 +1045,51 @@ class TestAdventure(unittest.TestCase):
         self.assertIsInstance(intro, Generator)
         self.assertEqual(next(intro), text)
 
+    def test_rooms_built_on_first_use(self) -> None:
+        state = self.game.state
+        self.assertNotIn("baradins_crypt", self.adventure.rooms.built)
+        self.assertNotIn("baradins_crypt", state.room_connect_map)
+        self.assertEqual("Baradin's Crypt", state.get_room_name("baradins_crypt"))
+        self.assertNotIn("baradins_crypt", self.adventure.rooms.built)
+        room = self.adventure.get_room("baradins_crypt")
+        self.assertIs(room, self.adventure.rooms.built["baradins_crypt"])
+        self.assertIn("baradins_crypt", state.room_connect_map)
+        self.assertNotIn("dwarven_thrower", state.puzzle_trigger_map)
+        self.assertIs(room.puzzles.get_puzzle("dwarven_thrower"), state.registry.get("dwarven_thrower_puzzle"))
+        self.assertIn("dwarven_thrower", state.puzzle_trigger_map)
+        self.assertEqual(8, len(self.adventure.rooms))
+
+    def test_trigger(self) -> None:
+        self.assertIn(self.adventure, self.game.dm.triggers)
+        self.assertNotIn(self.adventure.get_room("inns_cellar"), self.game.dm.triggers)
+
+    def test_get_doors(self) -> None:
+        doors = [
+            ("stout_meal_inn", "inns_cellar"),
+            ("inns_cellar", "dungeon_entrance"),
+            ("dungeon_entrance", "burial_chamber"),
+            ("dungeon_entrance", "western_corridor"),
+            ("western_corridor", "antechamber"),
+            ("antechamber", "southern_corridor"),
+            ("southern_corridor", "baradins_crypt"),
+        ]
+        self.assertListEqual(doors, self.adventure.get_doors())
+
+    def test_get_puzzle(self) -> None:
+        puzzle = self.adventure.get_puzzle("altar")
+        self.assertIs(puzzle, self.adventure.get_room("burial_chamber").puzzles.get_puzzle("altar"))
+        self.assertEqual("burial_chamber", self.adventure.get_puzzle_room("altar"))
+        self.assertIsNone(self.adventure.get_puzzle("yoda"))
+        self.assertListEqual(["vault", "silver_key", "skull_engraving", "altar"],
+                             self.adventure.get_room_puzzle_ids("burial_chamber"))
+        self.assertEqual(8, len(self.adventure.get_all_puzzles()))
+
+    def test_get_solutions(self) -> None:
+        door = "antechamber---southern_corridor"
+        self.assertListEqual(["silver_key"], self.adventure.get_solutions("item", door))
+        self.assertListEqual([], self.adventure.get_solutions("skill", door))
+        self.assertListEqual([door], self.adventure.get_item_puzzles("silver_key"))
+
 class TestNPCCollection(unittest.TestCase):
     """Test the NPCCollection class"""
     def setUp(self) -> None:
@@ -318,6 +1147,39 @@ class TestNPCCollection(unittest.TestCase):
         self.assertEqual(monster_3, "goblin_1")
         self.assertEqual(monster_4, "skeleton_1")
 
+    def test_get_monster_id_after_move(self) -> None:
+        self.npc_collection.load()
+        self.state.set_init_room("giant_rat_1", "antechamber")
+        monster_1 = self.npc_collection.get_monster_id(monster_type="giant_rat", location="inns_cellar")
+        monster_2 = self.npc_collection.get_monster_id(monster_type="giant_rat", location="antechamber")
+        self.assertEqual(monster_1, "giant_rat_2")
+        self.assertEqual(monster_2, "giant_rat_1")
+
+    def test_resolve(self) -> None:
+        self.npc_collection.load()
+        self.assertEqual(self.npc_collection.resolve("location", "inns_cellar"), "inns_cellar")
+        self.assertEqual(self.npc_collection.resolve("location", "Inn's Cellar"), "inns_cellar")
+        self.assertEqual(self.npc_collection.resolve("location", "burial"), "burial_chamber")
+        self.assertEqual(self.npc_collection.resolve("location", "westren corridor"), "western_corridor")
+        self.assertEqual(self.npc_collection.resolve("monster", "giant rats"), "giant_rat")
+        self.assertEqual(self.npc_collection.resolve("npc", "Corvus Stouthammer"), "corvus")
+        self.assertEqual(self.npc_collection.resolve("puzzle", "skull engravings"), "skull_engraving")
+        self.assertEqual(self.npc_collection.resolve("npc", "yoda"), "yoda")
+
+    def test_resolve_unknown(self) -> None:
+        self.npc_collection.load()
+        self.assertEqual(self.npc_collection.resolve("monster", "giant_spider"), "giant_spider")
+        self.assertEqual(self.npc_collection.resolve("monster", "skeleton_king"), "skeleton_king")
+        self.assertEqual(self.npc_collection.resolve("location", "eastern_corridor"), "eastern_corridor")
+        self.assertEqual(self.npc_collection.resolve("location", "inn"), "inn")
+
+    def test_resolve_memo_is_bounded(self) -> None:
+        self.npc_collection.load()
+        index = self.npc_collection.index
+        for i in range(index.MAX_RESOLVED + 10):
+            self.npc_collection.resolve("monster", "monster{i}".format(i=i))
+        self.assertEqual(index.MAX_RESOLVED, len(index.resolved))
+
     def test_get_all_npcs(self) -> None:
         self.npc_collection.load()
         npcs = self.npc_collection.get_all_npcs()
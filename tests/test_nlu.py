@@ -1,11 +1,19 @@
 import unittest
 import sys
 import os
+import threading
+import tempfile
 
 p = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, p + "/../")
 
 from dmai.nlu.nlu import NLU
+from dmai.nlu.rasa_adapter import RasaAdapter
+from dmai.nlu.rasa_interpreter_adapter import RasaInterpreterAdapter
+from dmai.nlu.local_rasa_server import LocalRasaServer
+from dmai.nlu.batch_parser import BatchParser
+from dmai.utils.config import Config
+from dmai.utils.profiler import Profiler
 from dmai.game.state import State
 from dmai.utils.output_builder import OutputBuilder
 from dmai.utils.exceptions import UnrecognisedCommandError
@@ -28,6 +36,7 @@ class TestNLU(unittest.TestCase):
         actual += "/help               Show these commands\n"
         actual += "/exit               Exit the game\n"
         actual += "/stats              Show your character stats in a character sheet\n"
+        actual += "/profile            Profile the next turns: start [turns] [mode], stop or dump\n"
 
         self.assertEqual(self.nlu.show_commands(), actual)
 
@@ -57,6 +66,173 @@ class TestNLU(unittest.TestCase):
         with self.assertRaises(UnrecognisedCommandError):
             self.nlu._regex_and_exec(self.bad_cmd2)
 
+    def test_regex_profile(self) -> None:
+        root = Config.directory.root
+        with tempfile.TemporaryDirectory() as directory:
+            Config.set_root(directory)
+            try:
+                self.assertEqual(self.nlu._regex_and_exec("/profile start 2 deterministic"), (True, ""))
+                run = Profiler.get_run(self.state.session.session_id)
+                self.assertEqual((2, "deterministic"), (run.turns, run.mode))
+                self.output_builder.clear()
+                self.nlu._regex_and_exec("/profile stop")
+                self.assertIn("There is no profile to write.", self.output_builder.format())
+                self.assertIsNone(Profiler.get_run(self.state.session.session_id))
+                self.output_builder.clear()
+                self.nlu._regex_and_exec("/profile start fast")
+                self.assertIn("Cannot profile in fast mode", self.output_builder.format())
+            finally:
+                Config.set_root(root)
+
+    def test_get_adapter(self) -> None:
+        self.assertEqual(self.nlu.get_adapter("server"), RasaAdapter())
+        self.assertEqual(self.nlu.get_adapter("embedded"), RasaInterpreterAdapter())
+        self.assertIsNone(self.nlu.get_adapter("unknown"))
+
+
+class TestRasaInterpreterAdapter(unittest.TestCase):
+    """Test the RasaInterpreterAdapter class"""
+    class Interpreter:
+        def __init__(self) -> None:
+            self.parsed = []
+
+        def parse(self, text: str) -> dict:
+            self.parsed.append(text)
+            return {
+                "intent": {"name": "move", "confidence": 0.9},
+                "entities": [{
+                    "entity": "location",
+                    "value": text.split()[-1],
+                    "confidence_entity": 0.8
+                }]
+            }
+
+    def setUp(self) -> None:
+        self.interpreter = self.Interpreter()
+        RasaInterpreterAdapter.interpreter = self.interpreter
+        RasaInterpreterAdapter._start_worker()
+
+    def tearDown(self) -> None:
+        RasaInterpreterAdapter.unload()
+
+    def test_get_intent(self) -> None:
+        self.assertEqual(
+            RasaInterpreterAdapter.get_intent("go to inns_cellar"),
+            ("move", 0.9, [{"entity": "location", "value": "inns_cellar", "confidence": 0.8}]))
+
+    def test_get_intent_not_loaded(self) -> None:
+        RasaInterpreterAdapter.unload()
+        self.assertEqual(RasaInterpreterAdapter.get_intent("go to inns_cellar"),
+                         ("no_intent", 1, []))
+
+    def test_get_intent_timeout(self) -> None:
+        released = threading.Event()
+        parse = self.interpreter.parse
+        self.interpreter.parse = lambda text: released.wait() and parse(text)
+        timeout = Config.nlu.parse_timeout
+        Config.nlu.set_parse_timeout(0.05)
+        try:
+            self.assertEqual(RasaInterpreterAdapter.get_intent("go to inns_cellar"),
+                             ("no_intent", 1, []))
+        finally:
+            Config.nlu.set_parse_timeout(timeout)
+            released.set()
+        self.interpreter.parse = parse
+        self.assertEqual(RasaInterpreterAdapter.get_intent("go to the_forest")[0], "move")
+
+    def test_concurrent_parses_are_batched(self) -> None:
+        results = {}
+
+        def parse(i: int) -> None:
+            results[i] = RasaInterpreterAdapter.get_intent("go to the_forest")
+
+        window = Config.nlu.batch_window
+        Config.nlu.batch_window = 0.2
+        try:
+            threads = [threading.Thread(target=parse, args=(i, )) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            Config.nlu.batch_window = window
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual(results[0][2][0]["value"], "the_forest")
+        self.assertLess(len(self.interpreter.parsed), 8)
+
+
+class TestLocalRasaServer(unittest.TestCase):
+    """Test the LocalRasaServer class"""
+    def setUp(self) -> None:
+        self.server = LocalRasaServer(port=0, nlu_file=p + "/../data/nlu.yml")
+        self.server.start()
+
+    def tearDown(self) -> None:
+        self.server.stop()
+
+    def test_get_endpoint(self) -> None:
+        (host, port) = self.server.address
+        self.assertEqual(RasaAdapter.get_endpoint(host, port), self.server.endpoint)
+
+    def test_get_intent(self) -> None:
+        self.assertEqual(
+            RasaAdapter.get_intent("go to the cellar", self.server.endpoint),
+            ("move", 1.0, [{"entity": "location", "value": "inns_cellar", "confidence": 1.0}]))
+
+    def test_get_intent_entities(self) -> None:
+        (intent, confidence, entities) = RasaAdapter.get_intent("attack the giant rat", self.server.endpoint)
+        self.assertEqual(intent, "attack")
+        self.assertEqual(entities[0]["entity"], "monster")
+        self.assertEqual(entities[0]["value"], "giant_rat")
+
+    def test_get_intent_error_rate(self) -> None:
+        self.server.error_rate = 1.0
+        self.assertEqual(RasaAdapter.get_intent("go to the cellar", self.server.endpoint), ("no_intent", 1, []))
+
+
+class TestBatchParser(unittest.TestCase):
+    """Test the BatchParser class"""
+    class Adapter:
+        def get_intent(self, player_utter: str, endpoint: str = None) -> tuple:
+            if player_utter.startswith("go"):
+                return ("move", 0.9, [{"entity": "location", "value": player_utter.split()[-1], "confidence": 0.9}])
+            if player_utter == "mumble":
+                return ("explore", 0.2, [])
+            return ("affirm", 0.8, [])
+
+    def setUp(self) -> None:
+        self.parser = BatchParser(adapter=self.Adapter(), max_workers=2)
+
+    def test_parse(self) -> None:
+        utterances = ["go to room_{i}".format(i=i) for i in range(20)]
+        results = list(self.parser.parse(utterances))
+        self.assertEqual(len(results), 20)
+        self.assertEqual(results[13][0], "move")
+        self.assertEqual(results[13][2][0]["value"], "room_13")
+
+    def test_parse_low_confidence(self) -> None:
+        self.assertEqual(list(self.parser.parse(["mumble"])), [("no_intent", 0.2, [])])
+
+    def test_parse_with_context(self) -> None:
+        contexts = [None, {"expected_entities": ["location"], "expected_intent": ["explore"]}]
+        results = list(self.parser.parse(["go to antechamber", "go to antechamber"], contexts))
+        self.assertEqual(results[0][0], "move")
+        self.assertEqual(results[1][0], "explore")
+
+    def test_read_log(self) -> None:
+        log_file = os.path.join(p, "batch_parser_test.log")
+        with open(log_file, "w") as f:
+            f.write("2021-08-01 10:00:00.000 [INFO] (SESSION ABC) [PLAYER]: go to the cellar\n")
+            f.write("2021-08-01 10:00:01.000 [INFO] (SESSION ABC) [DM]: You go down the stairs\n")
+            f.write("2021-08-01 10:00:02.000 [INFO] (SESSION ABC) [PLAYER]: \n")
+            f.write("2021-08-01 10:00:03.000 [INFO] (SESSION XYZ) [PLAYER]: attack the rat\n")
+        try:
+            self.assertEqual(list(BatchParser.read_log(log_file)),
+                             [("ABC", "go to the cellar"), ("XYZ", "attack the rat")])
+        finally:
+            os.remove(log_file)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,8 @@
 import unittest
+import logging
+import json
+import tempfile
+import threading
 import sys
 import os
 
@@ -7,6 +11,11 @@ sys.path.insert(0, p + "/../")
 
 from dmai.utils.dice_roller import DiceRoller
 from dmai.utils.text import Text
+from dmai.utils.logger import get_logger, LogPipeline, LazyQueueHandler
+from dmai.utils.config import Config
+from dmai.utils.tracer import Tracer, NullSpan
+from dmai.utils.metrics import Metrics
+from dmai.utils.profiler import Profiler, NullProfile
 from dmai.utils.output_builder import OutputBuilder
 
 
@@ -28,6 +37,239 @@ class TestOutputBuilder(unittest.TestCase):
         self.assertEqual(self.output_builder.format(), "This is a statement\n\nAlso this is a statement\n\nAnd this one\n")
         
     
+class TestLogger(unittest.TestCase):
+    """Test the get_logger function and LogPipeline class"""
+
+    class Expensive:
+        def __init__(self) -> None:
+            self.formatted = 0
+
+        def __str__(self) -> str:
+            self.formatted += 1
+            return "expensive"
+
+    def tearDown(self) -> None:
+        Config.logging.set_level("dmai.test_logger", "debug")
+
+    def test_one_handler_set(self) -> None:
+        for _ in range(10):
+            get_logger("dmai.test_logger")
+        handlers = [h for h in logging.getLogger("dmai").handlers if isinstance(h, LazyQueueHandler)]
+        self.assertEqual(1, len(handlers))
+        self.assertListEqual([], logging.getLogger("dmai.test_logger").handlers)
+
+    def test_logger_name(self) -> None:
+        self.assertEqual("dmai.test_logger", get_logger("dmai.test_logger").name)
+        self.assertEqual("dmai.__main__", get_logger("__main__").name)
+
+    def test_lazy_format(self) -> None:
+        logger = get_logger("dmai.test_logger")
+        Config.logging.set_level("dmai.test_logger", "warning")
+        arg = self.Expensive()
+        logger.debug("Not written %s", arg)
+        self.assertEqual(0, arg.formatted)
+
+    def test_prepare(self) -> None:
+        handler = LazyQueueHandler(None)
+        record = logging.LogRecord("dmai.test_logger", logging.DEBUG, __file__, 1, "Turn %s of %d", ("test", 1), None)
+        self.assertIs(record, handler.prepare(record))
+        self.assertEqual("Turn %s of %d", record.msg)
+        arg = self.Expensive()
+        record = logging.LogRecord("dmai.test_logger", logging.DEBUG, __file__, 1, "Argument %s", (arg, ), None)
+        self.assertEqual("Argument expensive", handler.prepare(record).msg)
+        self.assertEqual(1, arg.formatted)
+
+    def test_written(self) -> None:
+        logger = get_logger("dmai.test_logger")
+        logger.debug("Written by the pipeline %s %d", "test", 42)
+        LogPipeline.flush()
+        with open(Config.logging.file) as f:
+            self.assertIn("[DEBUG] Written by the pipeline test 42", f.read())
+
+    def test_set_levels(self) -> None:
+        Config.logging.set_levels("dmai.test_logger=info")
+        self.assertEqual(logging.INFO, logging.getLogger("dmai.test_logger").level)
+        with self.assertRaises(ValueError):
+            Config.logging.set_levels("dmai.test_logger")
+
+
+class TestTracer(unittest.TestCase):
+    """Test the Tracer class"""
+
+    def setUp(self) -> None:
+        Tracer.enable()
+
+    def tearDown(self) -> None:
+        Tracer.disable()
+        Tracer.clear()
+
+    def test_disabled(self) -> None:
+        Tracer.disable()
+        with Tracer.span("turn", turn=1) as span:
+            span.tag(intent="move")
+        self.assertIsInstance(span, NullSpan)
+        self.assertListEqual([], Tracer.get_spans())
+
+    def test_nested_spans(self) -> None:
+        with Tracer.span("turn", session_id="ABC", turn=3) as turn:
+            with Tracer.span("nlu.parse") as parse:
+                pass
+        self.assertListEqual([parse, turn], Tracer.get_spans())
+        self.assertEqual(turn.id, parse.parent)
+        self.assertDictEqual({"session_id": "ABC", "turn": 3}, parse.tags)
+        self.assertGreaterEqual(turn.duration, parse.duration)
+        self.assertListEqual([parse, turn], Tracer.get_spans(session_id="ABC", turn=3))
+        self.assertListEqual([], Tracer.get_spans(turn=4))
+
+    def test_error_tag(self) -> None:
+        with self.assertRaises(KeyError):
+            with Tracer.span("dm.intent"):
+                raise KeyError("move")
+        self.assertEqual("KeyError", Tracer.get_spans()[0].tags["error"])
+
+    def test_export(self) -> None:
+        with Tracer.span("turn", session_id="ABC", turn=1):
+            with Tracer.span("state.maintenance"):
+                pass
+        with tempfile.TemporaryDirectory() as directory:
+            jsonl = os.path.join(directory, "trace.jsonl")
+            Tracer.export(jsonl)
+            with open(jsonl) as f:
+                records = [json.loads(line) for line in f]
+            self.assertListEqual(["state.maintenance", "turn"], [r["name"] for r in records])
+            self.assertEqual("ABC", records[0]["session_id"])
+            chrome = os.path.join(directory, "trace.json")
+            Tracer.export(chrome)
+            with open(chrome) as f:
+                events = json.load(f)["traceEvents"]
+            self.assertEqual("X", events[1]["ph"])
+            self.assertDictEqual({"session_id": "ABC", "turn": 1}, events[1]["args"])
+            with self.assertRaises(ValueError):
+                Tracer.export(chrome, "xml")
+
+
+class TestMetrics(unittest.TestCase):
+    """Test the Metrics class"""
+
+    def setUp(self) -> None:
+        self.counter = Metrics.counter("dmai_test_total", "Test counter", ("agent", ))
+        self.histogram = Metrics.histogram("dmai_test_seconds", "Test histogram", buckets=(0.1, 1))
+        self.counter.reset()
+        self.histogram.reset()
+
+    def tearDown(self) -> None:
+        Metrics.shutdown()
+
+    def test_register(self) -> None:
+        self.assertIs(self.counter, Metrics.counter("dmai_test_total", "Test counter", ("agent", )))
+        with self.assertRaises(ValueError):
+            Metrics.gauge("dmai_test_total", "Test gauge")
+
+    def test_counter(self) -> None:
+        self.counter.inc(agent="player")
+        self.counter.inc(2, agent="player")
+        self.assertEqual(3, self.counter.get(agent="player"))
+        self.assertEqual(0, self.counter.get(agent="monster"))
+        with self.assertRaises(ValueError):
+            self.counter.inc(monster="giant_rat_1")
+        self.assertIn("dmai_test_total{agent=\"player\"} 3", Metrics.render())
+
+    def test_histogram(self) -> None:
+        self.histogram.observe(0.05)
+        self.histogram.observe(0.5)
+        self.histogram.observe(5)
+        with self.histogram.time():
+            pass
+        lines = Metrics.render().splitlines()
+        self.assertIn("# TYPE dmai_test_seconds histogram", lines)
+        self.assertIn("dmai_test_seconds_bucket{le=\"0.1\"} 2", lines)
+        self.assertIn("dmai_test_seconds_bucket{le=\"1\"} 3", lines)
+        self.assertIn("dmai_test_seconds_bucket{le=\"+Inf\"} 4", lines)
+        self.assertIn("dmai_test_seconds_count 4", lines)
+
+    def test_dump_and_serve(self) -> None:
+        from urllib.request import urlopen
+        self.counter.inc(agent="player")
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "metrics.prom")
+            Metrics.dump(file)
+            with open(file) as f:
+                self.assertEqual(Metrics.render(), f.read())
+        server = Metrics.serve(0)
+        with urlopen("http://127.0.0.1:{p}/metrics".format(p=server.server_address[1])) as response:
+            self.assertIn("dmai_test_total{agent=\"player\"} 1", response.read().decode())
+
+
+class TestProfiler(unittest.TestCase):
+    """Test the Profiler class"""
+
+    def setUp(self) -> None:
+        self.root = Config.directory.root
+        self.directory = tempfile.TemporaryDirectory()
+        Config.set_root(self.directory.name)
+
+    def tearDown(self) -> None:
+        Profiler.stop("ABC")
+        Config.set_root(self.root)
+        self.directory.cleanup()
+
+    def _turn(self, turn: int) -> None:
+        with Profiler.turn("ABC", turn):
+            sum(i * i for i in range(200000))
+
+    def test_inactive(self) -> None:
+        self.assertIsInstance(Profiler.turn("ABC", 1), NullProfile)
+        Profiler.start("XYZ")
+        self.assertIsInstance(Profiler.turn("ABC", 1), NullProfile)
+        Profiler.stop("XYZ")
+
+    def test_sampling(self) -> None:
+        run = Profiler.start("ABC", turns=2)
+        for turn in range(1, 4):
+            self._turn(turn)
+        self.assertTrue(run.finished)
+        self.assertEqual(2, run.profiled)
+        self.assertListEqual(
+            [Profiler.get_path("ABC.turn1.collapsed"), Profiler.get_path("ABC.turn2.collapsed")], run.files)
+        file = Profiler.dump(run)
+        with open(file) as f:
+            lines = f.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            (stack, count) = line.rsplit(" ", 1)
+            self.assertTrue(int(count) > 0)
+        self.assertTrue(any("test_utils.py:TestProfiler._turn" in line for line in lines))
+
+    def test_every_session(self) -> None:
+        run = Profiler.start(turns=3)
+        self._turn(1)
+        with Profiler.turn("XYZ", 1):
+            pass
+        with Profiler.turn("", 1):
+            pass
+        Profiler.stop()
+        self.assertListEqual([
+            Profiler.get_path("ABC.turn1.collapsed"),
+            Profiler.get_path("XYZ.turn1.collapsed"),
+            Profiler.get_path("game-{p}-{t}.turn1.collapsed".format(p=os.getpid(), t=threading.get_ident()))
+        ], run.files)
+        self.assertEqual(Profiler.get_path("sessions-{p}.collapsed".format(p=os.getpid())), Profiler.dump(run))
+
+    def test_deterministic(self) -> None:
+        run = Profiler.start("ABC", mode="deterministic")
+        self._turn(1)
+        self.assertIs(run, Profiler.stop("ABC"))
+        self._turn(2)
+        self.assertEqual(1, run.profiled)
+        self.assertTrue(os.path.exists(Profiler.get_path("ABC.turn1.pstats")))
+        self.assertEqual(Profiler.get_path("ABC.pstats"), Profiler.dump(run))
+
+    def test_unknown_mode(self) -> None:
+        with self.assertRaises(ValueError):
+            Profiler.start("ABC", mode="unknown")
+        self.assertIsNone(Profiler.dump(Profiler.start("ABC")))
+
+
 class TestText(unittest.TestCase):
     """Test the Text class"""
 